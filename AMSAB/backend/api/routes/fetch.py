@@ -0,0 +1,49 @@
+"""Fetch proxy route — the only way sandboxed network tools reach the web."""
+from __future__ import annotations
+
+import secrets
+
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import Response
+
+from ...config import settings
+from ...core.fetch_proxy import BlockedAddressError, fetch_proxy
+
+
+def require_fetch_token(x_amsab_fetch_token: str = Header(default="")) -> None:
+    """Only sandboxed tools started by the executor (which hands them the token) may fetch."""
+    if not secrets.compare_digest(x_amsab_fetch_token.encode(), settings.fetch_token.encode()):
+        raise HTTPException(status_code=401, detail="Missing or invalid fetch token")
+
+
+router = APIRouter(prefix="/api", tags=["fetch"], dependencies=[Depends(require_fetch_token)])
+
+
+@router.get("/fetch")
+async def fetch(url: str, request: Request) -> Response:
+    """GET `url` through the shared pool/cache; upstream status is passed through."""
+    try:
+        result = await fetch_proxy.fetch(url, headers=dict(request.headers))
+    except BlockedAddressError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching {url}")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Cannot reach {url}: {e}")
+    return Response(
+        content=result.body,
+        status_code=result.status,
+        media_type=result.content_type,
+        headers={
+            "X-AMSAB-Cache": result.cache,
+            "X-AMSAB-Truncated": "1" if result.truncated else "0",
+        },
+    )
+
+
+@router.get("/fetch/stats")
+async def fetch_stats() -> dict:
+    return fetch_proxy.stats
@@ -5,9 +5,11 @@ import asyncio
 import uuid
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
 from ...core.architect import architect
+from ...core.blob_store import blob_store
 from ...core.memory import memory_vault
 from ...core.orchestrator import orchestrator
 from ... import database as db
@@ -107,8 +109,8 @@ async def rewind_node(
 @router.post("/plans/{plan_id}/kill")
 async def kill_plan(plan_id: str) -> dict:
     """Kill switch: immediately halt execution and destroy all containers."""
-    await orchestrator.kill(plan_id)
-    return {"status": "killed", "plan_id": plan_id}
+    halt_ms = await orchestrator.kill(plan_id)
+    return {"status": "killed", "plan_id": plan_id, "halt_ms": round(halt_ms, 1)}
 
 
 @router.get("/plans/{plan_id}/logs")
@@ -116,6 +118,15 @@ async def get_logs(plan_id: str) -> list[dict]:
     return db.get_logs(plan_id)
 
 
+@router.get("/plans/{plan_id}/blobs/{digest}")
+async def get_blob(plan_id: str, digest: str) -> FileResponse:
+    """Stream the full content of a spilled node output (see output_ref in snapshots)."""
+    path = blob_store.path_for(plan_id, digest)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8")
+
+
 # ── Memory Vault routes ────────────────────────────────────────────────────── #
 
 @router.get("/plans/{plan_id}/memory/session")
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import os
+import secrets
 from pathlib import Path
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -36,6 +38,26 @@ class Settings(BaseSettings):
     docker_workspace_mount: str = "/workspace"
     docker_timeout_seconds: int = 120
 
+    # Node outputs larger than this are spilled to workspace/<plan>/blobs
+    # and passed between nodes by handle instead of inline
+    blob_inline_threshold_bytes: int = 16_384
+    blob_preview_chars: int = 500
+
+    # Host-side fetch proxy used by web_search / scraper containers
+    fetch_proxy_url: str = "http://host.docker.internal:8000/api/fetch"
+    fetch_max_bytes: int = 5_000_000
+    fetch_min_interval_seconds: float = 0.5   # per-domain spacing between upstream requests
+    fetch_cache_max_entries: int = 512
+    fetch_timeout_seconds: float = 20.0
+    # Only for local testing: lets the proxy reach loopback / private addresses
+    fetch_allow_private_networks: bool = False
+    # Internal (no internet) Docker network for proxied tools: the host-side
+    # fetch proxy is their only way out
+    fetch_network: str = "amsab-fetch"
+    # Shared secret proxied containers send as X-AMSAB-Fetch-Token; random per
+    # process unless set (set it when running several backend workers)
+    fetch_token: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+
     # CORS / server
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:3001"]
     host: str = "0.0.0.0"
@@ -0,0 +1,101 @@
+"""Blob Store — content-addressed spill area for large node outputs.
+
+Small outputs keep flowing through the orchestrator context as plain strings.
+Anything above ``settings.blob_inline_threshold_bytes`` is written once to
+``workspace/<plan_id>/blobs/<sha256>`` and replaced everywhere else (context,
+DAG JSON, node rows, WebSocket events) by a short handle plus a preview.
+Dependent containers get the blob directory mounted read-only at ``/blobs``.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+BLOB_HANDLE_PREFIX = "amsab-blob://"
+BLOB_HANDLE_RE = re.compile(r"amsab-blob://([0-9a-f]{64})")
+BLOB_CONTAINER_DIR = "/blobs"
+
+
+class BlobStore:
+    """Writes, resolves and previews content-addressed node outputs."""
+
+    def __init__(self) -> None:
+        self._workspace = Path(settings.workspace_dir)
+
+    def blob_dir(self, plan_id: str) -> Path:
+        path = self._workspace / plan_id / "blobs"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def put(self, plan_id: str, text: str) -> str:
+        """Store text under its SHA-256 digest and return the handle."""
+        data = text.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_dir(plan_id) / digest
+        if not path.exists():
+            # Write-then-rename so a concurrent reader never sees a partial blob;
+            # a temp file per call, so concurrent spills of one blob never share one
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{digest[:12]}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            logger.info("Spilled %d bytes to blob %s for plan %s", len(data), digest[:12], plan_id)
+        return f"{BLOB_HANDLE_PREFIX}{digest}"
+
+    def spill(self, plan_id: str, output: str) -> str:
+        """Return output unchanged if small, otherwise a blob handle."""
+        if len(output.encode()) <= settings.blob_inline_threshold_bytes:
+            return output
+        return self.put(plan_id, output)
+
+    @staticmethod
+    def is_handle(value: str) -> bool:
+        return BLOB_HANDLE_RE.fullmatch(value) is not None
+
+    def path_for(self, plan_id: str, handle_or_digest: str) -> Path | None:
+        digest = handle_or_digest.removeprefix(BLOB_HANDLE_PREFIX)
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            return None
+        path = self._workspace / plan_id / "blobs" / digest
+        return path if path.is_file() else None
+
+    def read(self, plan_id: str, value: str) -> str:
+        """Resolve a handle back to its full text; plain strings pass through."""
+        if not self.is_handle(value):
+            return value
+        path = self.path_for(plan_id, value)
+        if path is None:
+            raise FileNotFoundError(f"Blob {value} not found for plan {plan_id}")
+        return path.read_text(errors="replace")
+
+    def preview(self, plan_id: str, value: str, limit: int | None = None) -> str:
+        """Inline form of an output for DB rows, DAG JSON and WebSocket events.
+
+        Plain strings are returned unchanged; handles become the first ``limit``
+        characters of the blob plus a pointer to the full content.
+        """
+        if not self.is_handle(value):
+            return value
+        limit = limit or settings.blob_preview_chars
+        path = self.path_for(plan_id, value)
+        if path is None:
+            return value
+        with path.open(errors="replace") as f:
+            head = f.read(limit)
+        size = path.stat().st_size
+        return f"{head}… [{size} bytes, full output in {value}]"
+
+
+blob_store = BlobStore()
@@ -2,6 +2,14 @@
 
 Each task gets a fresh, isolated container that is destroyed after completion.
 The container has no network access by default and only a mounted workspace dir.
+Tools that fetch through the host-side fetch proxy run on an internal Docker
+network whose only reachable peer is the host, so they cannot bypass the proxy.
+Large upstream outputs are not inlined: they arrive as blob handles and are read
+from the plan's blob directory, mounted read-only at /blobs.
+
+Tool code is not generated per node: it ships as the pre-compiled ``amsab_tools``
+package inside the worker image (docker/worker/amsab_tools). The executor only
+writes a small ``task.json`` data file with the tool name and resolved args.
 """
 from __future__ import annotations
 
@@ -9,12 +17,14 @@ import asyncio
 import json
 import logging
 import re
-import textwrap
+import time
+import uuid
 from pathlib import Path
 from typing import Any
 
 from ..config import settings
 from ..models.task_graph import TaskNode
+from .blob_store import BLOB_CONTAINER_DIR, BLOB_HANDLE_PREFIX, blob_store
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +46,9 @@ class SandboxExecutor:
     def __init__(self) -> None:
         self._workspace = Path(settings.workspace_dir)
         self._workspace.mkdir(parents=True, exist_ok=True)
+        # plan_id -> names of containers currently running for that plan
+        self._containers: dict[str, set[str]] = {}
+        self._fetch_gateway: str | None = None   # host IP on settings.fetch_network
 
     async def run_node(
         self,
@@ -51,15 +64,25 @@ class SandboxExecutor:
         # Resolve $node_<id>_output references in args (tool-aware for safe Python substitution)
         resolved_args = self._resolve_references(node.args, context, tool=node.tool)
 
-        # Build the runner script
-        script = self._build_script(node.tool, resolved_args, node.task)
-        script_path = task_dir / "runner.py"
-        script_path.write_text(script)
+        # Hand the tool its inputs as data; the code is already in the image
+        prep_start = time.perf_counter()
+        self._write_task_file(task_dir, node.tool, resolved_args, node.task)
+        prep_ms = (time.perf_counter() - prep_start) * 1000
 
-        cmd = self._docker_command(plan_id, node.id, str(task_dir), tool=node.tool)
-        logger.info("Executing node %d (%s) in sandbox: %s", node.id, node.tool, node.task)
+        # Unique per launch so the kill switch can target exactly this container
+        container = f"amsab-{plan_id}-node{node.id}-{uuid.uuid4().hex[:8]}"
+        fetch_gateway = await self._fetch_network_gateway() if node.tool in self._PROXIED_TOOLS else None
+        cmd = self._docker_command(
+            plan_id, node.id, str(task_dir), tool=node.tool, name=container, fetch_gateway=fetch_gateway
+        )
+        logger.info(
+            "Executing node %d (%s) in sandbox (task file ready in %.2fms): %s",
+            node.id, node.tool, prep_ms, node.task,
+        )
 
         output_lines: list[str] = []
+        self._containers.setdefault(plan_id, set()).add(container)
+        proc = None
         try:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
@@ -73,7 +96,13 @@ class SandboxExecutor:
                     decoded = line.decode(errors="replace").rstrip()
                     output_lines.append(decoded)
                     if log_callback:
-                        await log_callback(decoded)
+                        # Huge result lines are spilled by the orchestrator; only log a preview
+                        if len(decoded) > settings.blob_preview_chars:
+                            await log_callback(
+                                f"{decoded[:settings.blob_preview_chars]}… [{len(decoded)} chars]"
+                            )
+                        else:
+                            await log_callback(decoded)
 
             await asyncio.wait_for(
                 asyncio.gather(proc.wait(), _read()),
@@ -85,33 +114,34 @@ class SandboxExecutor:
             exit_code = 124
             if proc.returncode is None:
                 proc.kill()
+        except asyncio.CancelledError:
+            # Kill switch: stop the docker client; the container itself is killed by name
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+            raise
+        finally:
+            self._containers.get(plan_id, set()).discard(container)
 
         output = "\n".join(output_lines)
         logger.info("Node %d finished with exit_code=%d", node.id, exit_code)
         return ExecutionResult(output=output, exit_code=exit_code)
 
     async def kill_plan_containers(self, plan_id: str) -> None:
-        """Kill Switch: terminate any running Docker containers for this plan."""
-        short_id = plan_id[:8]
+        """Kill Switch: terminate the Docker containers this executor started for the plan."""
+        container_names = sorted(self._containers.pop(plan_id, set()))
+        if not container_names:
+            return
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "docker", "ps", "--filter", f"name=amsab-{short_id}", "--quiet",
-                stdout=asyncio.subprocess.PIPE,
+            kill_proc = await asyncio.create_subprocess_exec(
+                "docker", "kill", *container_names,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.DEVNULL,
             )
-            stdout, _ = await proc.communicate()
-            container_ids = stdout.decode().strip().splitlines()
-            if container_ids:
-                kill_proc = await asyncio.create_subprocess_exec(
-                    "docker", "kill", *container_ids,
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
-                )
-                await kill_proc.communicate()
-                logger.warning(
-                    "Kill switch: terminated containers %s for plan %s",
-                    container_ids, plan_id,
-                )
+            await kill_proc.communicate()
+            logger.warning(
+                "Kill switch: terminated containers %s for plan %s",
+                container_names, plan_id,
+            )
         except Exception as exc:
             logger.error("Failed to kill containers for plan %s: %s", plan_id, exc)
 
@@ -119,23 +149,70 @@ class SandboxExecutor:
     _NETWORK_TOOLS: frozenset[str] = frozenset({
         "web_search", "scraper", "http_request", "mcp_generic",
     })
+    # Network tools whose HTTP GETs are routed through the backend fetch proxy
+    _PROXIED_TOOLS: frozenset[str] = frozenset({"web_search", "scraper"})
+
+    async def _docker(self, *args: str) -> tuple[int, str]:
+        proc = await asyncio.create_subprocess_exec(
+            "docker", *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        return proc.returncode or 0, out.decode().strip()
 
-    def _docker_command(self, plan_id: str, node_id: int, task_dir: str, tool: str = "") -> list[str]:
-        # Use bridge network for tools that need internet; air-gap everything else
-        network = "bridge" if tool in self._NETWORK_TOOLS else settings.docker_network
+    async def _fetch_network_gateway(self) -> str | None:
+        """Create the internal fetch network if needed; return the host's IP on it.
+
+        Returns None when the network cannot be set up: proxied tools then run
+        air-gapped (and fail to fetch) rather than with direct internet access.
+        """
+        if self._fetch_gateway or not (settings.fetch_network and settings.fetch_proxy_url):
+            return self._fetch_gateway
+        inspect = ("network", "inspect", "-f", "{{range .IPAM.Config}}{{.Gateway}}{{end}}", settings.fetch_network)
+        try:
+            code, gateway = await self._docker(*inspect)
+            if code != 0:
+                await self._docker("network", "create", "--internal", settings.fetch_network)
+                code, gateway = await self._docker(*inspect)
+        except OSError as exc:
+            code, gateway = 1, str(exc)
+        if code != 0 or not gateway:
+            logger.error("Cannot set up fetch network %s; proxied tools run air-gapped", settings.fetch_network)
+            return None
+        self._fetch_gateway = gateway
+        return gateway
+
+    def _docker_command(
+        self, plan_id: str, node_id: int, task_dir: str, tool: str = "", name: str = "",
+        fetch_gateway: str | None = None,
+    ) -> list[str]:
+        blob_dir = blob_store.blob_dir(plan_id)
+        proxy_args: list[str] = []
+        if tool in self._PROXIED_TOOLS and settings.fetch_proxy_url:
+            # Web fetches go through the host-side fetch proxy (pool, cache, rate limit,
+            # SSRF checks); the internal network has no route anywhere else
+            network = settings.fetch_network if fetch_gateway else settings.docker_network
+            proxy_args = ["--add-host", f"host.docker.internal:{fetch_gateway or 'host-gateway'}",
+                          "-e", f"AMSAB_FETCH_PROXY={settings.fetch_proxy_url}",
+                          "-e", f"AMSAB_FETCH_TOKEN={settings.fetch_token}"]
+        elif tool in self._NETWORK_TOOLS:
+            network = "bridge"           # tools that need the internet directly
+        else:
+            network = settings.docker_network
         return [
             "docker", "run", "--rm",
-            "--name", f"amsab-{plan_id[:8]}-node{node_id}",
+            "--name", name or f"amsab-{plan_id}-node{node_id}",
             "--network", network,
+            *proxy_args,
             "--memory", "512m",
             "--cpus", "1.0",
             "--read-only",
             "--tmpfs", "/tmp:size=64m",
             "-v", f"{task_dir}:/workspace:ro",
             "-v", f"{task_dir}:/output:rw",
+            "-v", f"{blob_dir}:{BLOB_CONTAINER_DIR}:ro",
             "-w", "/workspace",
             settings.docker_image,
-            "python", "runner.py",
+            "python", "-m", "amsab_tools",
         ]
 
     def _resolve_references(
@@ -146,6 +223,10 @@ class SandboxExecutor:
         For python_interpreter code, node outputs are injected as Python string
         variables at the top of the script (node_N_output = "...") so that raw
         substitution never produces invalid Python syntax.
+
+        Outputs that were spilled to the blob store stay as handles: other tools
+        get the handle substituted and the runner hydrates it from /blobs, while
+        python_interpreter code reads the blob file directly.
         """
         def _raw_sub(text: str) -> str:
             return re.sub(
@@ -164,6 +245,13 @@ class SandboxExecutor:
                     header_lines = ["import base64 as _b64"]
                     for node_id in refs:
                         output = context.get(f"node_{node_id}_output", "")
+                        if blob_store.is_handle(output):
+                            digest = output.removeprefix(BLOB_HANDLE_PREFIX)
+                            header_lines.append(
+                                f'node_{node_id}_output = open("{BLOB_CONTAINER_DIR}/{digest}", '
+                                f'encoding="utf-8", errors="replace").read()'
+                            )
+                            continue
                         import base64 as _b64
                         encoded = _b64.b64encode(output.encode()).decode()
                         header_lines.append(
@@ -180,164 +268,13 @@ class SandboxExecutor:
                 resolved[key] = val
         return resolved
 
-    def _build_script(self, tool: str, args: dict[str, Any], task: str) -> str:
-        """Generate the Python runner script for a given tool + args."""
-        args_json = json.dumps(args, indent=2)
-        tool_body = self._tool_implementations().get(tool, self._unknown_tool(tool)).rstrip()
-
-        # Build line-by-line to avoid textwrap.dedent mis-calculating the common
-        # indent prefix when multi-line f-string substitutions (args_json, tool_body)
-        # contain lines with different leading whitespace.
-        parts = [
-            f"# AMSAB Worker — auto-generated runner",
-            f"# Task: {task}",
-            f"# Tool: {tool}",
-            "import json, sys, os",
-            "",
-            f"ARGS = {args_json}",
-            "",
-            tool_body,
-            "",
-            'if __name__ == "__main__":',
-            "    try:",
-            "        result = run(ARGS)",
-            '        print(json.dumps({"status": "ok", "output": result}))',
-            "    except Exception as exc:",
-            '        print(json.dumps({"status": "error", "error": str(exc)}))',
-            "        sys.exit(1)",
-        ]
-        return "\n".join(parts) + "\n"
-
-    @staticmethod
-    def _tool_implementations() -> dict[str, str]:
-        return {
-            "web_search": textwrap.dedent("""\
-                def run(args):
-                    import urllib.request, urllib.parse, ssl, re
-                    query = urllib.parse.quote_plus(args.get("query", ""))
-                    # DuckDuckGo Lite works reliably without a browser session
-                    url = f"https://lite.duckduckgo.com/lite/?q={query}"
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (compatible; AMSAB/1.0)",
-                        "Accept": "text/html",
-                    }
-                    req = urllib.request.Request(url, headers=headers)
-                    ctx = ssl.create_default_context()
-                    ctx.check_hostname = False
-                    ctx.verify_mode = ssl.CERT_NONE
-                    with urllib.request.urlopen(req, timeout=20, context=ctx) as r:
-                        html = r.read().decode(errors="replace")
-                    # Extract result snippets: DDG Lite wraps results in <td class="result-snippet">
-                    snippets = re.findall(r'class="result-snippet"[^>]*>(.*?)</td>', html, re.DOTALL)
-                    titles = re.findall(r'class="result-link"[^>]*>(.*?)</a>', html, re.DOTALL)
-                    links = re.findall(r'class="result-link"[^>]*href="([^"]+)"', html)
-                    if snippets:
-                        results = []
-                        for i, (t, s) in enumerate(zip(titles, snippets), 1):
-                            t_clean = re.sub(r"<[^>]+>", "", t).strip()
-                            s_clean = re.sub(r"<[^>]+>", "", s).strip()
-                            url_i = links[i-1] if i-1 < len(links) else ""
-                            results.append(f"{i}. {t_clean}\\n   {s_clean}\\n   {url_i}")
-                        return "\\n\\n".join(results[:10])
-                    # Fallback: strip all HTML
-                    text = re.sub(r"<[^>]+>", " ", html)
-                    text = re.sub(r"\\s+", " ", text).strip()
-                    return text[:4000]
-            """),
-            "scraper": textwrap.dedent("""\
-                def run(args):
-                    import urllib.request, urllib.error, ssl, re
-                    url = args.get("url", "")
-                    if not url:
-                        return "Error: no url provided"
-                    headers = {"User-Agent": "Mozilla/5.0 (compatible; AMSAB/1.0)"}
-                    req = urllib.request.Request(url, headers=headers)
-                    ctx = ssl.create_default_context()
-                    ctx.check_hostname = False
-                    ctx.verify_mode = ssl.CERT_NONE
-                    try:
-                        with urllib.request.urlopen(req, timeout=20, context=ctx) as r:
-                            html = r.read().decode(errors="replace")
-                    except urllib.error.HTTPError as e:
-                        raise RuntimeError(f"HTTP {e.code} fetching {url}: {e.reason}")
-                    except urllib.error.URLError as e:
-                        raise RuntimeError(f"Cannot reach {url}: {e.reason}")
-                    # Remove script/style blocks then strip remaining tags
-                    html = re.sub(r"<(script|style)[^>]*>.*?</\\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
-                    text = re.sub(r"<[^>]+>", " ", html)
-                    text = re.sub(r"\\s+", " ", text).strip()
-                    return text[:6000]
-            """),
-            "filesystem_read": textwrap.dedent("""\
-                def run(args):
-                    import os
-                    path = args.get("path", "")
-                    if not path:
-                        return "Error: no path provided"
-                    if not os.path.exists(path):
-                        available = []
-                        for d in ["/output", "/workspace"]:
-                            if os.path.isdir(d):
-                                available += [f"{d}/{f}" for f in os.listdir(d)]
-                        hint = f"Available files: {available}" if available else "No files written yet."
-                        return f"File not found: {path}. {hint}"
-                    with open(path) as f:
-                        return f.read()
-            """),
-            "filesystem_write": textwrap.dedent("""\
-                def run(args):
-                    path = args.get("filename", args.get("path", "output.txt"))
-                    content = args.get("content", "")
-                    with open(f"/output/{path}", "w") as f:
-                        f.write(str(content))
-                    return f"Written to {path}"
-            """),
-            "python_interpreter": textwrap.dedent("""\
-                def run(args):
-                    import io, contextlib, json as _json
-                    code = args.get("code", args.get("script", "")).strip()
-                    input_data = args.get("input", "")
-                    if not code:
-                        return "Error: no code provided in args"
-                    buf = io.StringIO()
-                    local_vars = {"INPUT": input_data, "json": _json}
-                    try:
-                        compiled = compile(code, "<amsab>", "exec")
-                    except SyntaxError as e:
-                        lines = code.split("\\n")
-                        bad = lines[e.lineno - 1].strip() if e.lineno and e.lineno <= len(lines) else "?"
-                        raise SyntaxError(f"line {e.lineno}: {e.msg} — code: {bad!r}")
-                    with contextlib.redirect_stdout(buf):
-                        exec(compiled, local_vars)
-                    stdout = buf.getvalue().strip()
-                    output_var = local_vars.get("OUTPUT", "")
-                    result = stdout or (str(output_var) if output_var else "")
-                    return result if result else "(no output — add print() calls to your code)"
-            """),
-            "gmail_draft": textwrap.dedent("""\
-                def run(args):
-                    # Stub: In production integrate with Gmail API via MCP
-                    to = args.get("to", "")
-                    subject = args.get("subject", "")
-                    body = args.get("body", "")
-                    return f"[DRAFT] To:{to} Subject:{subject}\\n{body}"
-            """),
-            "mcp_generic": textwrap.dedent("""\
-                def run(args):
-                    import json
-                    server = args.get("server", "")
-                    method = args.get("method", "")
-                    params = args.get("params", {})
-                    return f"[MCP] Would call {server}/{method} with {json.dumps(params)}"
-            """),
-        }
-
     @staticmethod
-    def _unknown_tool(tool: str) -> str:
-        return textwrap.dedent(f"""\
-            def run(args):
-                return f"[AMSAB] Tool '{tool}' is not implemented in this worker image."
-        """)
+    def _write_task_file(task_dir: Path, tool: str, args: dict[str, Any], task: str) -> Path:
+        """Write the task.json consumed by ``python -m amsab_tools`` in the worker."""
+        task_path = task_dir / "task.json"
+        with task_path.open("w", encoding="utf-8") as f:
+            json.dump({"tool": tool, "task": task, "args": args}, f, separators=(",", ":"))
+        return task_path
 
 
 executor = SandboxExecutor()
@@ -0,0 +1,299 @@
+"""Fetch Proxy — host-side HTTP fetcher shared by sandboxed network tools.
+
+web_search / scraper containers are short-lived, so any connection pool or cache
+inside them dies with the node. Instead they call GET /api/fetch?url=... on the
+backend, which provides:
+
+- pooled keep-alive connections (one long-lived httpx.AsyncClient, TLS verified)
+- an HTTP cache honouring Cache-Control (max-age, no-store, no-cache) and
+  ETag / Last-Modified revalidation, shared across plans
+- per-domain rate limiting (minimum spacing between requests to one host,
+  redirect hops included)
+- a response size cap — bodies are streamed and cut off at the limit
+- SSRF protection — every connection (redirects are followed here, one by one)
+  goes to a public address only: no loopback, RFC 1918, link-local (cloud
+  metadata), CGNAT or reserved ranges, so the proxy cannot reach the backend
+  itself or anything else on the host's networks. The host is resolved once, at
+  connect time, and the socket opened to the vetted address (no DNS rebinding)
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import SplitResult, urljoin, urlsplit
+
+import httpcore
+import httpx
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_FORWARDED_HEADERS = ("user-agent", "accept", "accept-language")
+_MAX_REDIRECTS = 5
+
+
+class BlockedAddressError(ValueError):
+    """The URL points at an address the proxy must not reach (private, loopback, ...)."""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])   # drop an IPv6 zone id
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _parse_url(url: str) -> SplitResult:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url!r}")
+    return parts
+
+
+class _VettedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore backend that connects only to addresses FetchProxy._resolve approved.
+
+    Resolving and connecting happen in one place, so a DNS answer that changes
+    between the check and the connect cannot steer the socket elsewhere. TLS still
+    sends SNI for, and verifies the certificate against, the hostname.
+    """
+
+    def __init__(self, proxy: "FetchProxy") -> None:
+        self._proxy = proxy
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        address = await self._proxy._resolve(host, port)
+        return await self._backend.connect_tcp(
+            address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+        )
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise BlockedAddressError("Refusing to connect to a unix socket")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+@dataclass
+class FetchResult:
+    status: int
+    body: bytes
+    content_type: str = "text/html"
+    cache: str = "MISS"          # MISS | HIT | REVALIDATED | BYPASS
+    truncated: bool = False
+
+
+@dataclass
+class _CacheEntry:
+    status: int
+    body: bytes
+    content_type: str
+    etag: str | None
+    last_modified: str | None
+    fresh_until: float           # time.monotonic() deadline; 0 means "always revalidate"
+
+
+def _cache_directives(header: str | None) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for part in (header or "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        key, _, value = part.partition("=")
+        directives[key.strip()] = value.strip().strip('"') or None
+    return directives
+
+
+class FetchProxy:
+    """Pooled, caching, rate-limited HTTP GET on behalf of worker containers."""
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        min_interval_seconds: float | None = None,
+        cache_max_entries: int | None = None,
+        timeout_seconds: float | None = None,
+        allow_private_networks: bool | None = None,
+    ) -> None:
+        self._max_bytes = max_bytes or settings.fetch_max_bytes
+        self._min_interval = (
+            settings.fetch_min_interval_seconds if min_interval_seconds is None else min_interval_seconds
+        )
+        self._cache_max_entries = cache_max_entries or settings.fetch_cache_max_entries
+        self._timeout = timeout_seconds or settings.fetch_timeout_seconds
+        self.allow_private_networks = (
+            settings.fetch_allow_private_networks if allow_private_networks is None else allow_private_networks
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._next_slot: dict[str, float] = {}    # host -> monotonic time of next allowed request
+        self._slot_sweep_at = 256                  # drop past slots once the map grows this big
+        self._slot_lock = asyncio.Lock()
+        self.stats = {"requests": 0, "hits": 0, "revalidated": 0, "misses": 0, "truncated": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            transport = httpx.AsyncHTTPTransport(limits=limits)
+            # The pool httpx would build, but connecting through the SSRF-vetting backend
+            transport._pool = httpcore.AsyncConnectionPool(
+                ssl_context=httpx.create_ssl_context(),
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+                network_backend=_VettedNetworkBackend(self),
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                follow_redirects=False,               # followed by _open, one slot per hop
+                transport=transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _wait_for_slot(self, host: str) -> None:
+        if self._min_interval <= 0:
+            return
+        async with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._min_interval
+            if len(self._next_slot) > self._slot_sweep_at:
+                # A host whose slot has passed is indistinguishable from a new one
+                self._next_slot = {h: t for h, t in self._next_slot.items() if t > now}
+                self._slot_sweep_at = max(256, 2 * len(self._next_slot))
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _resolve(self, host: str, port: int) -> str:
+        """The address to connect to for host: refused unless every address it resolves to is public."""
+        if self.allow_private_networks:
+            return host
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(f"Cannot resolve {host}: {e}") from e
+        for *_, sockaddr in infos:
+            if not _is_public_address(sockaddr[0]):
+                raise BlockedAddressError(
+                    f"Refusing to fetch {host}: resolves to non-public address {sockaddr[0]}"
+                )
+        return infos[0][4][0]
+
+    async def _open(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """Send the GET, following redirects hop by hop; each hop takes a rate-limit
+        slot for its host, and each new connection is vetted by _resolve.
+
+        The returned response is streaming: the caller must aclose() it.
+        """
+        client = self._get_client()
+        for _ in range(_MAX_REDIRECTS + 1):
+            await self._wait_for_slot(_parse_url(url).hostname)
+            resp = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+            if not resp.has_redirect_location:
+                return resp
+            await resp.aclose()
+            url = urljoin(url, resp.headers["location"])
+        raise ValueError(f"Too many redirects fetching {url!r}")
+
+    @staticmethod
+    def _fresh_until(directives: dict[str, str | None]) -> float:
+        max_age = directives.get("s-maxage") or directives.get("max-age")
+        if "no-cache" in directives or not (max_age and max_age.isdigit()) or int(max_age) <= 0:
+            return 0.0
+        return time.monotonic() + int(max_age)
+
+    def _store(self, url: str, resp: httpx.Response, body: bytes) -> None:
+        directives = _cache_directives(resp.headers.get("cache-control"))
+        etag = resp.headers.get("etag")
+        last_modified = resp.headers.get("last-modified")
+        if resp.status_code != 200 or "no-store" in directives:
+            self._cache.pop(url, None)
+            return
+        fresh_until = self._fresh_until(directives)
+        if not fresh_until and not (etag or last_modified):
+            return  # nothing to serve fresh and nothing to revalidate with
+        self._cache[url] = _CacheEntry(
+            status=resp.status_code,
+            body=body,
+            content_type=resp.headers.get("content-type", "text/html"),
+            etag=etag,
+            last_modified=last_modified,
+            fresh_until=fresh_until,
+        )
+        self._cache.move_to_end(url)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+
+    async def _read_capped(self, resp: httpx.Response) -> tuple[bytes, bool]:
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in resp.aiter_bytes():
+            remaining = self._max_bytes - size
+            if len(chunk) >= remaining:
+                chunks.append(chunk[:remaining])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks), False
+
+    async def fetch(self, url: str, headers: dict[str, str] | None = None) -> FetchResult:
+        """GET a URL through the pool and cache."""
+        _parse_url(url)  # unsupported schemes fail before touching cache or stats
+        self.stats["requests"] += 1
+
+        entry = self._cache.get(url)
+        if entry and entry.fresh_until and entry.fresh_until > time.monotonic():
+            self._cache.move_to_end(url)
+            self.stats["hits"] += 1
+            return FetchResult(entry.status, entry.body, entry.content_type, cache="HIT")
+
+        request_headers = {
+            k: v for k, v in (headers or {}).items() if k.lower() in _FORWARDED_HEADERS
+        }
+        if entry:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        resp = await self._open(url, request_headers)
+        try:
+            if resp.status_code == 304 and entry:
+                # Not modified: keep the body, take the new freshness/validators
+                entry.fresh_until = self._fresh_until(_cache_directives(resp.headers.get("cache-control")))
+                entry.etag = resp.headers.get("etag", entry.etag)
+                entry.last_modified = resp.headers.get("last-modified", entry.last_modified)
+                self._cache.move_to_end(url)
+                self.stats["revalidated"] += 1
+                return FetchResult(entry.status, entry.body, entry.content_type, cache="REVALIDATED")
+            body, truncated = await self._read_capped(resp)
+            if truncated:
+                self.stats["truncated"] += 1
+                logger.info("Fetch proxy truncated %s at %d bytes", url, self._max_bytes)
+            else:
+                self._store(url, resp, body)
+            self.stats["misses"] += 1
+            return FetchResult(
+                status=resp.status_code,
+                body=body,
+                content_type=resp.headers.get("content-type", "text/html"),
+                cache="MISS" if not truncated else "BYPASS",
+                truncated=truncated,
+            )
+        finally:
+            await resp.aclose()
+
+
+fetch_proxy = FetchProxy()
@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 import uuid
 from datetime import datetime
 from typing import Any
@@ -22,6 +23,7 @@ from ..config import settings
 from ..models.state import WsEvent, WsEventType
 from ..models.task_graph import NodeStatus, PlanStatus, TaskGraph, TaskNode
 from .architect import architect
+from .blob_store import blob_store
 from .executor import executor
 from .memory import memory_vault
 
@@ -60,17 +62,33 @@ ws_manager = ConnectionManager()
 _killed_plans: set[str] = set()
 # Guard against duplicate execute_plan calls for the same plan
 _running_plans: set[str] = set()
+# Live asyncio tasks per plan (driver loop + in-flight nodes) so kill can cancel them directly
+_plan_tasks: dict[str, set[asyncio.Task]] = {}
 
 
 class Orchestrator:
     """Drives plan execution with checkpoint-resume, HITL, memory vault, and kill switch."""
 
     async def execute_plan(self, plan_id: str) -> None:
-        """Main execution loop for a plan. Called as a background task."""
+        """Run a plan to completion. Called as a background task.
+
+        The execution loop runs in its own task, registered in _plan_tasks, so the
+        kill switch can cancel it without touching the caller's request task.
+        """
         if plan_id in _running_plans:
             logger.warning("execute_plan already running for plan %s — ignoring duplicate", plan_id)
             return
         _running_plans.add(plan_id)
+        driver = asyncio.create_task(self._execute_plan(plan_id), name=f"amsab-plan-{plan_id}")
+        _plan_tasks[plan_id] = {driver}
+        try:
+            await driver
+        finally:
+            _running_plans.discard(plan_id)
+            _plan_tasks.pop(plan_id, None)
+
+    async def _execute_plan(self, plan_id: str) -> None:
+        """Main execution loop for a plan."""
         logger.info("execute_plan started for plan %s", plan_id)
         plan = db.get_plan(plan_id)
         if not plan:
@@ -144,19 +162,42 @@ class Orchestrator:
                     continue
                 dispatched_node_ids.update(n.id for n in ready)
 
-                # Run all ready nodes concurrently
-                tasks = [self._run_node(plan_id, dag, node, context) for node in ready]
-                await asyncio.gather(*tasks)
+                # Run all ready nodes concurrently, as tracked tasks the kill switch can cancel
+                tasks = [
+                    asyncio.create_task(
+                        self._run_node(plan_id, dag, node, context),
+                        name=f"amsab-plan-{plan_id}-node{node.id}",
+                    )
+                    for node in ready
+                ]
+                _plan_tasks.setdefault(plan_id, set()).update(tasks)
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    _plan_tasks.get(plan_id, set()).difference_update(tasks)
 
                 # Persist updated dag
                 db.update_plan_status(plan_id, PlanStatus.running, dag)
 
+        except asyncio.CancelledError:
+            if plan_id not in _killed_plans:
+                raise
+            _killed_plans.discard(plan_id)
+            # Nodes interrupted mid-flight (running or waiting on HITL) end as failed
+            for n in dag.nodes:
+                if n.status in (NodeStatus.running, NodeStatus.awaiting_approval, NodeStatus.approved):
+                    n.status = NodeStatus.failed
+                    n.error = "Killed by kill switch"
+            db.update_plan_status(plan_id, PlanStatus.failed, dag)
+            await ws_manager.broadcast(WsEvent(
+                event=WsEventType.PLAN_FAILED,
+                plan_id=plan_id,
+                data={"reason": "kill_switch"},
+            ))
         except Exception as exc:
             logger.error("execute_plan crashed for plan %s: %s", plan_id, exc, exc_info=True)
             db.update_plan_status(plan_id, PlanStatus.failed)
             db.add_log(plan_id, f"💥 Internal error: {exc}", level="error")
-        finally:
-            _running_plans.discard(plan_id)
 
     async def _run_node(
         self,
@@ -242,16 +283,23 @@ class Orchestrator:
         result = await executor.run_node(plan_id, node, context, log_callback=_log)
 
         if result.success:
+            # Large outputs are spilled once; everything downstream carries the handle
+            output_ref = await asyncio.to_thread(blob_store.spill, plan_id, result.output)
+            preview = blob_store.preview(plan_id, output_ref)
             node.status = NodeStatus.completed
-            node.result = result.output
+            node.result = preview
             node.completed_at = datetime.utcnow().isoformat()
-            context[f"node_{node.id}_output"] = result.output
+            context[f"node_{node.id}_output"] = output_ref
 
             db.upsert_node(
                 plan_id, node.id,
                 status=NodeStatus.completed,
-                result=result.output,
-                snapshot={"output": result.output, "context_keys": list(context.keys())},
+                result=preview,
+                snapshot={
+                    "output": preview,
+                    "output_ref": output_ref if blob_store.is_handle(output_ref) else None,
+                    "context_keys": list(context.keys()),
+                },
                 token_usage=result.token_usage,
             )
             db.add_log(plan_id, f"✅ Node {node.id} completed.", node_id=node.id)
@@ -264,7 +312,7 @@ class Orchestrator:
                     plan_id=plan_id,
                     node_id=node.id,
                     task=node.task,
-                    output=result.output,
+                    output=preview,
                     tool=node.tool,
                 )
             except Exception as mem_exc:
@@ -280,7 +328,7 @@ class Orchestrator:
                 plan_id=plan_id,
                 data={
                     "node_id": node.id,
-                    "output_preview": result.output[:200],
+                    "output_preview": preview[:200],
                     "memory_stats": mem_stats,
                 },
             ))
@@ -360,12 +408,26 @@ class Orchestrator:
             node.status = NodeStatus.skipped
         db.update_plan_status(plan_id, PlanStatus.running, plan.dag)
 
-    async def kill(self, plan_id: str) -> None:
-        """Kill switch — immediately halt all execution for a plan."""
+    async def kill(self, plan_id: str) -> float:
+        """Kill switch — immediately halt all execution for a plan.
+
+        Cancels the plan's driver and node tasks (streaming readers, HITL waiters)
+        and kills exactly the containers the executor started for it. Returns the
+        time-to-halt in milliseconds.
+        """
+        started = time.perf_counter()
+        # Flag first: also stops a plan whose driver has not registered yet
         _killed_plans.add(plan_id)
-        # Ask the executor to kill any running Docker containers for this plan
+        tasks = [t for t in _plan_tasks.get(plan_id, ()) if not t.done()]
+        for task in tasks:
+            task.cancel()
         await executor.kill_plan_containers(plan_id)
-        logger.warning("Kill switch activated for plan %s", plan_id)
+        if tasks:
+            await asyncio.wait(tasks, timeout=5)
+        halt_ms = (time.perf_counter() - started) * 1000
+        logger.warning("Kill switch activated for plan %s — halted in %.1fms", plan_id, halt_ms)
+        db.add_log(plan_id, f"🔴 Kill switch: {len(tasks)} task(s) cancelled, halted in {halt_ms:.0f}ms.")
+        return halt_ms
 
     async def rewind_node(
         self,
@@ -7,10 +7,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
+from .core.fetch_proxy import fetch_proxy
 from .database import init_db
 from .api.routes.goals import router as goals_router
 from .api.routes.ws import router as ws_router
 from .api.routes.mcp import router as mcp_router
+from .api.routes.fetch import router as fetch_router
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,6 +40,7 @@ app.add_middleware(
 app.include_router(goals_router)
 app.include_router(ws_router)
 app.include_router(mcp_router)
+app.include_router(fetch_router)
 
 
 @app.on_event("startup")
@@ -46,6 +49,11 @@ async def startup() -> None:
     logging.getLogger(__name__).info("AMSAB backend started. DB: %s", settings.sqlite_path)
 
 
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await fetch_proxy.aclose()
+
+
 @app.get("/health")
 async def health() -> dict:
     return {"status": "ok", "version": "0.1.0"}
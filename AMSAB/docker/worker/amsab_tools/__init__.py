@@ -0,0 +1,17 @@
+"""AMSAB worker tools — baked into amsab-worker:latest and byte-compiled at build time.
+
+Each tool lives in its own module exposing ``run(args) -> str``. The executor
+no longer generates a runner script per node; it writes ``task.json`` into the
+node's workspace and starts ``python -m amsab_tools``.
+"""
+
+# tool name -> module (explicit so an LLM-chosen tool name can never import arbitrary code)
+TOOLS: dict[str, str] = {
+    "web_search": "amsab_tools.web_search",
+    "scraper": "amsab_tools.scraper",
+    "filesystem_read": "amsab_tools.filesystem_read",
+    "filesystem_write": "amsab_tools.filesystem_write",
+    "python_interpreter": "amsab_tools.python_interpreter",
+    "gmail_draft": "amsab_tools.gmail_draft",
+    "mcp_generic": "amsab_tools.mcp_generic",
+}
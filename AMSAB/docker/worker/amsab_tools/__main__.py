@@ -0,0 +1,35 @@
+"""Worker entry point: ``python -m amsab_tools``.
+
+Reads the node's task file (tool, task, args), hydrates blob handles from the
+read-only /blobs mount, runs the tool and prints one JSON status line.
+"""
+import importlib
+import json
+import os
+import sys
+
+from . import TOOLS
+from .blobs import hydrate
+
+TASK_FILE = os.environ.get("AMSAB_TASK_FILE", "/workspace/task.json")
+
+
+def main() -> int:
+    with open(TASK_FILE, encoding="utf-8") as f:
+        task = json.load(f)
+    tool = task.get("tool", "")
+    try:
+        module_name = TOOLS.get(tool)
+        if module_name is None:
+            result = f"[AMSAB] Tool '{tool}' is not implemented in this worker image."
+        else:
+            result = importlib.import_module(module_name).run(hydrate(task.get("args", {})))
+        print(json.dumps({"status": "ok", "output": result}))
+        return 0
+    except Exception as exc:
+        print(json.dumps({"status": "error", "error": str(exc)}))
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
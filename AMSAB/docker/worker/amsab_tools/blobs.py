@@ -0,0 +1,21 @@
+"""Resolve blob handles left in task args against the read-only /blobs mount."""
+import os
+import re
+
+BLOB_DIR = os.environ.get("AMSAB_BLOB_DIR", "/blobs")
+_BLOB_RE = re.compile(r"amsab-blob://([0-9a-f]{64})")
+
+
+def _read_blob(match: "re.Match[str]") -> str:
+    with open(os.path.join(BLOB_DIR, match.group(1)), encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def hydrate(value):
+    if isinstance(value, str):
+        return _BLOB_RE.sub(_read_blob, value)
+    if isinstance(value, list):
+        return [hydrate(v) for v in value]
+    if isinstance(value, dict):
+        return {k: hydrate(v) for k, v in value.items()}
+    return value
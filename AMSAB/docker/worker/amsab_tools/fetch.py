@@ -0,0 +1,25 @@
+"""HTTP GET for network tools — routed through the backend fetch proxy when available.
+
+The executor sets AMSAB_FETCH_PROXY and AMSAB_FETCH_TOKEN for network tools; the
+proxy owns the keep-alive pool, HTTP cache, per-domain rate limit and size cap.
+Without it (e.g. running a tool by hand) requests go direct, with TLS
+verification on.
+"""
+import os
+import urllib.parse
+import urllib.request
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AMSAB/1.0)"}
+
+
+def open_url(url, headers=None, timeout=20):
+    """Return an open response for url; raises urllib.error.HTTPError / URLError."""
+    proxy = os.environ.get("AMSAB_FETCH_PROXY")
+    headers = {**DEFAULT_HEADERS, **(headers or {})}
+    if proxy:
+        target = f"{proxy}?url={urllib.parse.quote(url, safe='')}"
+        headers["X-AMSAB-Fetch-Token"] = os.environ.get("AMSAB_FETCH_TOKEN", "")
+    else:
+        target = url
+    req = urllib.request.Request(target, headers=headers)
+    return urllib.request.urlopen(req, timeout=timeout)
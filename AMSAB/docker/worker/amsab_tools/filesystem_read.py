@@ -0,0 +1,17 @@
+"""filesystem_read — read a file from the node's workspace or output dir."""
+
+
+def run(args):
+    import os
+    path = args.get("path", "")
+    if not path:
+        return "Error: no path provided"
+    if not os.path.exists(path):
+        available = []
+        for d in ["/output", "/workspace"]:
+            if os.path.isdir(d):
+                available += [f"{d}/{f}" for f in os.listdir(d)]
+        hint = f"Available files: {available}" if available else "No files written yet."
+        return f"File not found: {path}. {hint}"
+    with open(path) as f:
+        return f.read()
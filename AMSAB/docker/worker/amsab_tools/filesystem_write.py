@@ -0,0 +1,9 @@
+"""filesystem_write — write content to /output/<filename>."""
+
+
+def run(args):
+    path = args.get("filename", args.get("path", "output.txt"))
+    content = args.get("content", "")
+    with open(f"/output/{path}", "w") as f:
+        f.write(str(content))
+    return f"Written to {path}"
@@ -0,0 +1,9 @@
+"""gmail_draft — stub that renders the draft email as text."""
+
+
+def run(args):
+    # Stub: In production integrate with Gmail API via MCP
+    to = args.get("to", "")
+    subject = args.get("subject", "")
+    body = args.get("body", "")
+    return f"[DRAFT] To:{to} Subject:{subject}\n{body}"
@@ -0,0 +1,133 @@
+"""Streaming HTML → text extraction for scraper and web_search.
+
+Pages are decoded and fed to ``html.parser`` chunk by chunk instead of being
+read whole and run through several full-document ``re.sub`` passes.
+script/style subtrees are skipped, whitespace is collapsed on the fly, and
+reading stops as soon as every parser has filled its output budget — a
+multi-MB page costs one chunk of memory and only as much parsing as needed.
+"""
+import codecs
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 16 * 1024
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+
+class TextExtractor(HTMLParser):
+    """Visible text with collapsed whitespace, capped at ``budget`` characters."""
+
+    def __init__(self, budget):
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.done = False
+        self._parts = []
+        self._size = 0
+        self._skip_depth = 0
+        self._space = False     # a word break is pending before the next text
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        self._space = True      # tags separate words, like the old re.sub("<[^>]+>", " ")
+
+    def handle_startendtag(self, tag, attrs):
+        self._space = True
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        self._space = True
+
+    def handle_data(self, data):
+        if self._skip_depth or self.done:
+            return
+        words = data.split()
+        if not words:
+            self._space = self._space or bool(data)
+            return
+        text = " ".join(words)
+        if self._size and (self._space or data[0].isspace()):
+            text = " " + text
+        self._space = data[-1].isspace()
+        remaining = self.budget - self._size
+        if len(text) >= remaining:
+            text = text[:remaining]
+            self.done = True
+        self._parts.append(text)
+        self._size += len(text)
+
+    def text(self):
+        return "".join(self._parts).strip()
+
+
+class DdgResultExtractor(HTMLParser):
+    """Titles, links and snippets from a DuckDuckGo Lite results page."""
+
+    def __init__(self, max_results=10):
+        super().__init__(convert_charrefs=True)
+        self.max_results = max_results
+        self.titles = []
+        self.links = []
+        self.snippets = []
+        self._capture = None    # (end tag, target list) while inside a result element
+        self._buf = []
+
+    @property
+    def done(self):
+        return len(self.titles) >= self.max_results and len(self.snippets) >= self.max_results
+
+    def handle_starttag(self, tag, attrs):
+        if self._capture:
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if tag == "a" and "result-link" in classes:
+            self.links.append(dict(attrs).get("href") or "")
+            self._capture = ("a", self.titles)
+        elif tag == "td" and "result-snippet" in classes:
+            self._capture = ("td", self.snippets)
+        if self._capture:
+            self._buf = []
+
+    def handle_endtag(self, tag):
+        if self._capture and tag == self._capture[0]:
+            self._capture[1].append(" ".join("".join(self._buf).split()))
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture:
+            self._buf.append(data)
+
+    def results(self):
+        return list(zip(self.titles, self.snippets, self.links))
+
+
+def feed_stream(fp, parsers, chunk_size=CHUNK_SIZE):
+    """Feed a binary file-like object to parsers until all are done or it ends."""
+    get_charset = getattr(getattr(fp, "headers", None), "get_content_charset", None)
+    charset = (get_charset() if get_charset else None) or "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        active = [p for p in parsers if not p.done]
+        if not active:
+            return
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        text = decoder.decode(chunk)
+        for p in active:
+            p.feed(text)
+    tail = decoder.decode(b"", final=True)
+    for p in parsers:
+        if not p.done:
+            p.feed(tail)
+            p.close()
+
+
+def stream_text(fp, budget, chunk_size=CHUNK_SIZE):
+    """Visible text of an HTML stream, reading only until ``budget`` chars are found."""
+    extractor = TextExtractor(budget)
+    feed_stream(fp, [extractor], chunk_size)
+    return extractor.text()
@@ -0,0 +1,9 @@
+"""mcp_generic — placeholder describing the MCP call that would be made."""
+
+
+def run(args):
+    import json
+    server = args.get("server", "")
+    method = args.get("method", "")
+    params = args.get("params", {})
+    return f"[MCP] Would call {server}/{method} with {json.dumps(params)}"
@@ -0,0 +1,23 @@
+"""python_interpreter — exec the given code and return its stdout (or OUTPUT)."""
+
+
+def run(args):
+    import io, contextlib, json as _json
+    code = args.get("code", args.get("script", "")).strip()
+    input_data = args.get("input", "")
+    if not code:
+        return "Error: no code provided in args"
+    buf = io.StringIO()
+    local_vars = {"INPUT": input_data, "json": _json}
+    try:
+        compiled = compile(code, "<amsab>", "exec")
+    except SyntaxError as e:
+        lines = code.split("\n")
+        bad = lines[e.lineno - 1].strip() if e.lineno and e.lineno <= len(lines) else "?"
+        raise SyntaxError(f"line {e.lineno}: {e.msg} — code: {bad!r}")
+    with contextlib.redirect_stdout(buf):
+        exec(compiled, local_vars)
+    stdout = buf.getvalue().strip()
+    output_var = local_vars.get("OUTPUT", "")
+    result = stdout or (str(output_var) if output_var else "")
+    return result if result else "(no output — add print() calls to your code)"
@@ -0,0 +1,18 @@
+"""scraper — fetch a page and return its visible text."""
+
+
+def run(args):
+    import urllib.error
+    from amsab_tools.fetch import open_url
+    from amsab_tools.html_text import stream_text
+    url = args.get("url", "")
+    if not url:
+        return "Error: no url provided"
+    try:
+        with open_url(url) as r:
+            # Parse incrementally, skipping script/style; stop once 6000 chars are found
+            return stream_text(r, budget=6000)
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"HTTP {e.code} fetching {url}: {e.reason}")
+    except urllib.error.URLError as e:
+        raise RuntimeError(f"Cannot reach {url}: {e.reason}")
@@ -0,0 +1,22 @@
+"""web_search — DuckDuckGo Lite results as numbered title/snippet/url blocks."""
+
+
+def run(args):
+    import urllib.parse
+    from amsab_tools.fetch import open_url
+    from amsab_tools.html_text import DdgResultExtractor, TextExtractor, feed_stream
+    query = urllib.parse.quote_plus(args.get("query", ""))
+    # DuckDuckGo Lite works reliably without a browser session
+    url = f"https://lite.duckduckgo.com/lite/?q={query}"
+    # One streaming pass collects result rows and a plain-text fallback;
+    # reading stops once 10 results (and the fallback budget) are filled
+    results = DdgResultExtractor(max_results=10)
+    fallback = TextExtractor(budget=4000)
+    with open_url(url, headers={"Accept": "text/html"}) as r:
+        feed_stream(r, [results, fallback])
+    if results.snippets:
+        return "\n\n".join(
+            f"{i}. {t}\n   {s}\n   {u}" for i, (t, s, u) in enumerate(results.results(), 1)
+        )
+    # Fallback: visible page text
+    return fallback.text()
@@ -0,0 +1,111 @@
+"""Benchmark node preparation and worker start-up for the Steel-Box executor.
+
+Measures:
+  * host-side preparation per node — legacy per-node runner codegen (dedent +
+    json indent + compile in the container) vs. writing task.json for the
+    pre-compiled amsab_tools package;
+  * container time-to-ready — `docker run` until a tool module is imported
+    (skipped when Docker or the worker image is unavailable).
+
+Run:
+    cd AMSAB
+    python scripts/bench_executor.py [--nodes 500] [--arg-kb 64] [--containers 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.config import settings  # noqa: E402
+from backend.core.executor import SandboxExecutor  # noqa: E402
+
+TOOLS_DIR = ROOT / "docker" / "worker" / "amsab_tools"
+
+
+def _legacy_script(tool: str, args: dict, task: str) -> str:
+    """What _build_script used to do: re-dedent every tool body and inline ARGS."""
+    bodies = {p.stem: textwrap.dedent(p.read_text()) for p in TOOLS_DIR.glob("*.py")}
+    parts = [
+        "# AMSAB Worker — auto-generated runner",
+        f"# Task: {task}",
+        "import json, sys, os",
+        f"ARGS = {json.dumps(args, indent=2)}",
+        bodies.get(tool, ""),
+    ]
+    return "\n".join(parts) + "\n"
+
+
+def bench_prep(nodes: int, arg_kb: int) -> None:
+    args = {"filename": "out.txt", "content": "lorem ipsum " * (arg_kb * 1024 // 12)}
+    with tempfile.TemporaryDirectory() as tmp:
+        task_dir = Path(tmp)
+
+        start = time.perf_counter()
+        for _ in range(nodes):
+            script = _legacy_script("filesystem_write", args, "write")
+            (task_dir / "runner.py").write_text(script)
+            compile(script, "runner.py", "exec")   # the container had to parse it every time
+        legacy = (time.perf_counter() - start) / nodes * 1000
+        legacy_size = (task_dir / "runner.py").stat().st_size
+
+        start = time.perf_counter()
+        for _ in range(nodes):
+            SandboxExecutor._write_task_file(task_dir, "filesystem_write", args, "write")
+        current = (time.perf_counter() - start) / nodes * 1000
+        current_size = (task_dir / "task.json").stat().st_size
+
+    print(f"Node preparation ({nodes} nodes, {arg_kb} KB args)")
+    print(f"  legacy runner.py codegen+parse : {legacy:8.3f} ms/node  ({legacy_size} bytes)")
+    print(f"  task.json + amsab_tools        : {current:8.3f} ms/node  ({current_size} bytes)")
+
+
+def bench_container(runs: int) -> None:
+    if not shutil.which("docker"):
+        print("Container time-to-ready: skipped (docker not on PATH)")
+        return
+    probe = subprocess.run(
+        ["docker", "image", "inspect", settings.docker_image],
+        capture_output=True,
+    )
+    if probe.returncode != 0:
+        print(f"Container time-to-ready: skipped ({settings.docker_image} not built)")
+        return
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [
+                "docker", "run", "--rm", "--network", "none", "--read-only",
+                settings.docker_image,
+                "python", "-c", "import amsab_tools.web_search, amsab_tools.scraper",
+            ],
+            check=True, capture_output=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"Container time-to-ready ({runs} runs)")
+    print(f"  median {statistics.median(timings):.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--arg-kb", type=int, default=64)
+    parser.add_argument("--containers", type=int, default=5)
+    opts = parser.parse_args()
+    bench_prep(opts.nodes, opts.arg_kb)
+    bench_container(opts.containers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark HTML → text extraction used by the scraper / web_search tools.
+
+Compares the legacy approach (read the whole page, three full-document re.sub
+passes, truncate) with the streaming html.parser extractor in
+docker/worker/amsab_tools/html_text.py, on generated fixture pages of
+increasing size with heavy inline <script>/<style> content.
+
+Run:
+    cd AMSAB
+    python scripts/bench_html_text.py [--sizes-mb 1 5 20] [--budget 6000]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "docker" / "worker"))
+
+from amsab_tools.html_text import stream_text  # noqa: E402
+
+_SCRIPT = "<script>" + "var data = {'k': '<p>not text</p>'};" * 200 + "</script>\n"
+_STYLE = "<style>" + ".c{color:red}" * 200 + "</style>\n"
+_PARA = "<div class='row'><p>Lorem ipsum <b>dolor</b> sit amet, &amp; consectetur.</p></div>\n"
+
+
+def fixture_page(size_mb: float) -> bytes:
+    """A page roughly size_mb large: alternating script/style blocks and paragraphs."""
+    block = (_SCRIPT + _STYLE + _PARA * 40).encode()
+    repeats = max(1, int(size_mb * 1024 * 1024 / len(block)))
+    return b"<html><head><title>Fixture</title></head><body>" + block * repeats + b"</body></html>"
+
+
+def legacy_extract(fp: io.BytesIO, budget: int) -> str:
+    html = fp.read().decode(errors="replace")
+    html = re.sub(r"<(script|style)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", " ", html)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text[:budget]
+
+
+def _measure(fn, page: bytes, budget: int) -> tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn(io.BytesIO(page), budget)
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, len(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--budget", type=int, default=6000)
+    opts = parser.parse_args()
+
+    print(f"{'page':>8} {'extractor':>10} {'time ms':>10} {'peak MB':>9} {'chars':>7}")
+    for size in opts.sizes_mb:
+        page = fixture_page(size)
+        for name, fn in (("legacy", legacy_extract), ("streaming", stream_text)):
+            elapsed, peak, chars = _measure(fn, page, opts.budget)
+            print(f"{len(page) / 1024 / 1024:7.1f}M {name:>10} {elapsed:10.1f} {peak:9.2f} {chars:7d}")
+        # Full-page throughput (budget never reached) for the streaming parser
+        elapsed, peak, chars = _measure(stream_text, page, len(page))
+        print(f"{'':>8} {'full-page':>10} {elapsed:10.1f} {peak:9.2f} {chars:7d}")
+
+
+if __name__ == "__main__":
+    main()
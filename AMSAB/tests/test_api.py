@@ -19,8 +19,10 @@ import pytest
 _TMP_DB = tempfile.mktemp(suffix="_amsab_test.db")
 os.environ["OPENAI_API_KEY"] = "test-key"
 os.environ["SQLITE_PATH"] = _TMP_DB
+os.environ["WORKSPACE_DIR"] = tempfile.mkdtemp(suffix="_amsab_workspace")
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+_WORKER_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "docker", "worker")
 
 # Now import backend (picks up SQLITE_PATH from env)
 from backend import database as db
@@ -240,6 +242,38 @@ def test_kill_switch(client):
     print(f"\n  ✅ Kill switch activated")
 
 
+def test_kill_switch_cancels_in_flight_nodes():
+    import asyncio
+    from backend.core import orchestrator as orch
+    from backend.core.executor import executor
+
+    pid = _seed(status=PlanStatus.approved)
+    started = asyncio.Event()
+
+    async def _hang(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def scenario():
+        runner = asyncio.create_task(orch.orchestrator.execute_plan(pid))
+        await asyncio.wait_for(started.wait(), 5)
+        halt_ms = await orch.orchestrator.kill(pid)
+        await asyncio.wait_for(runner, 2)
+        return halt_ms
+
+    with patch.object(executor, "run_node", new=_hang), \
+            patch("backend.core.executor.SandboxExecutor.kill_plan_containers", new=AsyncMock()) as kill_mock:
+        halt_ms = asyncio.run(scenario())
+
+    plan = db.get_plan(pid)
+    assert plan.status == PlanStatus.failed
+    assert plan.dag.get_node(1).status == NodeStatus.failed
+    assert pid not in orch._plan_tasks and pid not in orch._killed_plans
+    kill_mock.assert_awaited_once()
+    assert halt_ms < 1000
+    print(f"\n  ✅ Kill switch cancelled running node in {halt_ms:.1f}ms")
+
+
 # ─────────────────────────────────────────────────────────────────────────── #
 #  8. Logs
 # ─────────────────────────────────────────────────────────────────────────── #
@@ -396,3 +430,372 @@ def test_db_branch_plan():
     row = db.get_plan(child)
     assert row.branch_of == parent
     print(f"\n  ✅ DB: branch plan links back to parent")
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#  13. Blob store — large outputs handed off by reference
+# ─────────────────────────────────────────────────────────────────────────── #
+
+def test_blob_spill_small_output_stays_inline():
+    from backend.core.blob_store import blob_store
+    pid = str(uuid.uuid4())
+    assert blob_store.spill(pid, "short output") == "short output"
+    assert blob_store.preview(pid, "short output") == "short output"
+    print(f"\n  ✅ Blob: small output kept inline")
+
+
+def test_blob_spill_large_output_is_content_addressed():
+    from backend.config import settings
+    from backend.core.blob_store import blob_store
+    pid = str(uuid.uuid4())
+    big = "x" * (settings.blob_inline_threshold_bytes + 1)
+    handle = blob_store.spill(pid, big)
+    assert blob_store.is_handle(handle)
+    assert blob_store.spill(pid, big) == handle          # same content → same blob
+    assert blob_store.read(pid, handle) == big
+    preview = blob_store.preview(pid, handle)
+    assert len(preview) < 1000 and handle in preview
+    print(f"\n  ✅ Blob: large output spilled to {handle[:28]}…")
+
+
+def test_blob_concurrent_puts_of_same_content(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+    from backend.core.blob_store import blob_store
+    pid = str(uuid.uuid4())
+    big = "w" * 200_000
+    blob_store.blob_dir(pid)
+    # Every call sees the blob as missing, as concurrent first spills do
+    monkeypatch.setattr(Path, "exists", lambda self: False)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        handles = set(pool.map(lambda _: blob_store.put(pid, big), range(32)))
+    assert len(handles) == 1
+    blob_dir = blob_store.blob_dir(pid)
+    assert [p.name for p in blob_dir.iterdir()] == [handles.pop().removeprefix("amsab-blob://")]
+    print(f"\n  ✅ Blob: 32 concurrent spills of one blob, no leftover temp files")
+
+
+def test_blob_handle_resolved_in_task_file(tmp_path):
+    import json
+    from backend.config import settings
+    from backend.core.blob_store import blob_store
+    from backend.core.executor import executor
+    pid = str(uuid.uuid4())
+    handle = blob_store.spill(pid, "y" * (settings.blob_inline_threshold_bytes + 1))
+    ctx = {"node_1_output": handle}
+    args = executor._resolve_references({"content": "$node_1_output"}, ctx, tool="filesystem_write")
+    assert args["content"] == handle
+    code = executor._resolve_references({"code": "print(len($node_1_output))"}, ctx, tool="python_interpreter")
+    assert "/blobs/" in code["code"] and "b64decode" not in code["code"]
+    task_path = executor._write_task_file(tmp_path, "filesystem_write", args, "write")
+    assert task_path.stat().st_size < 500
+    assert json.loads(task_path.read_text())["args"]["content"] == handle
+    print(f"\n  ✅ Blob: handles passed by reference in task.json")
+
+
+def test_get_blob_endpoint(client):
+    from backend.config import settings
+    from backend.core.blob_store import blob_store
+    pid = _seed()
+    big = "z" * (settings.blob_inline_threshold_bytes + 1)
+    digest = blob_store.spill(pid, big).removeprefix("amsab-blob://")
+    r = client.get(f"/api/plans/{pid}/blobs/{digest}")
+    assert r.status_code == 200
+    assert r.text == big
+    assert client.get(f"/api/plans/{pid}/blobs/{'0' * 64}").status_code == 404
+    print(f"\n  ✅ Blob endpoint streams full output")
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#  14. Worker tool package (runs in-process, no Docker needed)
+# ─────────────────────────────────────────────────────────────────────────── #
+
+def _run_worker(task: dict, tmp_path, blob_dir=None) -> dict:
+    import json
+    import subprocess
+    task_file = tmp_path / "task.json"
+    task_file.write_text(json.dumps(task))
+    env = {
+        **os.environ,
+        "PYTHONPATH": _WORKER_DIR,
+        "AMSAB_TASK_FILE": str(task_file),
+        "AMSAB_BLOB_DIR": str(blob_dir or tmp_path),
+    }
+    proc = subprocess.run(
+        [sys.executable, "-m", "amsab_tools"], env=env, capture_output=True, text=True, timeout=30,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_worker_runs_tool_from_task_file(tmp_path):
+    out = _run_worker(
+        {"tool": "gmail_draft", "task": "draft", "args": {"to": "a@b.c", "subject": "Hi", "body": "x"}},
+        tmp_path,
+    )
+    assert out == {"status": "ok", "output": "[DRAFT] To:a@b.c Subject:Hi\nx"}
+    print(f"\n  ✅ Worker: tool module executed from task.json")
+
+
+def test_worker_hydrates_blob_handles(tmp_path):
+    import hashlib
+    body = "blob body " * 10
+    digest = hashlib.sha256(body.encode()).hexdigest()
+    (tmp_path / digest).write_text(body)
+    out = _run_worker(
+        {"tool": "python_interpreter", "task": "len", "args": {"code": "print(len(INPUT))",
+                                                               "input": f"amsab-blob://{digest}"}},
+        tmp_path,
+    )
+    assert out["output"] == str(len(body))
+    print(f"\n  ✅ Worker: blob handle hydrated from /blobs")
+
+
+def test_worker_unknown_tool(tmp_path):
+    out = _run_worker({"tool": "../../etc", "task": "x", "args": {}}, tmp_path)
+    assert out["status"] == "ok" and "not implemented" in out["output"]
+    print(f"\n  ✅ Worker: unknown tool rejected")
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#  15. HTML text extraction — streamed, stops at the budget (in-process)
+# ─────────────────────────────────────────────────────────────────────────── #
+
+@pytest.fixture(scope="module")
+def html_text():
+    if _WORKER_DIR not in sys.path:
+        sys.path.insert(0, _WORKER_DIR)
+    from amsab_tools import html_text
+    return html_text
+
+
+def test_html_text_skips_script_and_stops_at_budget(html_text):
+    import io
+
+    class Counting(io.BytesIO):
+        reads = 0
+
+        def read(self, n=-1):
+            Counting.reads += 1
+            return super().read(n)
+
+    page = b"<p>Hi <b>there</b></p><script>var s = '<p>hidden</p>';</script><STYLE>p{}</STYLE>" \
+        + b"<p>word &amp; more</p>" * 50_000
+    fp = Counting(page)
+    text = html_text.stream_text(fp, budget=40, chunk_size=1024)
+    assert text == "Hi there word & more word & more word &"
+    assert Counting.reads < 5            # stopped long before the 1MB page was read
+    print(f"\n  ✅ HTML text: script/style skipped, stopped after {Counting.reads} chunks")
+
+
+def test_html_text_ddg_results(html_text):
+    import io
+    page = (
+        '<a rel="nofollow" href="https://a.example" class="result-link">A <b>one</b></a>'
+        '<td class="result-snippet">First &amp; best</td>'
+        '<a href="https://b.example" class="result-link">B</a>'
+        '<td class="result-snippet">Second</td>'
+    ).encode()
+    parser = html_text.DdgResultExtractor(max_results=10)
+    html_text.feed_stream(io.BytesIO(page), [parser], chunk_size=16)
+    assert parser.results() == [
+        ("A one", "First & best", "https://a.example"),
+        ("B", "Second", "https://b.example"),
+    ]
+    print(f"\n  ✅ HTML text: DDG Lite results parsed incrementally")
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#  16. Fetch proxy — pooled, cached, rate-limited (against a local stub server)
+# ─────────────────────────────────────────────────────────────────────────── #
+
+@pytest.fixture(scope="module")
+def stub_http():
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits: dict[str, int] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            hits[path] = hits.get(path, 0) + 1
+            if path == "/cached":
+                self._send(200, b"<p>cached</p>", {"Cache-Control": "max-age=60"})
+            elif path == "/etag":
+                if self.headers.get("If-None-Match") == '"v1"':
+                    self._send(304, headers={"ETag": '"v1"'})
+                else:
+                    self._send(200, b"<p>etag</p>", {"ETag": '"v1"', "Cache-Control": "no-cache"})
+            elif path == "/nostore":
+                self._send(200, b"fresh", {"Cache-Control": "no-store"})
+            elif path == "/big":
+                self._send(200, b"x" * 200_000)
+            elif path == "/redirect":
+                self._send(302, headers={"Location": "http://169.254.169.254/latest/meta-data/"})
+            elif path == "/hop":
+                self._send(302, headers={"Location": "/nostore"})
+            else:
+                self._send(404, b"missing")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+
+
+def _fetch_all(proxy, urls):
+    import asyncio
+
+    async def _go():
+        try:
+            return [await proxy.fetch(u) for u in urls]
+        finally:
+            await proxy.aclose()
+    return asyncio.run(_go())
+
+
+def test_fetch_proxy_honours_max_age(stub_http):
+    from backend.core.fetch_proxy import FetchProxy
+    base, hits = stub_http
+    first, second = _fetch_all(FetchProxy(min_interval_seconds=0, allow_private_networks=True), [f"{base}/cached"] * 2)
+    assert (first.cache, second.cache) == ("MISS", "HIT")
+    assert second.body == b"<p>cached</p>" and hits["/cached"] == 1
+    print(f"\n  ✅ Fetch proxy: max-age served from cache")
+
+
+def test_fetch_proxy_revalidates_etag(stub_http):
+    from backend.core.fetch_proxy import FetchProxy
+    base, hits = stub_http
+    first, second = _fetch_all(FetchProxy(min_interval_seconds=0, allow_private_networks=True), [f"{base}/etag"] * 2)
+    assert (first.cache, second.cache) == ("MISS", "REVALIDATED")
+    assert second.status == 200 and second.body == b"<p>etag</p>"
+    assert hits["/etag"] == 2
+    print(f"\n  ✅ Fetch proxy: ETag revalidated with 304")
+
+
+def test_fetch_proxy_no_store_and_size_cap(stub_http):
+    from backend.core.fetch_proxy import FetchProxy
+    base, hits = stub_http
+    results = _fetch_all(
+        FetchProxy(min_interval_seconds=0, max_bytes=1_000, allow_private_networks=True),
+        [f"{base}/nostore", f"{base}/nostore", f"{base}/big"],
+    )
+    assert [r.cache for r in results[:2]] == ["MISS", "MISS"] and hits["/nostore"] == 2
+    assert results[2].truncated and len(results[2].body) == 1_000
+    print(f"\n  ✅ Fetch proxy: no-store bypassed, oversized body capped")
+
+
+def test_fetch_proxy_rate_limits_per_domain(stub_http):
+    import time
+    from backend.core.fetch_proxy import FetchProxy
+    base, _ = stub_http
+    start = time.monotonic()
+    _fetch_all(
+        FetchProxy(min_interval_seconds=0.2, allow_private_networks=True),
+        [f"{base}/nostore", f"{base}/missing"],
+    )
+    assert time.monotonic() - start >= 0.2
+    # A redirect hop takes its own slot
+    start = time.monotonic()
+    (result,) = _fetch_all(FetchProxy(min_interval_seconds=0.2, allow_private_networks=True), [f"{base}/hop"])
+    assert result.body == b"fresh" and time.monotonic() - start >= 0.2
+    print(f"\n  ✅ Fetch proxy: same-host requests and redirect hops spaced by min interval")
+
+
+def test_fetch_proxy_blocks_private_addresses(stub_http, monkeypatch):
+    import asyncio
+    import pytest as _pytest
+    from backend.core import fetch_proxy as fp
+    base, hits = stub_http
+    proxy = fp.FetchProxy(min_interval_seconds=0)
+    for url in (f"{base}/cached", "http://169.254.169.254/latest/meta-data/", "http://10.0.0.1/",
+                "http://[::1]:8088/api/plans", "http://100.64.0.1/"):
+        with _pytest.raises(fp.BlockedAddressError):
+            asyncio.run(proxy.fetch(url))
+    # Redirects are checked hop by hop: loopback allowed here, the metadata IP is not
+    monkeypatch.setattr(fp, "_is_public_address", lambda a: a.startswith("127."))
+    with _pytest.raises(fp.BlockedAddressError):
+        _fetch_all(proxy, [f"{base}/redirect"])
+    assert hits["/redirect"] == 1
+    print(f"\n  ✅ Fetch proxy: private, link-local and redirected targets refused")
+
+
+def test_fetch_proxy_connects_to_the_address_it_vetted(stub_http, monkeypatch):
+    import socket
+    from backend.core import fetch_proxy as fp
+    base, hits = stub_http
+    port = int(base.rsplit(":", 1)[1])
+    real_getaddrinfo = socket.getaddrinfo
+    lookups = []
+
+    def rebinding(host, *args, **kwargs):
+        # First answer passes the check; any later lookup would point at the metadata IP
+        if host == "rebind.test":
+            lookups.append(host)
+            address = "127.0.0.1" if len(lookups) == 1 else "169.254.169.254"
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+        return real_getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", rebinding)
+    monkeypatch.setattr(fp, "_is_public_address", lambda a: a == "127.0.0.1")
+    before = hits.get("/nostore", 0)
+    (result,) = _fetch_all(fp.FetchProxy(min_interval_seconds=0), [f"http://rebind.test:{port}/nostore"])
+    assert result.body == b"fresh" and hits["/nostore"] == before + 1
+    assert lookups == ["rebind.test"]
+    print(f"\n  ✅ Fetch proxy: host resolved once and the socket pinned to the vetted address")
+
+
+def test_fetch_proxy_forgets_idle_hosts():
+    import asyncio
+    from backend.core.fetch_proxy import FetchProxy
+    proxy = FetchProxy(min_interval_seconds=1e-6)
+
+    async def _go():
+        for i in range(1_000):
+            await proxy._wait_for_slot(f"host-{i}.example")
+    asyncio.run(_go())
+    assert len(proxy._next_slot) < 300
+    print(f"\n  ✅ Fetch proxy: rate-limit slots of idle hosts evicted")
+
+
+def test_proxied_tools_run_on_internal_network():
+    from backend.config import settings
+    from backend.core.executor import SandboxExecutor
+    ex = SandboxExecutor()
+    cmd = ex._docker_command("p", 1, "/tmp/t", tool="web_search", fetch_gateway="172.30.0.1")
+    assert cmd[cmd.index("--network") + 1] == settings.fetch_network
+    assert "host.docker.internal:172.30.0.1" in cmd
+    assert f"AMSAB_FETCH_TOKEN={settings.fetch_token}" in cmd
+    # No fetch network available: air-gapped, never the open bridge
+    cmd = ex._docker_command("p", 1, "/tmp/t", tool="scraper")
+    assert cmd[cmd.index("--network") + 1] == settings.docker_network
+    print(f"\n  ✅ Executor: proxied tools cannot bypass the fetch proxy")
+
+
+def test_fetch_endpoint(client, stub_http, monkeypatch):
+    from backend.config import settings
+    from backend.core.fetch_proxy import fetch_proxy
+    base, _ = stub_http
+    token = {"X-AMSAB-Fetch-Token": settings.fetch_token}
+    assert client.get("/api/fetch", params={"url": f"{base}/cached"}).status_code == 401
+    assert client.get("/api/fetch", params={"url": f"{base}/cached"},
+                      headers={"X-AMSAB-Fetch-Token": "guess"}).status_code == 401
+    assert client.get("/api/fetch/stats").status_code == 401
+    assert client.get("/api/fetch", params={"url": f"{base}/cached"}, headers=token).status_code == 403
+    monkeypatch.setattr(fetch_proxy, "allow_private_networks", True)
+    r = client.get("/api/fetch", params={"url": f"{base}/cached"}, headers=token)
+    assert r.status_code == 200 and r.text == "<p>cached</p>"
+    assert r.headers["x-amsab-cache"] in ("MISS", "HIT")
+    assert client.get("/api/fetch", params={"url": "file:///etc/passwd"}, headers=token).status_code == 400
+    print(f"\n  ✅ Fetch endpoint proxies upstream response")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+End-to-end ProcessRequestUseCase latency with one vs several tool calls per turn:
+legacy sequential loop vs concurrent tool execution. The gateway sleeps to simulate
+tool latency (search ~150 ms, commerce calls ~40-60 ms); no servers needed.
+
+Run: python3 scripts/bench_agent_tools.py [--repeats 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from uuid import UUID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.domain.value_objects import TenantId, UserId
+from services.agent.application.ports import IToolGateway, ILLMProvider
+from services.agent.application.use_cases import ProcessRequestUseCase
+from services.agent.domain.entities import ToolCall
+from services.agent.infrastructure.external_search.mock_multi_store_search import MockMultiStoreSearch
+
+TENANT = TenantId(UUID("00000000-0000-0000-0000-000000000001"))
+USER = UserId(UUID("00000000-0000-0000-0000-000000000002"))
+LATENCY_S = {"search_internet": 0.15, "product_search": 0.06, "get_cart": 0.04, "get_memory": 0.04, "slow_tool": 1.0}
+
+SCENARIOS = {
+    "1 call": [ToolCall("search_internet", {"query": "running shoes"})],
+    "3 calls": [
+        ToolCall("search_internet", {"query": "running shoes"}),
+        ToolCall("product_search", {"query": "running shoes"}),
+        ToolCall("get_cart", {}),
+    ],
+    "5 calls": [
+        ToolCall("search_internet", {"query": "running shoes"}),
+        ToolCall("search_internet", {"query": "trail shoes"}),
+        ToolCall("product_search", {"query": "running shoes"}),
+        ToolCall("get_cart", {}),
+        ToolCall("get_memory", {}),
+    ],
+}
+
+
+class SleepGateway(IToolGateway):
+    def __init__(self):
+        self._search = MockMultiStoreSearch(seed=1)
+
+    def execute(self, tenant_id, user_id, tool, args):
+        time.sleep(LATENCY_S.get(tool, 0.05))
+        if tool == "search_internet":
+            return [o.to_dict() for o in self._search.search(args.get("query", ""))]
+        return {"tool": tool}
+
+
+class ScriptedLLM(ILLMProvider):
+    def __init__(self, calls):
+        self._calls = calls
+
+    def chat(self, messages, tools=None, context=None):
+        return "Working on it.", list(self._calls)
+
+
+class SequentialUseCase(ProcessRequestUseCase):
+    """The previous loop: one gateway call after another."""
+
+    def _run_tools(self, tenant_id, user_id, tool_calls):
+        results = []
+        for tc in tool_calls:
+            try:
+                results.append({"tool": tc.tool, "result": self._gateway.execute(tenant_id, user_id, tc.tool, tc.args)})
+            except Exception as e:
+                results.append({"tool": tc.tool, "error": str(e)})
+        return results
+
+
+def _median_ms(use_case, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        use_case.execute(TENANT, USER, [{"role": "user", "content": "Find running shoes"}])
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent tool-loop latency")
+    parser.add_argument("--repeats", type=int, default=10)
+    opts = parser.parse_args()
+    gateway = SleepGateway()
+
+    print(f"{'scenario':<10} {'sequential ms':>14} {'concurrent ms':>14}")
+    for name, calls in SCENARIOS.items():
+        seq = _median_ms(SequentialUseCase(ScriptedLLM(calls), gateway), opts.repeats)
+        conc = _median_ms(ProcessRequestUseCase(ScriptedLLM(calls), gateway), opts.repeats)
+        print(f"{name:<10} {seq:14.1f} {conc:14.1f}")
+
+    # Partial results: one tool exceeds its timeout, the others still come back in order
+    calls = SCENARIOS["3 calls"] + [ToolCall("slow_tool", {})]
+    reply = ProcessRequestUseCase(ScriptedLLM(calls), gateway, tool_timeout_seconds=0.3).execute(
+        TENANT, USER, [{"role": "user", "content": "Find running shoes"}]
+    )
+    order = [(tr["tool"], "error" if "error" in tr else "ok") for tr in reply.structured["toolResults"]]
+    print("timeout scenario (0.3s per call):", order, "bestDeal:", bool(reply.structured["bestDeal"]))
+
+
+if __name__ == "__main__":
+    main()
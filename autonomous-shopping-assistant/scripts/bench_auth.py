@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Per-request auth cost in the gateway/orchestration get_auth() path: the previous
+code (AppSettings.load() + a new provider + a full JWT decode on every request) vs
+cached settings, one provider per process, and the verified-token cache. Mock
+(dev) and HS256 JWT (prod) backends; the JWT run reuses a pool of bearer tokens
+the way returning clients do. Then checks expiry, bad signatures and reload.
+
+Run: python3 scripts/bench_auth.py [--requests 50000] [--tokens 100]
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import jwt
+except ImportError:
+    raise SystemExit("pip install PyJWT to run this benchmark")
+
+from shared.adapters.auth_adapter import JwtAuthProvider, create_auth_provider, get_auth_provider
+from shared.config.settings import AppSettings, AuthSettings, get_settings, reload_settings
+from shared.domain.exceptions import UnauthorizedError
+
+SECRET = "bench-secret-0123456789abcdef0123456789abcdef"
+JWT_SETTINGS = AuthSettings(backend="jwt", jwt_secret=SECRET)
+
+
+def legacy_get_auth(auth: AuthSettings):
+    """The previous get_auth(): reload every sub-config, then build a provider."""
+    s = AppSettings.load(service_name="gateway")
+    s.auth = auth  # same env reads, with the benchmark's auth backend
+    options = {k: v for k, v in vars(s.auth).items() if k not in ("backend", "jwt_cache_entries", "jwt_cache_max_ttl_seconds")}
+    if s.auth.backend == "jwt":
+        return JwtAuthProvider(options["jwt_secret"], options["jwt_algorithm"], cache_entries=0)
+    return create_auth_provider(s.auth.backend, **options)
+
+
+def new_get_auth(auth: AuthSettings):
+    get_settings(service_name="gateway")
+    return get_auth_provider(auth)
+
+
+def _token(exp_in: float = 3600) -> str:
+    return jwt.encode(
+        {"tenant_id": str(uuid.uuid4()), "sub": str(uuid.uuid4()), "exp": int(time.time() + exp_in)}, SECRET
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth per-request cost")
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--tokens", type=int, default=100)
+    opts = parser.parse_args()
+    n = opts.requests
+    mock = get_settings(service_name="gateway").auth
+    tokens = [{"authorization": f"Bearer {_token()}"} for _ in range(opts.tokens)]
+
+    def run(get_auth, auth, headers_list):
+        i = 0
+
+        def one():
+            nonlocal i
+            get_auth(auth).authenticate(None, headers_list[i % len(headers_list)])
+            i += 1
+
+        return timeit.timeit(one, number=n) / n * 1e6
+
+    print(f"{n} requests ({opts.tokens} distinct bearer tokens for JWT)")
+    print(f"{'backend':<8} {'previous us':>12} {'cached us':>10} {'speedup':>8}")
+    for name, auth, headers in (("mock", mock, [{}]), ("jwt", JWT_SETTINGS, tokens)):
+        before = run(legacy_get_auth, auth, headers)
+        after = run(new_get_auth, auth, headers)
+        print(f"{name:<8} {before:>12.2f} {after:>10.2f} {before / after:>7.1f}x")
+    stats = get_auth_provider(JWT_SETTINGS).verified.stats()
+    print(f"jwt verified-token cache: {stats}")
+    assert stats["entries"] == opts.tokens
+
+    # Cached results end at exp; bad signatures are never cached
+    provider = JwtAuthProvider(SECRET)
+    short = _token(exp_in=1)
+    provider.authenticate(short)
+    assert provider.authenticate(short) is provider.authenticate(short)
+    time.sleep(max(0.0, jwt.decode(short, options={"verify_signature": False})["exp"] - time.time()) + 0.05)
+    for bad in (short, jwt.encode({"tenant_id": "t", "sub": "u"}, "wrong-secret-0123456789abcdef0123456789")):
+        try:
+            provider.authenticate(bad)
+            raise AssertionError("accepted an invalid token")
+        except UnauthorizedError:
+            pass
+    # reload_settings() drops cached settings and providers
+    before = get_auth_provider(get_settings(service_name="gateway").auth)
+    reload_settings()
+    assert get_auth_provider(get_settings(service_name="gateway").auth) is not before
+    print("expiry, bad signature and reload checks: OK")
+
+
+if __name__ == "__main__":
+    main()
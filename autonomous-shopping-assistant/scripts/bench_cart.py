@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+CartRepository round-trips and throughput (in-process): the previous add_item /
+remove_item (get_or_create, per-item query, flush, get_or_create again, lazy item
+loads) vs the upsert + selectinload path. Also hammers one cart line from several
+threads to check that quantity increments are not lost. Uses a throwaway SQLite file.
+
+Run: python3 scripts/bench_cart.py [--ops 2000] [--threads 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from uuid import UUID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+_tmpdir = tempfile.mkdtemp(prefix="bench-cart-")
+
+from sqlalchemy import event
+
+from shared.domain.value_objects import TenantId, UserId, ProductId
+from services.commerce.domain.entities import Cart, CartItem
+from services.commerce.infrastructure.persistence.models import CartModel, CartItemModel
+from services.commerce.infrastructure.persistence.repositories import CartRepository, _tenant_str, _user_str
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+TENANT = TenantId(UUID("00000000-0000-0000-0000-000000000001"))
+
+
+class LegacyCartRepository(CartRepository):
+    """The previous implementation."""
+
+    def get_or_create(self, tenant_id, user_id):
+        r = self._session.query(CartModel).filter(
+            CartModel.tenant_id == _tenant_str(tenant_id), CartModel.user_id == _user_str(user_id),
+        ).first()
+        if r:
+            items = [CartItem(product_id=ProductId(i.product_id), quantity=i.quantity,
+                              unit_price=Decimal(str(i.unit_price)), title=i.title) for i in r.item_models]
+            return Cart(cart_id=r.cart_id, tenant_id=tenant_id, user_id=user_id, items=items)
+        r = CartModel(tenant_id=_tenant_str(tenant_id), user_id=_user_str(user_id))
+        self._session.add(r)
+        self._session.flush()
+        return Cart(cart_id=r.cart_id, tenant_id=tenant_id, user_id=user_id, items=[])
+
+    def add_item(self, tenant_id, user_id, product_id, quantity, unit_price, title):
+        cart = self.get_or_create(tenant_id, user_id)
+        existing = next((i for i in cart.items if str(i.product_id) == str(product_id)), None)
+        if existing:
+            for m in self._session.query(CartItemModel).filter(
+                CartItemModel.cart_id == str(cart.cart_id), CartItemModel.product_id == str(product_id),
+            ):
+                m.quantity += quantity
+        else:
+            self._session.add(CartItemModel(cart_id=str(cart.cart_id), product_id=str(product_id),
+                                            quantity=quantity, unit_price=unit_price, title=title))
+        self._session.flush()
+        return self.get_or_create(tenant_id, user_id)
+
+    def remove_item(self, tenant_id, user_id, product_id):
+        cart = self.get_or_create(tenant_id, user_id)
+        self._session.query(CartItemModel).filter(
+            CartItemModel.cart_id == str(cart.cart_id), CartItemModel.product_id == str(product_id),
+        ).delete()
+        self._session.flush()
+        return self.get_or_create(tenant_id, user_id)
+
+
+def _op(repo, user: UserId, i: int) -> list[tuple[str, int]]:
+    """Mix: add (new or existing line) x3, remove, get."""
+    pid = ProductId(f"prod-{i % 5}")
+    if i % 5 == 3:
+        cart = repo.remove_item(TENANT, user, pid)
+    elif i % 5 == 4:
+        cart = repo.get_or_create(TENANT, user)
+    else:
+        cart = repo.add_item(TENANT, user, pid, 1, Decimal("9.99"), f"Product {i % 5}")
+    return sorted((str(it.product_id), it.quantity) for it in cart.items)
+
+
+def run(label: str, repo_cls, ops: int, threads: int):
+    uow = CommerceUnitOfWork(f"sqlite:///{_tmpdir}/{label}.db")
+    uow.create_schema()
+    statements = {"n": 0}
+
+    @event.listens_for(uow._engine, "before_cursor_execute")
+    def _count(*_):
+        statements["n"] += 1
+
+    users = [UserId(UUID(int=u + 1)) for u in range(20)]
+    trace = []
+    start = time.perf_counter()
+    for i in range(ops):
+        with uow.session() as s:
+            trace.append(_op(repo_cls(s), users[i % len(users)], i // len(users)))
+    rate = ops / (time.perf_counter() - start)
+    per_op = statements["n"] / ops
+
+    # Concurrent increments of one cart line
+    hot = UserId(UUID(int=999))
+
+    def add_one(_):
+        for _ in range(3):  # retry on "database is locked" / duplicate first insert
+            try:
+                with uow.session() as s:
+                    repo_cls(s).add_item(TENANT, hot, ProductId("hot"), 1, Decimal("1"), "Hot")
+                return
+            except Exception:
+                continue
+
+    with uow.session() as s:
+        repo_cls(s).get_or_create(TENANT, hot)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(add_one, range(threads * 25)))
+    with uow.session() as s:
+        hot_items = repo_cls(s).get_or_create(TENANT, hot).items
+    hot_qty = sum(i.quantity for i in hot_items)
+    return rate, per_op, trace, hot_qty, threads * 25
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cart repository benchmark")
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    opts = parser.parse_args()
+
+    print(f"{'repo':<8} {'ops/s':>8} {'stmts/op':>9} {'concurrent qty':>15}")
+    legacy = run("legacy", LegacyCartRepository, opts.ops, opts.threads)
+    print(f"{'legacy':<8} {legacy[0]:8.0f} {legacy[1]:9.1f} {legacy[3]:>8}/{legacy[4]}")
+    upsert = run("upsert", CartRepository, opts.ops, opts.threads)
+    print(f"{'upsert':<8} {upsert[0]:8.0f} {upsert[1]:9.1f} {upsert[3]:>8}/{upsert[4]}   ({upsert[0] / legacy[0]:.1f}x)")
+    if legacy[2] != upsert[2]:
+        raise SystemExit("returned carts differ between implementations")
+    if upsert[3] != upsert[4]:
+        raise SystemExit("concurrent increments were lost with the upsert path")
+    print("returned carts identical across", opts.ops, "operations")
+
+
+if __name__ == "__main__":
+    main()
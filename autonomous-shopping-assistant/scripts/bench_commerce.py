@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for Commerce cart + search endpoints (in-process, no servers).
+
+Compares the old per-request UoW (new engine + create_all on every request) with the
+process-wide engine/session factory. Uses a throwaway SQLite file so dev.db is untouched.
+
+Run: python3 scripts/bench_commerce.py [--requests 400] [--concurrency 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+_tmpdir = tempfile.mkdtemp(prefix="bench-commerce-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.commerce.main import app
+from services.commerce.infrastructure.http.routes import get_uow
+from services.commerce.infrastructure.persistence.models import Base
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+USER = "00000000-0000-0000-0000-000000000002"
+
+
+def legacy_uow() -> CommerceUnitOfWork:
+    """What get_uow used to do: fresh engine + DDL per request."""
+    uow = CommerceUnitOfWork.__new__(CommerceUnitOfWork)
+    uow._engine = create_engine(os.environ["DATABASE_URL"], connect_args={"check_same_thread": False})
+    Base.metadata.create_all(uow._engine)
+    uow._session_factory = sessionmaker(bind=uow._engine, autocommit=False, autoflush=False)
+    uow.product_cache = None
+    return uow
+
+
+def _search(client: TestClient, i: int) -> int:
+    return client.get(f"/v1/tenants/{TENANT}/products/search", params={"q": "shoes"}).status_code
+
+
+def _cart(client: TestClient, i: int) -> int:
+    base = f"/v1/tenants/{TENANT}/users/{USER}/cart"
+    if i % 2:
+        return client.post(f"{base}/items", json={"productId": "prod-1", "quantity": 1}).status_code
+    return client.get(base).status_code
+
+
+def run(client: TestClient, fn, requests: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        codes = list(pool.map(lambda i: fn(client, i), range(requests)))
+    elapsed = time.perf_counter() - start
+    bad = [c for c in codes if c != 200]
+    if bad:
+        raise SystemExit(f"{fn.__name__}: {len(bad)} non-200 responses (e.g. {bad[0]})")
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Commerce cart/search load benchmark")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    opts = parser.parse_args()
+
+    with TestClient(app) as client:  # lifespan: create_schema + seed
+        print(f"{'endpoint':<10} {'uow':<8} {'req/s':>9}")
+        for name, fn in (("search", _search), ("cart", _cart)):
+            app.dependency_overrides[get_uow] = legacy_uow
+            legacy = run(client, fn, opts.requests, opts.concurrency)
+            app.dependency_overrides.clear()
+            shared = run(client, fn, opts.requests, opts.concurrency)
+            print(f"{name:<10} {'legacy':<8} {legacy:9.1f}")
+            print(f"{name:<10} {'shared':<8} {shared:9.1f}   ({shared / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
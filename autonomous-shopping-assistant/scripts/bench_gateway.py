@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Gateway proxy under concurrent load against a stub orchestration service with a
+fixed delay. Compares the previous proxy (sync route on Starlette's 40-thread pool,
+a new connection per blocking httpx.post, body read then re-serialized) with the
+async proxy (pooled keep-alive AsyncClient, body streamed through). Stub, gateways
+and load generator run in separate processes.
+
+Then checks, on the async gateway:
+1. Streaming: the first chunk reaches the client before orchestration has finished.
+2. Timeout: an orchestration call slower than GATEWAY_UPSTREAM_TIMEOUT_SECONDS -> 504.
+3. Circuit breaker: after repeated 503s, calls fail fast with 503 + Retry-After
+   without reaching orchestration, then recover after the reset timeout.
+
+Run: python3 scripts/bench_gateway.py [--requests 500] [--concurrency 100] [--delay-ms 100]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+BODY = {"sessionId": None, "channel": "web", "message": {"type": "text", "text": "red running shoes"}}
+UPSTREAM_TIMEOUT_S = 1.0
+CIRCUIT_RESET_S = 1.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _stub(port: int, delay_s: float) -> None:
+    """Orchestration stub. Tenant "slow" outlasts the gateway timeout, "down" answers
+    503, "stream" sends 5 chunks 0.1 s apart; GET /hits counts session calls."""
+    hits = {"n": 0}
+    lock = threading.Lock()
+    reply = json.dumps({"sessionId": "s-1", "reply": {"text": "Here are some options", "structured": {}},
+                        "state": "completed"}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._send(200, json.dumps(hits).encode())
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            with lock:
+                hits["n"] += 1
+            tenant = self.path.split("/")[3]
+            if tenant == "down":
+                return self._send(503, b'{"detail": "overloaded"}')
+            if tenant == "slow":
+                time.sleep(UPSTREAM_TIMEOUT_S * 3)
+            elif tenant == "stream":
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i in range(5):
+                    line = json.dumps({"delta": i}).encode() + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+                    time.sleep(0.1)
+                self.wfile.write(b"0\r\n\r\n")
+                return
+            time.sleep(delay_s)
+            self._send(200, reply)
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 1024
+
+        def handle_error(self, request, client_address):
+            pass  # the gateway hung up on "slow"
+
+    Server(("127.0.0.1", port), Handler).serve_forever()
+
+
+def _legacy_app(orchestration_url: str):
+    """The previous gateway route and upstream client."""
+    from fastapi import Depends, FastAPI, HTTPException, Request
+    from services.gateway.config import get_rate_limit_per_minute
+    from services.gateway.infrastructure.rate_limit import InMemoryRateLimiter
+    from services.gateway.main import SendMessageBody
+    from shared.adapters.auth_adapter import get_auth_provider
+    from shared.config.settings import get_settings
+
+    class LegacyUpstreamClient:
+        def __init__(self, url):
+            self._base = url.rstrip("/")
+
+        def post_sessions(self, tenant_id, body, auth):
+            r = httpx.post(f"{self._base}/v1/tenants/{tenant_id}/sessions", json=body, timeout=30.0)
+            r.raise_for_status()
+            return r.json()
+
+    upstream = LegacyUpstreamClient(orchestration_url)
+    rate_limiter = InMemoryRateLimiter(max_per_minute=get_rate_limit_per_minute())
+    app = FastAPI()
+
+    def get_auth():
+        return get_auth_provider(get_settings(service_name="gateway").auth)
+
+    @app.post("/v1/tenants/{tenant_id}/sessions")
+    def proxy_sessions(tenant_id: str, body: SendMessageBody, request: Request, auth=Depends(get_auth)):
+        if not rate_limiter.check(tenant_id):
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
+        try:
+            result = auth.authenticate(None, dict(request.headers))
+        except Exception:
+            result = auth.optional_auth(None)
+        if not result:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+        return upstream.post_sessions(tenant_id, body.model_dump(), result)
+
+    return app
+
+
+def _gateway(port: int, orchestration_url: str, legacy: bool) -> None:
+    os.environ.update({
+        "ORCHESTRATION_URL": orchestration_url,
+        "RATE_LIMIT_PER_MINUTE": "100000000",
+        "GATEWAY_UPSTREAM_TIMEOUT_SECONDS": str(UPSTREAM_TIMEOUT_S),
+        "GATEWAY_CIRCUIT_RESET_SECONDS": str(CIRCUIT_RESET_S),
+        "GATEWAY_CIRCUIT_FAILURE_THRESHOLD": "5",
+        "LOG_LEVEL": "WARNING",
+    })
+    import uvicorn
+    from services.gateway.main import app
+    uvicorn.run(_legacy_app(orchestration_url) if legacy else app,
+                host="127.0.0.1", port=port, log_level="warning", access_log=False,
+                timeout_keep_alive=120)  # the load client's idle connections outlive the 5 s default
+
+
+def _start(target, *args) -> multiprocessing.Process:
+    proc = multiprocessing.get_context("fork").Process(target=target, args=args, daemon=True)
+    proc.start()
+    return proc
+
+
+def _wait_ready(port: int, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f"server on port {port} did not start")
+
+
+async def _worker(port: int, jobs: list, latencies: list) -> int:
+    """One keep-alive connection sending requests back to back; returns the error count.
+    Raw asyncio streams: an httpx client with 100+ connections would use more CPU
+    than the gateways it measures."""
+    payload = json.dumps(BODY).encode()
+    head = (f"POST /v1/tenants/{TENANT}/sessions HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n").encode()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    errors = 0
+    try:
+        while jobs:
+            jobs.pop()
+            t = time.perf_counter()
+            writer.write(head + payload)
+            status = int((await reader.readline()).split()[1])
+            length, chunked = 0, False
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+                chunked |= name.lower() == "transfer-encoding" and "chunked" in value
+            if chunked:
+                body = b""
+                while size := int((await reader.readline()).strip(), 16):
+                    body += (await reader.readexactly(size + 2))[:-2]
+                await reader.readline()
+            else:
+                body = await reader.readexactly(length)
+            latencies.append((time.perf_counter() - t) * 1000)
+            if status != 200 or json.loads(body)["state"] != "completed":
+                errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def _load(port: int, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    await asyncio.gather(*(_worker(port, [0], []) for _ in range(concurrency)))  # warm up
+    jobs = [0] * requests
+    start = time.perf_counter()
+    errors = sum(await asyncio.gather(*(_worker(port, jobs, latencies) for _ in range(concurrency))))
+    elapsed = time.perf_counter() - start
+    q = statistics.quantiles(latencies, n=100)
+    return {"rps": requests / elapsed, "p50": q[49], "p99": q[98], "errors": errors}
+
+
+def _first_chunk(client: httpx.Client) -> tuple[float, float, int]:
+    """Seconds to the first streamed chunk, seconds to the end, number of chunks."""
+    start = time.perf_counter()
+    first, chunks = None, 0
+    with client.stream("POST", "/v1/tenants/stream/sessions", json=BODY) as r:
+        for line in r.iter_lines():
+            if line:
+                first = first or time.perf_counter() - start
+                chunks += 1
+    return first, time.perf_counter() - start, chunks
+
+
+def checks(base: str, stub: str) -> None:
+    client = httpx.Client(base_url=base, timeout=10)
+
+    def send(tenant):
+        return client.post(f"/v1/tenants/{tenant}/sessions", json=BODY)
+
+    def stub_hits():
+        return httpx.get(f"{stub}/hits").json()["n"]
+
+    first, total, chunks = _first_chunk(client)
+    print(f"streaming: first chunk after {first:.2f} s, last after {total:.2f} s ({chunks} chunks)")
+    assert chunks == 5 and first < total / 2 and total >= 0.4
+
+    start = time.perf_counter()
+    r = send("slow")
+    waited = time.perf_counter() - start
+    print(f"timeout: orchestration takes {UPSTREAM_TIMEOUT_S * 3:.0f} s -> {r.status_code} after {waited:.2f} s")
+    assert r.status_code == 504 and waited < UPSTREAM_TIMEOUT_S * 2
+
+    assert send(TENANT).status_code == 200  # resets the failure count
+    statuses = [send("down").status_code for _ in range(5)]
+    hits = stub_hits()
+    start = time.perf_counter()
+    fast = [send(TENANT) for _ in range(20)]
+    fast_ms = (time.perf_counter() - start) / 20 * 1000
+    reached = stub_hits() - hits
+    print(f"circuit: upstream {statuses} -> open: {[r.status_code for r in fast[:3]]}... "
+          f"{fast_ms:.1f} ms each, Retry-After {fast[0].headers.get('retry-after')}, {reached} reached orchestration")
+    assert statuses == [503] * 5 and all(r.status_code == 503 for r in fast) and reached == 0
+    assert fast[0].headers.get("retry-after") is not None
+    time.sleep(CIRCUIT_RESET_S + 0.1)
+    r = send(TENANT)
+    print(f"circuit: after {CIRCUIT_RESET_S:.0f} s the trial request -> {r.status_code} (closed again)")
+    assert r.status_code == 200 and send(TENANT).status_code == 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gateway proxy benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--delay-ms", type=float, default=100.0)
+    opts = parser.parse_args()
+
+    stub_port, legacy_port, async_port = _free_port(), _free_port(), _free_port()
+    stub = f"http://127.0.0.1:{stub_port}"
+    procs = [
+        _start(_stub, stub_port, opts.delay_ms / 1000),
+        _start(_gateway, legacy_port, stub, True),
+        _start(_gateway, async_port, stub, False),
+    ]
+    try:
+        for port in (stub_port, legacy_port, async_port):
+            _wait_ready(port)
+        print(f"{opts.requests} requests, {opts.concurrency} concurrent, orchestration takes {opts.delay_ms:.0f} ms")
+        print(f"{'gateway':<26} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        results = {}
+        for name, port in (("previous (sync, 40 thr)", legacy_port), ("async pooled streaming", async_port)):
+            r = results[name] = asyncio.run(_load(port, opts.requests, opts.concurrency))
+            print(f"{name:<26} {r['rps']:>8.0f} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['errors']:>7}")
+        legacy, new = results.values()
+        print(f"throughput {new['rps'] / legacy['rps']:.1f}x, p99 {legacy['p99'] / new['p99']:.1f}x lower")
+        assert new["errors"] == 0 and new["rps"] > legacy["rps"] and new["p99"] < legacy["p99"]
+        checks(f"http://127.0.0.1:{async_port}", stub)
+    finally:
+        for proc in procs:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
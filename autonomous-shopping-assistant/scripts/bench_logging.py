@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+JsonLogger cost per call: the previous logger (dict merge + json.dumps + flushing
+print per line, level checked after the merge) vs the buffered logger (early level
+check, pre-serialized context, batched background writes). Output goes through a
+pipe to another process, as stdout does to a container log collector, so the
+per-line write + flush is counted (--target file writes a file instead). Then
+checks that every line is valid JSON with the request ids attached, DEBUG
+sampling, and ring-buffer overflow.
+
+Run: python3 scripts/bench_logging.py [--lines 100000] [--threads 8] [--target pipe|file]
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.adapters.logging_adapter import JsonLogger, _LineWriter
+from shared.utils.correlation import set_request_context
+
+
+class LegacyJsonLogger:
+    """The previous implementation, writing to `stream` instead of stdout."""
+    _LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+    def __init__(self, name, stream, level="INFO"):
+        self._name = name
+        self._stream = stream
+        self._level = self._LEVELS.get(level, 20)
+        self._context = {}
+
+    def _emit(self, level, message, **kwargs):
+        if self._LEVELS.get(level, 0) < self._level:
+            return
+        payload = {"level": level, "logger": self._name, "message": message, **self._context, **kwargs}
+        print(json.dumps(payload), file=self._stream, flush=True)
+
+    def debug(self, message, **kwargs):
+        self._emit("DEBUG", message, **kwargs)
+
+    def info(self, message, **kwargs):
+        self._emit("INFO", message, **kwargs)
+
+    def with_context(self, **kwargs):
+        child = LegacyJsonLogger(self._name, self._stream)
+        child._level = self._level
+        child._context = {**self._context, **kwargs}
+        return child
+
+
+CONTEXT = {"tenant_id": "00000000-0000-0000-0000-000000000001", "service": "commerce", "route": "/v1/products/search"}
+
+
+def _drive(log, lines: int, threads: int) -> float:
+    per_thread = lines // threads
+
+    def work(t):
+        set_request_context(f"req-{t}")
+        for i in range(per_thread):
+            log.info("product search", query="red shoes", results=i % 20, elapsed_ms=3.2)
+            log.debug("cache probe", key="commerce:search:abc")  # below INFO: filtered
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+    for th in pool:
+        th.start()
+    for th in pool:
+        th.join()
+    return time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def _output(target: str, path: str):
+    if target == "file":
+        with open(path, "w") as f:
+            yield f
+        return
+    proc = subprocess.Popen(f"cat > '{path}'", shell=True, stdin=subprocess.PIPE, text=True)
+    try:
+        yield proc.stdin
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+
+def _read(path: str) -> tuple[list[dict], int]:
+    """Parsed lines and the number of lines that are not valid JSON."""
+    rows, bad = [], 0
+    with open(path) as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                bad += 1
+    return rows, bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JsonLogger benchmark")
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--target", choices=("pipe", "file"), default="pipe")
+    opts = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    print(f"{opts.lines} INFO + {opts.lines} filtered DEBUG calls, output to a {opts.target}")
+    print(f"{'logger':<24} {'threads':>7} {'calls/s':>10} {'us/call':>8} {'to disk s':>9} {'bad lines':>9}")
+    for threads in (1, opts.threads):
+        legacy_path = os.path.join(tmp, f"legacy-{threads}.log")
+        with _output(opts.target, legacy_path) as f:
+            elapsed = _drive(LegacyJsonLogger("bench", f).with_context(**CONTEXT), opts.lines, threads)
+        calls = 2 * (opts.lines // threads) * threads
+        _, bad = _read(legacy_path)  # print() writes text and newline separately: threads interleave
+        print(f"{'legacy (print+flush)':<24} {threads:>7} {calls / elapsed:>10.0f} {elapsed / calls * 1e6:>8.2f} {elapsed:>9.2f} {bad:>9}")
+
+        path = os.path.join(tmp, f"buffered-{threads}.log")
+        with _output(opts.target, path) as f:
+            writer = _LineWriter(f, capacity=1_000_000)
+            log = JsonLogger("bench", writer=writer).with_context(**CONTEXT)
+            start = time.perf_counter()
+            elapsed = _drive(log, opts.lines, threads)
+            writer.flush(timeout=60)
+            to_disk = time.perf_counter() - start
+        rows, bad = _read(path)
+        print(f"{'buffered':<24} {threads:>7} {calls / elapsed:>10.0f} {elapsed / calls * 1e6:>8.2f} {to_disk:>9.2f} {bad:>9}"
+              f"   ({writer.stats()['batches']} writes)")
+        assert bad == 0 and len(rows) == (opts.lines // threads) * threads
+        assert all(r["request_id"].startswith("req-") and r["tenant_id"] == CONTEXT["tenant_id"] for r in rows)
+
+    # DEBUG sampling
+    path = os.path.join(tmp, "sampled.log")
+    with open(path, "w") as f:
+        writer = _LineWriter(f)
+        log = JsonLogger("bench", level="DEBUG", debug_sample_rate=0.1, writer=writer)
+        for i in range(20_000):
+            log.debug("tick", i=i)
+        writer.flush()
+    kept = len(_read(path)[0])
+    print(f"sampling: kept {kept}/20000 DEBUG lines at rate 0.1")
+    assert 1600 < kept < 2400
+
+    # Ring buffer: a stalled stream drops the oldest lines and reports how many
+    class SlowStream:
+        def __init__(self):
+            self.data = []
+
+        def write(self, s):
+            time.sleep(0.05)
+            self.data.append(s)
+
+        def flush(self):
+            pass
+
+    slow = SlowStream()
+    writer = _LineWriter(slow, capacity=100)
+    log = JsonLogger("bench", writer=writer)
+    for i in range(5000):
+        log.info("burst", i=i)
+    writer.flush(timeout=10)
+    rows = [json.loads(line) for chunk in slow.data for line in chunk.splitlines()]
+    reported = sum(r.get("dropped", 0) for r in rows if r["logger"] == "logging")
+    stats = writer.stats()
+    print(f"overflow: {stats}, reported dropped {reported}")
+    assert stats["dropped"] == reported > 0 and rows[-1]["i"] == 4999
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Throughput check for Memory append_turn under concurrent sessions (in-process, no servers).
+
+Each worker thread owns one chat session and appends turns to it. At the end, every
+session's history is read back and must contain all of its turns, so a "database is
+locked" error or a lost write fails the run. Old per-request UoW (new engine +
+create_all every call) is compared with the shared engine (WAL + busy_timeout).
+Uses a throwaway SQLite file so dev.db is untouched.
+
+The batch row appends each user + assistant pair with one POST .../turns:batch.
+
+Run: python3 scripts/bench_memory.py [--sessions 16] [--turns 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+_tmpdir = tempfile.mkdtemp(prefix="bench-memory-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.memory.main import app
+from services.memory.infrastructure.http.routes import get_uow
+from services.memory.infrastructure.persistence.models import Base
+from services.memory.infrastructure.persistence.unit_of_work import MemoryUnitOfWork
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+
+
+def legacy_uow() -> MemoryUnitOfWork:
+    """What get_uow used to do: fresh engine + DDL per request."""
+    uow = MemoryUnitOfWork.__new__(MemoryUnitOfWork)
+    uow._engine = create_engine(os.environ["DATABASE_URL"], connect_args={"check_same_thread": False})
+    Base.metadata.create_all(uow._engine)
+    uow._session_factory = sessionmaker(bind=uow._engine, autocommit=False, autoflush=False)
+    uow.history_cache = None
+    return uow
+
+
+def _session_worker(client: TestClient, turns: int, batch: bool) -> tuple[str, int]:
+    sid = str(uuid.uuid4())
+    errors = 0
+    base = f"/v1/tenants/{TENANT}/sessions/{sid}"
+    if batch:
+        # One request per chat turn: user + assistant together
+        for i in range(0, turns, 2):
+            r = client.post(f"{base}/turns:batch", json={"turns": [
+                {"role": "user", "content": f"turn {i}"},
+                {"role": "assistant", "content": f"turn {i + 1}"},
+            ]})
+            errors += 2 * (r.status_code != 200)
+        return sid, errors
+    for i in range(turns):
+        r = client.post(
+            f"{base}/turns",
+            json={"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i}"},
+        )
+        errors += r.status_code != 200
+    return sid, errors
+
+
+def run(client: TestClient, sessions: int, turns: int, batch: bool = False) -> tuple[float, int]:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda _: _session_worker(client, turns, batch), range(sessions)))
+    elapsed = time.perf_counter() - start
+    failed = sum(e for _, e in results)
+    for sid, _ in results:
+        got = client.get(f"/v1/tenants/{TENANT}/sessions/{sid}/history", params={"last_n": turns}).json()
+        failed += turns - len(got)
+    return sessions * turns / elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory append_turn throughput under concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=50, help="per session; even")
+    opts = parser.parse_args()
+
+    with TestClient(app, raise_server_exceptions=False) as client:  # lifespan: create_schema
+        print(f"{'uow':<8} {'turns/s':>9} {'failed':>7}")
+        app.dependency_overrides[get_uow] = legacy_uow
+        legacy, legacy_failed = run(client, opts.sessions, opts.turns)
+        app.dependency_overrides.clear()
+        shared, shared_failed = run(client, opts.sessions, opts.turns)
+        batch, batch_failed = run(client, opts.sessions, opts.turns, batch=True)
+        print(f"{'legacy':<8} {legacy:9.1f} {legacy_failed:7d}")
+        print(f"{'shared':<8} {shared:9.1f} {shared_failed:7d}   ({shared / legacy:.1f}x)")
+        print(f"{'batch':<8} {batch:9.1f} {batch_failed:7d}   ({batch / legacy:.1f}x, turns:batch, 2 turns/request)")
+    if shared_failed or batch_failed:
+        raise SystemExit(f"{shared_failed + batch_failed} turns lost or rejected with the shared engine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+MemoryCache get/set cost vs cache size: the previous dict cache (full expiry scan on
+every get/exists) vs the LRU + TTL cache. Then checks the new cache under threads
+(no errors, entry bound held), LRU order, max_bytes, and TTL expiry.
+
+Run: python3 scripts/bench_memory_cache.py [--sizes 1000 10000 100000] [--threads 8]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.adapters.cache_adapter import MemoryCache
+
+
+class LegacyMemoryCache:
+    """The previous implementation (no size bound, O(n) expiry per read)."""
+
+    def __init__(self, default_ttl=300):
+        self._store = {}
+        self._default_ttl = default_ttl
+
+    def _expire(self):
+        now = time.monotonic()
+        for k in list(self._store):
+            if self._store[k][1] <= now:
+                del self._store[k]
+
+    def get(self, key):
+        self._expire()
+        return self._store[key][0] if key in self._store else None
+
+    def set(self, key, value, ttl_seconds=None):
+        self._store[key] = (value, time.monotonic() + (ttl_seconds or self._default_ttl))
+
+
+def _us_per_op(cache, size: int, ops: int) -> float:
+    for i in range(size):
+        cache.set(f"k{i}", {"i": i})
+    start = time.perf_counter()
+    for i in range(ops):
+        cache.get(f"k{(i * 7919) % size}")
+        if i % 4 == 0:
+            cache.set(f"k{(i * 104729) % size}", {"i": i})
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MemoryCache benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--threads", type=int, default=8)
+    opts = parser.parse_args()
+
+    print(f"{'entries':>8} {'legacy us/op':>13} {'lru us/op':>10}")
+    for size in opts.sizes:
+        # Legacy cost grows with size; cap its op count so the run stays short
+        legacy = _us_per_op(LegacyMemoryCache(), size, max(20, 2_000_000 // size))
+        lru = _us_per_op(MemoryCache(max_entries=size), size, 100_000)
+        print(f"{size:8d} {legacy:13.1f} {lru:10.2f}   ({legacy / lru:.0f}x)")
+
+    # Threads: mixed reads/writes/deletes on an over-full key space
+    cache = MemoryCache(default_ttl=60, max_entries=5000)
+    errors = []
+
+    def hammer(t: int):
+        try:
+            for i in range(50_000):
+                k = f"k{(i * (t + 3)) % 20000}"
+                if i % 3 == 0:
+                    cache.set(k, i, ttl_seconds=1 + i % 5)
+                elif i % 17 == 0:
+                    cache.delete(k)
+                else:
+                    cache.get(k)
+        except Exception as e:
+            errors.append(e)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=opts.threads) as pool:
+        list(pool.map(hammer, range(opts.threads)))
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"threads: {opts.threads} x 50k ops in {elapsed:.2f}s, errors {len(errors)}, stats {stats}")
+    assert not errors and stats["entries"] <= 5000
+
+    lru = MemoryCache(max_entries=3)
+    for k in "abc":
+        lru.set(k, k)
+    lru.get("a")
+    lru.set("d", "d")
+    assert [k for k in "abcd" if lru.exists(k)] == ["a", "c", "d"], "LRU order"
+
+    sized = MemoryCache(max_bytes=10_000)
+    for i in range(100):
+        sized.set(f"s{i}", "x" * 500)
+    assert sized.stats()["bytes"] <= 10_000 and len(sized) == 20, sized.stats()
+
+    ttl = MemoryCache()
+    ttl.set("short", 1, ttl_seconds=1)
+    time.sleep(1.05)
+    assert ttl.get("short") is None and ttl.stats()["expirations"] == 1
+    print("LRU order, max_bytes and TTL expiry: OK")
+
+
+if __name__ == "__main__":
+    main()
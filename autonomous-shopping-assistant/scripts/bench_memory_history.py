@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Session-history reads per chat turn (in-process, no servers): every turn reads the
+last 10 turns, then appends the user + assistant pair via turns:batch, as the
+orchestration service does. Compares the history cache off (HISTORY_CACHE_TURNS=0)
+vs on, checks every cached read against the database, and prints the query plan for
+get_last_n (composite (tenant_id, session_id, id) index).
+
+Run: python3 scripts/bench_memory_history.py [--sessions 8] [--turns 40] [--prefill 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+_tmpdir = tempfile.mkdtemp(prefix="bench-history-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from services.memory.main import app
+from services.memory.infrastructure.http.routes import get_uow
+from services.memory.domain.entities import SessionTurn
+from services.memory.infrastructure.persistence.history_cache import SessionHistoryCache
+from services.memory.infrastructure.persistence.repositories import SessionHistoryRepository
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+
+
+def _conversation(client: TestClient, turns: int) -> tuple[float, int]:
+    sid = str(uuid.uuid4())
+    base = f"/v1/tenants/{TENANT}/sessions/{sid}"
+    read_s = 0.0
+    for i in range(turns):
+        start = time.perf_counter()
+        client.get(f"{base}/history", params={"last_n": 10})
+        read_s += time.perf_counter() - start
+        client.post(f"{base}/turns:batch", json={"turns": [
+            {"role": "user", "content": f"question {i}"},
+            {"role": "assistant", "content": f"answer {i}"},
+        ]})
+    # Cached view must match the table
+    cached = client.get(f"{base}/history", params={"last_n": 10}).json()
+    with get_uow().session() as s:
+        truth = [{"role": t.role, "content": t.content}
+                 for t in SessionHistoryRepository(s).get_last_n(TENANT, sid, 10)]
+    return read_s, int(cached != truth)
+
+
+def run(client: TestClient, sessions: int, turns: int) -> tuple[float, int]:
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda _: _conversation(client, turns), range(sessions)))
+    reads = sessions * turns
+    return sum(r for r, _ in results) / reads * 1000, sum(m for _, m in results)
+
+
+def repo_read_us(uow, reads: int) -> float:
+    """get_last_n(10) on one warm session, repository level (no HTTP)."""
+    sid = str(uuid.uuid4())
+    with uow.session() as s:
+        uow.session_history_repo(s).append_many(TENANT, sid, [SessionTurn("user", f"t{i}") for i in range(30)])
+    start = time.perf_counter()
+    for _ in range(reads):
+        with uow.session() as s:
+            uow.session_history_repo(s).get_last_n(TENANT, sid, 10)
+    return (time.perf_counter() - start) / reads * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session history cache benchmark")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--prefill", type=int, default=20000, help="other sessions' turns already in the table")
+    opts = parser.parse_args()
+
+    with TestClient(app) as client:
+        uow = get_uow()
+        with uow.session() as s:
+            s.execute(
+                text("INSERT INTO session_turns (tenant_id, session_id, role, content) VALUES (:t, :s, 'user', 'x')"),
+                [{"t": TENANT, "s": str(uuid.uuid4())} for _ in range(opts.prefill)],
+            )
+            plan = s.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id, role, content FROM session_turns "
+                "WHERE tenant_id = :t AND session_id = :s ORDER BY id DESC LIMIT 10"
+            ), {"t": TENANT, "s": "x"}).all()
+        print("get_last_n plan:", "; ".join(r[-1] for r in plan))
+
+        print(f"{'cache':<6} {'HTTP read ms':>13} {'repo read us':>13} {'hit rate':>9} {'mismatches':>11}")
+        for label, turns in (("off", 0), ("on", 50)):
+            uow.history_cache = SessionHistoryCache(max_turns=turns)
+            ms, mismatches = run(client, opts.sessions, opts.turns)
+            stats = client.get("/v1/metrics/history-cache").json()
+            us = repo_read_us(uow, 2000)
+            print(f"{label:<6} {ms:13.2f} {us:13.1f} {stats['hit_rate']:9.2%} {mismatches:11d}")
+            if mismatches:
+                raise SystemExit(f"{mismatches} sessions served stale history with cache {label}")
+        print("metrics:", stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+MemoryQueue: a fast producer against a slower consumer pool, with the previous
+MemoryQueue (every message kept in an unbounded list, handlers fired inline with
+untracked create_task) vs the bounded queue with worker tasks.
+
+1. Backpressure: overflow="block" -- all jobs processed, depth never above max_size.
+2. Drop: overflow="drop" -- publishers never wait; dropped messages are counted.
+3. Failures: handler exceptions are retried and dead-lettered, not swallowed.
+4. Drain: stop() finishes the backlog; sync publish() from another thread works.
+
+Run: python3 scripts/bench_memory_queue.py [--jobs 20000] [--concurrency 32] [--max-size 500]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.adapters.queue_adapter import MemoryQueue
+
+
+class LegacyMemoryQueue:
+    """The previous implementation."""
+
+    def __init__(self):
+        self._queues = {}
+        self._handlers = {}
+
+    def publish(self, queue_name, message):
+        self._queues.setdefault(queue_name, []).append(message)
+        for h in self._handlers.get(queue_name, []):
+            try:
+                result = h(message)
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(result)
+            except Exception:
+                pass
+
+    def subscribe(self, queue_name, handler):
+        self._handlers.setdefault(queue_name, []).append(handler)
+
+
+def _handler(done: dict, handler_s: float, fail_every: int = 0):
+    async def handle(msg):
+        await asyncio.sleep(handler_s)
+        if fail_every and msg["n"] % fail_every == 0:
+            raise RuntimeError(f"job {msg['n']} failed")
+        done["n"] += 1
+
+    return handle
+
+
+async def legacy(jobs: int, handler_s: float) -> dict:
+    queue = LegacyMemoryQueue()
+    done = {"n": 0}
+    lost = []  # handler errors only asyncio's "exception was never retrieved" log sees
+    asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: lost.append(ctx.get("exception")))
+    queue.subscribe("jobs", _handler(done, handler_s, fail_every=50))
+    pending_max = 0
+    start = time.perf_counter()
+    for i in range(jobs):
+        queue.publish("jobs", {"n": i})
+        if i % 100 == 0:
+            pending_max = max(pending_max, len(asyncio.all_tasks()) - 1)
+            await asyncio.sleep(0)
+    publish_s = time.perf_counter() - start
+    while len(asyncio.all_tasks()) > 1:
+        await asyncio.sleep(0.01)
+    total_s = time.perf_counter() - start
+    gc.collect()
+    print(f"legacy: {len(lost)} handler errors reached no caller (only asyncio's unretrieved-exception log)")
+    return {
+        "publish_s": publish_s, "total_s": total_s, "done": done["n"],
+        "in_flight_max": pending_max, "retained": len(queue._queues["jobs"]), "errors_seen": 0,
+    }
+
+
+async def bounded(jobs: int, handler_s: float, concurrency: int, max_size: int, overflow: str) -> dict:
+    queue = MemoryQueue(max_size=max_size, overflow=overflow, max_attempts=1)
+    done = {"n": 0}
+    queue.subscribe("jobs", _handler(done, handler_s, fail_every=50))
+    consumer = queue.consumer("jobs", concurrency=concurrency)
+    runner = asyncio.create_task(consumer.run())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for i in range(jobs):
+        await queue.publish_async("jobs", {"n": i})
+    publish_s = time.perf_counter() - start
+    consumer.stop()
+    await runner
+    stats = queue.stats("jobs")
+    return {
+        "publish_s": publish_s, "total_s": time.perf_counter() - start, "done": done["n"],
+        "in_flight_max": stats["high_water"], "retained": stats["depth"],
+        "errors_seen": consumer.metrics.counts["failed"], "stats": stats,
+    }
+
+
+def _row(name: str, r: dict) -> None:
+    print(f"{name:<22} {r['publish_s']:>9.2f} {r['total_s']:>8.2f} {r['done']:>7} "
+          f"{r['in_flight_max']:>10} {r['retained']:>9} {r['errors_seen']:>7}")
+
+
+def failures_and_drain() -> None:
+    queue = MemoryQueue(max_size=10, max_attempts=3)
+    seen: dict[int, int] = {}
+    acked = []
+
+    def handler(msg):  # sync handlers run in the thread pool
+        n = msg["n"]
+        seen[n] = seen.get(n, 0) + 1
+        if n == 3 or (n == 5 and seen[n] == 1):
+            raise ValueError(n)
+        time.sleep(0.01)
+        acked.append(n)
+
+    queue.subscribe("jobs", handler)
+    consumer = queue.consumer("jobs", concurrency=4)
+    consumer.start()
+    # publish() from this thread blocks on the consumer's loop while the queue is full
+    publisher = threading.Thread(target=lambda: [queue.publish("jobs", {"n": i}) for i in range(100)])
+    publisher.start()
+    publisher.join()
+    consumer.stop()
+    dead = queue.dead_letters("jobs")
+    m = consumer.metrics.snapshot()
+    print(f"failures/drain: acked {len(acked)}/99, dead-lettered {[d['body']['n'] for d in dead]} "
+          f"after {dead[0]['attempts']} attempts, retried {m['retried']}, depth {queue.stats('jobs')['depth']}")
+    assert sorted(acked) == [n for n in range(100) if n != 3]
+    assert [d["body"]["n"] for d in dead] == [3] and "ValueError" in dead[0]["error"]
+    assert queue.stats("jobs")["high_water"] <= 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MemoryQueue benchmark")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-size", type=int, default=500)
+    parser.add_argument("--handler-ms", type=float, default=2.0)
+    opts = parser.parse_args()
+    handler_s = opts.handler_ms / 1000
+
+    print(f"{opts.jobs} jobs, {opts.handler_ms} ms handler, every 50th raises")
+    print(f"{'queue':<22} {'publish s':>9} {'total s':>8} {'done':>7} {'peak depth':>10} {'retained':>9} {'errors':>7}")
+    _row("legacy (unbounded)", asyncio.run(legacy(opts.jobs, handler_s)))
+    block = asyncio.run(bounded(opts.jobs, handler_s, opts.concurrency, opts.max_size, "block"))
+    _row(f"bounded block x{opts.concurrency}", block)
+    drop = asyncio.run(bounded(opts.jobs, handler_s, opts.concurrency, opts.max_size, "drop"))
+    _row(f"bounded drop x{opts.concurrency}", drop)
+    print(f"drop stats: {drop['stats']}")
+    failing = opts.jobs // 50
+    assert block["done"] == opts.jobs - failing and block["in_flight_max"] <= opts.max_size
+    assert block["errors_seen"] == failing and block["retained"] == 0
+    assert drop["stats"]["dropped"] + drop["stats"]["published"] == opts.jobs
+    failures_and_drain()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+UpdateUserMemoryUseCase throughput and SQL statements per update (in-process): the
+previous get/upsert/get read-modify-write path vs the single ON CONFLICT DO UPDATE
+merge. Each update touches facts and preferences for one of --users users; merged
+results are compared between both paths. Uses a throwaway SQLite file.
+
+Run: python3 scripts/bench_memory_update.py [--updates 3000] [--users 200]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from uuid import UUID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+_tmpdir = tempfile.mkdtemp(prefix="bench-memory-update-")
+
+from sqlalchemy import event
+
+from shared.domain.value_objects import TenantId, UserId
+from services.memory.application.use_cases import UpdateUserMemoryUseCase
+from services.memory.domain.entities import UserMemory
+from services.memory.infrastructure.persistence.models import UserMemoryModel
+from services.memory.infrastructure.persistence.repositories import UserMemoryRepository, _t
+from services.memory.infrastructure.persistence.unit_of_work import MemoryUnitOfWork
+
+TENANT = TenantId(UUID("00000000-0000-0000-0000-000000000001"))
+
+
+class LegacyUserMemoryRepository(UserMemoryRepository):
+    """The previous read-modify-write path (get -> upsert -> get -> query).
+
+    flush() added: with autoflush=False a first-time user was inserted twice."""
+
+    def upsert(self, memory):
+        r = self.get(memory.tenant_id, memory.user_id)
+        if r:
+            m = self._session.query(UserMemoryModel).filter(
+                UserMemoryModel.tenant_id == _t(memory.tenant_id),
+                UserMemoryModel.user_id == _t(memory.user_id),
+            ).first()
+            if m:
+                m.facts = json.dumps(memory.facts)
+                m.preferences = json.dumps(memory.preferences)
+            return
+        self._session.add(UserMemoryModel(
+            user_id=_t(memory.user_id), tenant_id=_t(memory.tenant_id),
+            facts=json.dumps(memory.facts), preferences=json.dumps(memory.preferences),
+        ))
+
+    def update_facts(self, tenant_id, user_id, facts):
+        mem = self.get(tenant_id, user_id)
+        if not mem:
+            mem = UserMemory(user_id=user_id, tenant_id=tenant_id, facts=facts, preferences={})
+        else:
+            mem.facts = {**mem.facts, **facts}
+        self.upsert(mem)
+        self._session.flush()
+
+    def update_preferences(self, tenant_id, user_id, preferences):
+        mem = self.get(tenant_id, user_id)
+        if not mem:
+            mem = UserMemory(user_id=user_id, tenant_id=tenant_id, facts={}, preferences=preferences)
+        else:
+            mem.preferences = {**mem.preferences, **preferences}
+        self.upsert(mem)
+        self._session.flush()
+
+
+class LegacyUpdateUseCase(UpdateUserMemoryUseCase):
+    def execute(self, tenant_id, user_id, facts=None, preferences=None):
+        self._repo.update_facts(tenant_id, user_id, facts or {})
+        self._repo.update_preferences(tenant_id, user_id, preferences or {})
+        memory = self._repo.get(tenant_id, user_id)
+        return {"facts": memory.facts, "preferences": memory.preferences, "summary": memory.to_summary()}
+
+
+def run(label, repo_cls, use_case_cls, updates, users):
+    uow = MemoryUnitOfWork(f"sqlite:///{_tmpdir}/{label}.db")
+    uow.create_schema()
+    statements = {"n": 0}
+
+    @event.listens_for(uow._engine, "before_cursor_execute")
+    def _count(*_):
+        statements["n"] += 1
+
+    user_ids = [UserId(UUID(int=i + 1)) for i in range(users)]
+    last = {}
+    start = time.perf_counter()
+    for i in range(updates):
+        uid = user_ids[i % users]
+        with uow.session() as s:
+            last[uid] = use_case_cls(repo_cls(s)).execute(
+                TENANT, uid, {f"fact{i % 7}": str(i)}, {"size": str(i % 13), f"brand{i % 3}": "x"}
+            )
+    elapsed = time.perf_counter() - start
+    # BEGIN/COMMIT are not cursor executes; this counts SQL statements only
+    return updates / elapsed, statements["n"] / updates, last
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User memory update benchmark")
+    parser.add_argument("--updates", type=int, default=3000)
+    parser.add_argument("--users", type=int, default=200)
+    opts = parser.parse_args()
+
+    print(f"{'path':<8} {'updates/s':>10} {'stmts/update':>13}")
+    legacy, legacy_stmts, legacy_last = run("legacy", LegacyUserMemoryRepository, LegacyUpdateUseCase, opts.updates, opts.users)
+    print(f"{'legacy':<8} {legacy:10.0f} {legacy_stmts:13.1f}")
+    merge, merge_stmts, merge_last = run("merge", UserMemoryRepository, UpdateUserMemoryUseCase, opts.updates, opts.users)
+    print(f"{'merge':<8} {merge:10.0f} {merge_stmts:13.1f}   ({merge / legacy:.1f}x)")
+    if legacy_last != merge_last:
+        raise SystemExit("merged memory differs from the read-modify-write result")
+    print("results identical for", len(merge_last), "users")
+
+
+if __name__ == "__main__":
+    main()
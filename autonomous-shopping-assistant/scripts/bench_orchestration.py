@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Chat-turn latency (p50/p99) through the orchestration service against local stub
+Memory and Agent services with fixed delays. Compares the previous sync path (5
+sequential blocking calls per turn, run on a thread pool like a sync FastAPI route)
+with the async path (memory + history concurrently, turn write after the response).
+
+Run: python3 scripts/bench_orchestration.py [--sessions 20] [--turns 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+DELAYS_S = {"memory": 0.02, "history": 0.02, "process": 0.08, "turns": 0.015}
+_writes = {"n": 0}
+_writes_lock = threading.Lock()
+
+
+class _Stub(BaseHTTPRequestHandler):
+    """Memory + Agent stub: sleeps per endpoint, answers with minimal JSON."""
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def _reply(self, kind, payload):
+        time.sleep(DELAYS_S[kind])
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.split("?")[0].endswith("/memory"):
+            return self._reply("memory", {"facts": {}, "preferences": {}, "summary": ""})
+        return self._reply("history", [])
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.endswith("/v1/process"):
+            return self._reply("process", {"reply": {"text": "ok", "structured": {}}, "state": "completed"})
+        with _writes_lock:
+            _writes["n"] += 1
+        return self._reply("turns", {"ok": True})
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    request_queue_size = 256   # default backlog of 5 resets bursts of new connections
+    daemon_threads = True
+
+
+def legacy_turn(base: str, session_id: str) -> None:
+    """The previous SendMessageUseCase call sequence."""
+    uid = "00000000-0000-0000-0000-000000000002"
+    httpx.get(f"{base}/v1/tenants/{TENANT}/users/{uid}/memory", timeout=5.0)
+    httpx.get(f"{base}/v1/tenants/{TENANT}/sessions/{session_id}/history", params={"last_n": 10}, timeout=5.0)
+    httpx.post(f"{base}/v1/process", json={"messages": []}, timeout=30.0)
+    for role in ("user", "assistant"):
+        httpx.post(f"{base}/v1/tenants/{TENANT}/sessions/{session_id}/turns",
+                   json={"role": role, "content": "x"}, timeout=5.0)
+
+
+def _pcts(samples: list[float]) -> str:
+    s = sorted(samples)
+    return f"p50 {statistics.median(s):7.1f} ms   p99 {s[min(len(s) - 1, int(len(s) * 0.99))]:7.1f} ms"
+
+
+def run_legacy(base: str, sessions: int, turns: int) -> list[float]:
+    def session_loop(_):
+        sid = str(uuid4())
+        out = []
+        for _ in range(turns):
+            start = time.perf_counter()
+            legacy_turn(base, sid)
+            out.append((time.perf_counter() - start) * 1000)
+        return out
+
+    # Sync route: each in-flight turn holds one of the threadpool's threads
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        return [ms for chunk in pool.map(session_loop, range(sessions)) for ms in chunk]
+
+
+async def run_async(base: str, sessions: int, turns: int) -> list[float]:
+    os.environ["AGENT_URL"] = base
+    os.environ["MEMORY_URL"] = base
+    from shared.adapters.http_adapter import close_async_http_clients
+    from services.orchestration.application.use_cases import drain_pending_writes
+    from services.orchestration.main import app
+
+    samples: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://orchestration") as client:
+        async def session_loop():
+            sid = None
+            for _ in range(turns):
+                start = time.perf_counter()
+                r = await client.post(f"/v1/tenants/{TENANT}/sessions", json={
+                    "sessionId": sid, "message": {"type": "text", "payload": {"text": "find shoes"}},
+                })
+                samples.append((time.perf_counter() - start) * 1000)
+                sid = r.json()["sessionId"]
+
+        await asyncio.gather(*(session_loop() for _ in range(sessions)))
+    await drain_pending_writes()
+    await close_async_http_clients()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orchestration turn latency benchmark")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=10)
+    opts = parser.parse_args()
+
+    server = _StubServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"stub delays: {DELAYS_S}; {opts.sessions} concurrent sessions x {opts.turns} turns")
+
+    _writes["n"] = 0
+    print(f"sync (before)  {_pcts(run_legacy(base, opts.sessions, opts.turns))}   writes {_writes['n']}")
+    _writes["n"] = 0
+    print(f"async (after)  {_pcts(asyncio.run(run_async(base, opts.sessions, opts.turns)))}   writes {_writes['n']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
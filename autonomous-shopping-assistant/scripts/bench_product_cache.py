@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Commerce product cache (in-process, throwaway SQLite): skewed get_by_id + hot search
+workload through the UoW's product repo with the cache off vs on (MemoryCache), then
+checks stampede protection (N threads miss one cold key -> 1 DB load), negative
+caching of unknown ids, and tenant invalidation on add().
+
+Run: python3 scripts/bench_product_cache.py [--products 20000] [--ops 20000] [--threads 8]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from uuid import UUID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+_tmpdir = tempfile.mkdtemp(prefix="bench-product-cache-")
+
+from sqlalchemy import insert
+
+from shared.adapters.cache_adapter import MemoryCache
+from shared.domain.value_objects import TenantId, ProductId
+from services.commerce.domain.entities import Product
+from services.commerce.infrastructure.persistence.cached_product_repository import ProductCache
+from services.commerce.infrastructure.persistence.models import ProductModel
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+TENANT = TenantId(UUID("00000000-0000-0000-0000-000000000001"))
+QUERIES = ["running shoes", "wireless earbuds", "yoga mat", "trail", "backpack"]
+_NOUNS = ["shoes", "earbuds", "mat", "backpack", "jacket", "lamp", "kettle", "watch"]
+
+
+def seed(uow: CommerceUnitOfWork, n: int) -> None:
+    rng = random.Random(7)
+    rows = [{
+        "product_id": f"p{i}", "tenant_id": str(TENANT),
+        "title": f"{rng.choice(['Running', 'Trail', 'Wireless', 'Yoga', 'Smart'])} {rng.choice(_NOUNS).title()} {i}",
+        "description": "Everyday product.", "category": rng.choice(["footwear", "electronics", "sports"]),
+        "price": Decimal(f"{rng.uniform(5, 300):.2f}"), "attributes": "{}",
+    } for i in range(n)]
+    with uow.session() as s:
+        s.execute(insert(ProductModel), rows)
+
+
+def workload(uow: CommerceUnitOfWork, ops: int, products: int, threads: int) -> float:
+    def op(i: int):
+        rng = random.Random(i)
+        with uow.session() as s:
+            repo = uow.product_repo(s)
+            if i % 4 == 0:
+                repo.search(TENANT, rng.choice(QUERIES), limit=20)
+            else:
+                # Skewed: most reads hit the first 1% of products
+                repo.get_by_id(TENANT, ProductId(f"p{int(products * 0.01 * rng.paretovariate(1.5)) % products}"))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(op, range(ops)))
+    return ops / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Product cache benchmark")
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    opts = parser.parse_args()
+
+    uow = CommerceUnitOfWork(f"sqlite:///{_tmpdir}/bench.db")
+    uow.create_schema()
+    seed(uow, opts.products)
+
+    print(f"{'cache':<6} {'ops/s':>9} {'hit rate':>9}")
+    off = workload(uow, opts.ops, opts.products, opts.threads)
+    print(f"{'off':<6} {off:9.0f} {'-':>9}")
+    uow.product_cache = cache = ProductCache(MemoryCache(default_ttl=60), ttl_seconds=60)
+    on = workload(uow, opts.ops, opts.products, opts.threads)
+    print(f"{'on':<6} {on:9.0f} {cache.snapshot()['hit_rate']:9.2%}   ({on / off:.1f}x)")
+
+    # Stampede: many threads miss the same cold key at once
+    loads = cache.stats["loads"]
+
+    def cold_read(_):
+        with uow.session() as s:
+            return uow.product_repo(s).search(TENANT, "smart kettle", limit=50)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(cold_read, range(32)))
+    assert all(r == results[0] for r in results)
+    print(f"stampede: 32 concurrent cold reads -> {cache.stats['loads'] - loads} DB load(s)")
+
+    # Negative caching
+    loads = cache.stats["loads"]
+    for _ in range(100):
+        with uow.session() as s:
+            assert uow.product_repo(s).get_by_id(TENANT, ProductId("no-such-product")) is None
+    print(f"negative: 100 reads of an unknown id -> {cache.stats['loads'] - loads} DB load(s)")
+
+    # Invalidation: a new product shows up in a cached search and by id right after commit
+    with uow.session() as s:
+        before = len(uow.product_repo(s).search(TENANT, "zeppelin"))
+        assert uow.product_repo(s).get_by_id(TENANT, ProductId("zep-1")) is None
+    with uow.session() as s:
+        uow.product_repo(s).add(Product(ProductId("zep-1"), TENANT, "Zeppelin Lamp", "Floating lamp.",
+                                        "home", Decimal("42.00"), {}))
+    with uow.session() as s:
+        after = len(uow.product_repo(s).search(TENANT, "zeppelin"))
+        found = uow.product_repo(s).get_by_id(TENANT, ProductId("zep-1")) is not None
+    print(f"invalidation: search 'zeppelin' {before} -> {after} result(s), get_by_id after add: {found}")
+    if after != before + 1 or not found:
+        raise SystemExit("add() did not invalidate cached reads")
+    print("metrics:", cache.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark ProductRepository.search: legacy ILIKE scan vs the FTS5 index (SQLite).
+
+For each catalog size: bulk-load synthetic products into a throwaway SQLite file,
+time the legacy ILIKE query, time the bulk index build, time ranked FTS queries
+(with and without category/price filters), then time incremental add() calls.
+
+Run: python3 scripts/bench_product_search.py [--sizes 100000 1000000] [--tenants 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ENV", "dev")
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import sessionmaker
+
+from shared.domain.value_objects import TenantId, ProductId
+from services.commerce.domain.entities import Product
+from services.commerce.infrastructure.persistence.models import Base, ProductModel
+from services.commerce.infrastructure.persistence.repositories import ProductRepository
+from services.commerce.infrastructure.persistence.search_index import ensure_search_index
+
+_ADJ = ["lightweight", "waterproof", "wireless", "premium", "compact", "ergonomic", "classic", "trail",
+        "running", "smart", "organic", "portable", "insulated", "carbon", "vintage", "ultra"]
+_NOUN = ["shoes", "earbuds", "mat", "jacket", "backpack", "bottle", "watch", "headphones", "lamp",
+         "chair", "tent", "socks", "keyboard", "blender", "kettle", "speaker"]
+_CATEGORIES = ["footwear", "electronics", "sports", "outdoor", "home", "kitchen"]
+_FILLER = ("durable everyday design with great value and fast shipping for home office travel "
+           "gym outdoor use comfortable reliable tested").split()
+# Common terms (early LIMIT exit helps ILIKE), a rare term and a miss (ILIKE must scan the tenant)
+QUERIES = ["running shoes", "wireless", "waterproof jacket", "portable speaker", "titanium", "zeppelin", "wirel", "portable spea"]
+_RARE_EVERY = 20_000
+
+
+def _tenant(i: int) -> str:
+    return str(UUID(int=i + 1))
+
+
+def bulk_load(engine, n: int, tenants: int, rng: random.Random) -> None:
+    rows = []
+    for i in range(n):
+        title = f"{rng.choice(_ADJ).title()} {rng.choice(_ADJ).title()} {rng.choice(_NOUN).title()}"
+        if i % _RARE_EVERY == 0:
+            title = "Titanium " + title
+        desc = f"{title}. " + " ".join(rng.choices(_FILLER, k=12))
+        rows.append((str(uuid4()), _tenant(rng.randrange(tenants)), title, desc,
+                     rng.choice(_CATEGORIES), round(rng.uniform(5, 500), 2), "{}"))
+    raw = engine.raw_connection()
+    try:
+        raw.cursor().executemany(
+            "INSERT INTO products (product_id, tenant_id, title, description, category, price, attributes)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def legacy_search(session, tenant_id: str, query: str, limit: int = 20):
+    return (
+        session.query(ProductModel)
+        .filter(ProductModel.tenant_id == tenant_id)
+        .filter(or_(ProductModel.title.ilike(f"%{query}%"), ProductModel.description.ilike(f"%{query}%")))
+        .limit(limit)
+        .all()
+    )
+
+
+def _median_ms(fn, repeats: int = 5) -> tuple[float, int]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        hits = len(fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), hits
+
+
+def bench(n: int, tenants: int, adds: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-search-"), "catalog.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+
+    start = time.perf_counter()
+    bulk_load(engine, n, tenants, rng)
+    print(f"\n== {n:,} products / {tenants} tenants (load {time.perf_counter() - start:.1f}s)")
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tid = _tenant(0)
+    with Session() as s:
+        for q in QUERIES:
+            ms, hits = _median_ms(lambda: legacy_search(s, tid, q))
+            print(f"  legacy ILIKE  {q!r:<20} {ms:8.2f} ms  {hits:3d} hits")
+
+    start = time.perf_counter()
+    ensure_search_index(engine)
+    print(f"  index build (rebuild)              {(time.perf_counter() - start) * 1000:8.0f} ms")
+
+    with Session() as s:
+        repo = ProductRepository(s)
+        tenant = TenantId(UUID(tid))
+        for q in QUERIES:
+            ms, hits = _median_ms(lambda: repo.search(tenant, q))
+            print(f"  fts5 bm25     {q!r:<20} {ms:8.2f} ms  {hits:3d} hits")
+        ms, hits = _median_ms(lambda: repo.search(tenant, "running shoes", category="footwear", max_price=100))
+        print(f"  fts5 bm25 + category/price filter  {ms:8.2f} ms  {hits:3d} hits")
+
+    with Session() as s:
+        repo = ProductRepository(s)
+        start = time.perf_counter()
+        for i in range(adds):
+            repo.add(Product(
+                product_id=ProductId(str(uuid4())), tenant_id=TenantId(UUID(tid)),
+                title=f"Incremental Widget {i}", description="added after indexing",
+                category="home", price=Decimal("9.99"), attributes={},
+            ))
+        s.commit()
+        per_add = (time.perf_counter() - start) * 1000 / adds
+        found = len(repo.search(TenantId(UUID(tid)), "incremental widget", limit=adds))
+    print(f"  incremental add() x{adds:<5}             {per_add:8.3f} ms/add (searchable: {found}/{adds})")
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Product search benchmark (ILIKE vs FTS5)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--adds", type=int, default=1000)
+    opts = parser.parse_args()
+    for n in opts.sizes:
+        bench(n, opts.tenants, opts.adds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Gateway rate limiter at 100k distinct tenants: the previous sliding-window list
+limiter vs the GCRA limiter (O(1) state per key, idle-key eviction).
+
+1. Spread: requests round-robin over --tenants keys (cost per call, memory held).
+2. Hot tenant: one key at its limit, where the list limiter rebuilds O(limit)
+   timestamps on every call.
+3. Idle: after the tenants go quiet, how much state each limiter still holds.
+4. Accuracy: burst then steady rate, on a simulated clock.
+5. Redis (fakeredis with Lua, or REDIS_URL): two "replicas" share one limit and
+   keys expire once idle.
+
+Run: python3 scripts/bench_rate_limit.py [--tenants 100000] [--limit 120]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.gateway.infrastructure.rate_limit import InMemoryRateLimiter, RedisRateLimiter
+
+
+class LegacyRateLimiter:
+    """The previous implementation (its allow(), named like InMemoryRateLimiter.check)."""
+
+    def __init__(self, max_per_minute=60):
+        self._max = max_per_minute
+        self._counts = defaultdict(list)
+
+    def check(self, key):
+        now = time.monotonic()
+        window = now - 60
+        self._counts[key] = [t for t in self._counts[key] if t > window]
+        if len(self._counts[key]) >= self._max:
+            return False
+        self._counts[key].append(now)
+        return True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _spread(make_limiter, keys: list[str], rounds: int) -> tuple[float, int, object]:
+    """Calls/s over rounds x len(keys) requests, then (separate run) bytes of state held."""
+    limiter = make_limiter()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for k in keys:
+            limiter.check(k)
+    rate = rounds * len(keys) / (time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()  # slows allocation, so not timed
+    traced = make_limiter()
+    for _ in range(rounds):
+        for k in keys:
+            traced.check(k)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return rate, held, limiter
+
+
+def _hot(limiter, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        limiter.check("hot-tenant")
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gateway rate limiter benchmark")
+    parser.add_argument("--tenants", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=120)
+    parser.add_argument("--rounds", type=int, default=5)
+    opts = parser.parse_args()
+    keys = [f"tenant-{i}" for i in range(opts.tenants)]
+
+    print(f"{opts.tenants} tenants x {opts.rounds} requests, limit {opts.limit}/min")
+    print(f"{'limiter':<10} {'spread calls/s':>15} {'state MB':>9} {'hot calls/s':>12}")
+    legacy_rate, legacy_mem, legacy = _spread(lambda: LegacyRateLimiter(opts.limit), keys, opts.rounds)
+    legacy_hot = _hot(legacy, 50_000)
+    print(f"{'legacy':<10} {legacy_rate:>15.0f} {legacy_mem / 1e6:>9.1f} {legacy_hot:>12.0f}")
+    gcra_rate, gcra_mem, gcra = _spread(lambda: InMemoryRateLimiter(opts.limit), keys, opts.rounds)
+    gcra_hot = _hot(gcra, 50_000)
+    print(f"{'gcra':<10} {gcra_rate:>15.0f} {gcra_mem / 1e6:>9.1f} {gcra_hot:>12.0f}")
+
+    # Idle: simulated clock, every tenant sends a few requests, then 5 minutes pass
+    clock = FakeClock()
+    idle = InMemoryRateLimiter(opts.limit, clock=clock)
+    for k in keys:
+        for _ in range(3):
+            idle.check(k)
+    before = len(idle)
+    clock.now += 300
+    for i in range(opts.tenants // 2):  # a trickle of new traffic does the cleanup
+        idle.check(f"new-{i % 100}")
+    print(f"idle: legacy keeps {len(legacy._counts)} keys forever; gcra {before} -> {len(idle)} keys "
+          f"({idle.evictions} evicted)")
+    assert len(idle) < 1000  # the 100 active keys plus a partly swept tail
+
+    # Accuracy: burst of `limit`, then one request per interval
+    clock = FakeClock()
+    acc = InMemoryRateLimiter(60, burst=10, clock=clock)
+    burst = sum(acc.check("t") for _ in range(20))
+    steady = 0
+    for _ in range(60):
+        clock.now += 1.0
+        steady += sum(acc.check("t") for _ in range(3))
+    print(f"accuracy: burst {burst}/20 allowed, then {steady} in 60 s at 60/min")
+    assert burst == 10 and steady == 60
+
+    redis_check(opts.limit)
+
+
+def redis_check(limit: int) -> None:
+    url = os.environ.get("REDIS_URL")
+    if url:
+        import redis.asyncio
+        client = redis.asyncio.from_url(url)
+    else:
+        try:
+            import fakeredis
+        except ImportError:
+            print('redis: skipped (set REDIS_URL or pip install "fakeredis[lua]")')
+            return
+        client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+
+    async def run() -> tuple[int, int, int, float]:
+        await client.delete("ratelimit:shared")
+        replicas = [RedisRateLimiter(max_per_minute=limit, client=client) for _ in range(2)]
+        start = time.perf_counter()
+        allowed = sum([await replicas[i % 2].allow("shared") for i in range(limit * 2)])
+        refilled = int((time.perf_counter() - start) * limit / 60)  # tokens earned during the loop
+        ttl_ms = await client.pttl("ratelimit:shared")
+        start = time.perf_counter()
+        for i in range(2000):
+            await replicas[0].allow(f"tenant-{i}")
+        return allowed, refilled, ttl_ms, 2000 / (time.perf_counter() - start)
+
+    allowed, refilled, ttl_ms, rate = asyncio.run(run())
+    print(f"redis: {allowed}/{limit * 2} allowed across 2 replicas (limit {limit}), key TTL {ttl_ms} ms, "
+          f"{rate:.0f} calls/s ({'REDIS_URL' if url else 'fakeredis'})")
+    assert limit <= allowed <= limit + refilled + 1 and 0 < ttl_ms <= 60_000 + 1000
+
+
+if __name__ == "__main__":
+    main()
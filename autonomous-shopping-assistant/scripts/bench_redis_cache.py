@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+RedisCache: round-trips and payload size, previous adapter vs batched + codec.
+
+1. Codec: encoded size and encode+decode time for product-list payloads with the
+   previous json.dumps-as-str storage, compact JSON, msgpack (if installed), and
+   msgpack/JSON + zlib above 1 KiB.
+2. Batching: reading/writing 50 keys as 50 GET/SETEX calls vs one MGET / one
+   pipelined batch of SET EX.
+
+Backend: REDIS_URL if set, else fakeredis (pip install fakeredis) behind a wrapper
+that adds --rtt-ms per round-trip to stand in for the network.
+
+Run: python3 scripts/bench_redis_cache.py [--keys 50] [--rounds 200] [--rtt-ms 0.3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.adapters.cache_adapter import RedisCache
+from shared.adapters.cache_codec import CacheCodec
+
+
+def _product(i: int) -> dict:
+    return {"product_id": f"p{i}", "tenant_id": "00000000-0000-0000-0000-000000000001",
+            "title": f"Trail Running Shoes {i}", "description": "Great trail running shoes for everyday use.",
+            "category": "footwear", "price": "89.99", "attributes": {"color": "blue", "size": "42"},
+            "external_id": None}
+
+
+PAYLOADS = {"product": _product(1), "search (20 products)": [_product(i) for i in range(20)]}
+
+
+class _LatencyClient:
+    """Forwards to a redis client, sleeping rtt per command / pipeline execute."""
+
+    def __init__(self, client, rtt_s: float):
+        self._client, self._rtt = client, rtt_s
+        self.round_trips = 0
+
+    def _trip(self):
+        self.round_trips += 1
+        time.sleep(self._rtt)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name == "pipeline":
+            def pipeline(*a, **kw):
+                pipe = attr(*a, **kw)
+                execute = pipe.execute
+
+                def timed_execute(*ea, **ekw):
+                    self._trip()
+                    return execute(*ea, **ekw)
+                pipe.execute = timed_execute
+                return pipe
+            return pipeline
+        if callable(attr):
+            def call(*a, **kw):
+                self._trip()
+                return attr(*a, **kw)
+            return call
+        return attr
+
+
+class LegacyRedisCache:
+    """The previous adapter: str values, JSON heuristic, one round-trip per key."""
+
+    def __init__(self, client, key_prefix=""):
+        self._client, self._prefix = client, key_prefix + ":"
+
+    def get(self, key):
+        raw = self._client.get(self._prefix + key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except Exception:
+            return raw
+
+    def set(self, key, value, ttl_seconds=300):
+        serialized = json.dumps(value) if not isinstance(value, (str, int, float)) else value
+        self._client.set(self._prefix + key, str(serialized), ex=ttl_seconds)  # was setex: same round-trip
+
+
+def _clients(rtt_s: float):
+    url = os.environ.get("REDIS_URL")
+    if url:
+        import redis
+        return redis.from_url(url), redis.from_url(url, decode_responses=True), f"redis at {url}"
+    try:
+        import fakeredis
+    except ImportError:
+        raise SystemExit("Set REDIS_URL or pip install fakeredis to run this benchmark")
+    server = fakeredis.FakeServer()
+    return (_LatencyClient(fakeredis.FakeRedis(server=server), rtt_s),
+            _LatencyClient(fakeredis.FakeRedis(server=server, decode_responses=True), rtt_s),
+            f"fakeredis + {rtt_s * 1000:.2f} ms simulated RTT")
+
+
+def codec_table(rounds: int) -> None:
+    variants = {"legacy str(json)": None, "json": CacheCodec(use_msgpack=False, compress_min_bytes=None),
+                "json+zlib": CacheCodec(use_msgpack=False)}
+    try:
+        variants["msgpack"] = CacheCodec(use_msgpack=True, compress_min_bytes=None)
+        variants["msgpack+zlib"] = CacheCodec(use_msgpack=True)
+    except ImportError:
+        print("(msgpack not installed: msgpack rows skipped)")
+    print(f"{'payload':<22} {'codec':<17} {'bytes':>7} {'enc+dec us':>11}")
+    for pname, value in PAYLOADS.items():
+        for cname, codec in variants.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                if codec is None:
+                    raw = json.dumps(value).encode()
+                    json.loads(raw)
+                else:
+                    raw = codec.encode(value)
+                    assert codec.decode(raw) == value
+            us = (time.perf_counter() - start) / rounds * 1e6
+            print(f"{pname:<22} {cname:<17} {len(raw):7d} {us:11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RedisCache batching / codec benchmark")
+    parser.add_argument("--keys", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=0.3)
+    opts = parser.parse_args()
+
+    codec_table(opts.rounds * 5)
+
+    binary, text, label = _clients(opts.rtt_ms / 1000)
+    print(f"\nbackend: {label}; {opts.keys} keys per operation")
+    legacy = LegacyRedisCache(text, "bench-legacy")
+    cache = RedisCache(key_prefix="bench", client=binary)
+    keys = [f"product:{i}" for i in range(opts.keys)]
+    items = {k: _product(i) for i, k in enumerate(keys)}
+
+    def timed(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(opts.rounds // 10 or 1):
+            fn()
+        return (time.perf_counter() - start) / (opts.rounds // 10 or 1) * 1000
+
+    rows = [
+        ("set x N (legacy)", timed(lambda: [legacy.set(k, v) for k, v in items.items()])),
+        ("set_many", timed(lambda: cache.set_many(items, ttl_seconds=300))),
+        ("get x N (legacy)", timed(lambda: [legacy.get(k) for k in keys])),
+        ("get_many", timed(lambda: cache.get_many(keys))),
+    ]
+    for name, ms in rows:
+        print(f"{name:<18} {ms:8.2f} ms")
+    assert cache.get_many(keys) == items
+    # Exact round-trips for scalars the old heuristic turned into strings or numbers
+    for value in ("1", 1, 1.5, True, Decimal("9.99"), b"\x00raw"):
+        cache.set("scalar", value)
+        got = cache.get("scalar")
+        assert got == value and type(got) is type(value), (value, got)
+    legacy.set("scalar", "1")
+    cache.set("scalar", "1")
+    print(f"type round-trip: '1' -> {cache.get('scalar')!r} (RedisCache), {legacy.get('scalar')!r} (legacy)")
+
+
+if __name__ == "__main__":
+    main()
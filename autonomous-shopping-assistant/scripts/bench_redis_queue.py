@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+RedisQueue consumer: throughput/latency and delivery guarantees against a local
+Redis stand-in (fakeredis with Lua, `pip install "fakeredis[lua]"`) or REDIS_URL.
+
+1. Throughput: N jobs with an async handler that awaits --handler-ms, consumed by
+   the previous BRPOP loop (asyncio.run per job, one at a time) vs the worker pool.
+2. Failures: every 20th job always raises (-> dead-letter list after max_attempts),
+   every 7th raises on its first delivery only (-> retried, then acked).
+3. Crash: jobs leased by a consumer that never acks are redelivered to another
+   consumer once their visibility timeout passes.
+
+Run: python3 scripts/bench_redis_queue.py [--jobs 2000] [--concurrency 32] [--handler-ms 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.adapters.queue_adapter import RedisQueue, _POP_LUA
+
+
+def _make_queue(**kw) -> RedisQueue:
+    url = os.environ.get("REDIS_URL")
+    if url:
+        queue = RedisQueue(url, **kw)
+        queue._client.flushdb()
+        return queue
+    try:
+        import fakeredis
+    except ImportError:
+        raise SystemExit('Set REDIS_URL or pip install "fakeredis[lua]" to run this benchmark')
+    server = fakeredis.FakeServer()
+    return RedisQueue(
+        client=fakeredis.FakeRedis(server=server, decode_responses=True),
+        async_client_factory=lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+        **kw,
+    )
+
+
+async def _drain(consumer, finished, timeout: float = 60.0):
+    runner = asyncio.create_task(consumer.run())
+    deadline = time.monotonic() + timeout
+    while not finished() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    consumer.stop()
+    await runner
+
+
+def legacy(jobs: int, handler_s: float) -> tuple[float, list[float]]:
+    """The previous blocking_consume: BRPOP, json.loads, asyncio.run(handler(msg))."""
+    queue = _make_queue()
+    queue._client.lpush("legacy", *[json.dumps({"n": i, "ts": time.time()}) for i in range(jobs)])
+    lat = []
+
+    async def handler(msg):
+        await asyncio.sleep(handler_s)
+        lat.append((time.time() - msg["ts"]) * 1000)
+
+    start = time.perf_counter()
+    for _ in range(jobs):
+        _, raw = queue._client.brpop("legacy", timeout=1)
+        asyncio.run(handler(json.loads(raw)))
+    return jobs / (time.perf_counter() - start), lat
+
+
+def pooled(jobs: int, handler_s: float, concurrency: int) -> dict:
+    queue = _make_queue()
+    done = {"n": 0}
+
+    async def handler(msg):
+        await asyncio.sleep(handler_s)
+        done["n"] += 1
+
+    queue.subscribe("jobs", handler)
+    queue.publish_many("jobs", [{"n": i} for i in range(jobs)])
+    consumer = queue.consumer("jobs", concurrency=concurrency)
+    start = time.perf_counter()
+    asyncio.run(_drain(consumer, lambda: done["n"] >= jobs))
+    stats = consumer.metrics.snapshot()
+    stats["rate"] = jobs / (time.perf_counter() - start)
+    return stats
+
+
+def failures(concurrency: int) -> None:
+    queue = _make_queue(max_attempts=3)
+    seen: dict[int, int] = {}
+    acked = {"n": 0}
+
+    async def handler(msg):
+        n = msg["n"]
+        seen[n] = seen.get(n, 0) + 1
+        if n % 20 == 0 or (n % 7 == 0 and seen[n] == 1):
+            raise RuntimeError(f"job {n} failed")
+        acked["n"] += 1
+
+    queue.subscribe("jobs", handler)
+    queue.publish_many("jobs", [{"n": i} for i in range(200)])
+    consumer = queue.consumer("jobs", concurrency=concurrency)
+    dead_key = queue.dead_letter_key("jobs")
+    # Poison jobs are still being retried when the last good one is acked
+    asyncio.run(_drain(consumer, lambda: acked["n"] >= 190 and queue._client.llen(dead_key) >= 10))
+    dead = [json.loads(r) for r in queue._client.lrange(dead_key, 0, -1)]
+    m = consumer.metrics.snapshot()
+    print(f"failures: acked {acked['n']}/190, dead-lettered {len(dead)} (attempts {sorted({d['attempts'] for d in dead})}), "
+          f"retried {m['retried']}, failed {m['failed']}")
+    assert acked["n"] == 190 and len(dead) == 10 and all(d["body"]["n"] % 20 == 0 for d in dead)
+    assert "RuntimeError" in dead[0]["error"]
+
+
+def crash() -> None:
+    queue = _make_queue(visibility_timeout=0.3)
+    queue.publish_many("jobs", [{"n": i} for i in range(50)])
+    # A consumer leases 20 jobs and dies without acking
+    queue._client.register_script(_POP_LUA)(
+        keys=["jobs", queue.processing_key("jobs"), queue.inflight_key("jobs")], args=[20, time.time() + 0.3]
+    )
+    got: set[int] = set()
+    done = {"n": 0}
+
+    async def handler(msg):
+        got.add(msg["n"])
+        done["n"] = len(got)
+
+    queue.subscribe("jobs", handler)
+    consumer = queue.consumer("jobs", concurrency=8)
+    asyncio.run(_drain(consumer, lambda: done["n"] >= 50, timeout=10))
+    left = queue._client.llen(queue.processing_key("jobs")) + queue._client.zcard(queue.inflight_key("jobs"))
+    print(f"crash: {len(got)}/50 jobs processed after redelivery ({consumer.metrics.counts['expired']} expired leases), "
+          f"{left} left in processing/inflight")
+    assert got == set(range(50)) and left == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RedisQueue consumer benchmark")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--handler-ms", type=float, default=5.0)
+    opts = parser.parse_args()
+    handler_s = opts.handler_ms / 1000
+
+    legacy_jobs = min(opts.jobs, 300)  # sequential: keep it short
+    rate, lat = legacy(legacy_jobs, handler_s)
+    print(f"{'consumer':<22} {'jobs/s':>8} {'e2e p50 ms':>11}")
+    print(f"{'legacy BRPOP loop':<22} {rate:8.0f} {statistics.median(lat):11.1f}   ({legacy_jobs} jobs)")
+    stats = pooled(opts.jobs, handler_s, opts.concurrency)
+    print(f"{'pool x' + str(opts.concurrency):<22} {stats['rate']:8.0f} {stats['e2e_p50_ms']:11.1f}   "
+          f"({opts.jobs} jobs, {stats['rate'] / rate:.0f}x)")
+    print("metrics:", stats)
+    failures(opts.concurrency)
+    crash()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+HttpToolGateway upstream calls: module-level httpx.get (new connection per call)
+vs the pooled keep-alive client. Runs against a local stub Commerce server, so no
+services are needed. Also exercises GET retries on a flaky (503) endpoint.
+
+Run: python3 scripts/bench_tool_gateway.py [--calls 500] [--threads 8]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import UUID
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared.adapters.http_adapter import http_client_metrics
+from shared.domain.value_objects import TenantId, UserId
+from services.agent.infrastructure.tools.http_tool_gateway import HttpToolGateway
+
+TENANT = TenantId(UUID("00000000-0000-0000-0000-000000000001"))
+USER = UserId(UUID("00000000-0000-0000-0000-000000000002"))
+_flaky_hits = {"n": 0}
+
+
+class _StubCommerce(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    wbufsize = -1                   # one write per response (avoids Nagle/delayed-ACK stalls)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if "flaky" in self.path:
+            _flaky_hits["n"] += 1
+            if _flaky_hits["n"] % 2:
+                return self._send(503, {"detail": "try again"})
+        self._send(200, {"cartId": "c1", "items": []})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _rate(fn, calls: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: fn(), range(calls)))
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool gateway HTTP client benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    opts = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubCommerce)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    gateway = HttpToolGateway(base, base)
+
+    def legacy():
+        r = httpx.get(f"{base}/v1/tenants/{TENANT}/users/{USER}/cart", timeout=10.0)
+        r.raise_for_status()
+        return r.json()
+
+    def pooled():
+        return gateway.execute(TENANT, USER, "get_cart", {})
+
+    print(f"{'client':<10} {'threads':>7} {'calls/s':>9}")
+    for threads in (1, opts.threads):
+        print(f"{'httpx.get':<10} {threads:7d} {_rate(legacy, opts.calls, threads):9.0f}")
+        print(f"{'pooled':<10} {threads:7d} {_rate(pooled, opts.calls, threads):9.0f}")
+
+    # Every other flaky call returns 503 first; GET retries should hide it
+    ok = sum(gateway.execute(TENANT, USER, "get_product", {"productId": f"flaky-{i}"}) is not None for i in range(20))
+    print(f"flaky GETs succeeded: {ok}/20")
+    print("metrics:", json.dumps(http_client_metrics()))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
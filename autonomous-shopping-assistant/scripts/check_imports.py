@@ -11,6 +11,7 @@ def main():
     print("DB", get_database_url())
     from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
     uow = CommerceUnitOfWork(get_database_url())
+    uow.create_schema()
     with uow.session() as s:
         from services.commerce.infrastructure.persistence.models import ProductModel
         print("Products", s.query(ProductModel).count())
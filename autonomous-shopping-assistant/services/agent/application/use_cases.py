@@ -1,6 +1,9 @@
 """Agent use cases: search internet, compare, recommend best deal, add to cart."""
 from __future__ import annotations
 
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Any
 
 from shared.domain.value_objects import TenantId, UserId
@@ -10,6 +13,41 @@ from services.agent.application.ports import ILLMProvider, IToolGateway
 from services.agent.application.compare_use_case import compare_and_recommend
 
 
+# Tools that change state: they run alone, after every earlier call and before every later one
+_MUTATING_TOOLS = frozenset({"add_to_cart", "add_external_to_cart", "create_order", "confirm_payment"})
+_MAX_TOOL_CALLS = 5
+
+_tool_pool: ThreadPoolExecutor | None = None
+_tool_pool_lock = threading.Lock()
+
+
+def _get_tool_pool() -> ThreadPoolExecutor:
+    """Process-wide pool for blocking gateway calls (shared across requests)."""
+    global _tool_pool
+    if _tool_pool is None:
+        with _tool_pool_lock:
+            if _tool_pool is None:
+                _tool_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="agent-tool")
+    return _tool_pool
+
+
+def _stages(tool_calls: list[ToolCall]) -> list[list[int]]:
+    """Group call indexes: runs of read-only calls share a stage, each mutating call gets its own."""
+    stages: list[list[int]] = []
+    current: list[int] = []
+    for i, tc in enumerate(tool_calls):
+        if tc.tool in _MUTATING_TOOLS:
+            if current:
+                stages.append(current)
+                current = []
+            stages.append([i])
+        else:
+            current.append(i)
+    if current:
+        stages.append(current)
+    return stages
+
+
 def _offers_from_result(result: Any) -> list[ExternalOffer]:
     if not isinstance(result, list):
         return []
@@ -30,9 +68,52 @@ def _offers_from_result(result: Any) -> list[ExternalOffer]:
 class ProcessRequestUseCase:
     """Process user message: LLM + tool loop. For search_internet: compare and recommend best deal."""
 
-    def __init__(self, llm: ILLMProvider, tool_gateway: IToolGateway):
+    def __init__(self, llm: ILLMProvider, tool_gateway: IToolGateway, tool_timeout_seconds: float = 10.0):
         self._llm = llm
         self._gateway = tool_gateway
+        self._tool_timeout = tool_timeout_seconds
+
+    def _run_tools(self, tenant_id: TenantId, user_id: UserId, tool_calls: list[ToolCall]) -> list[dict[str, Any]]:
+        """Execute tool calls concurrently where independent; results keep call order.
+
+        A call that raises or exceeds the per-call timeout yields an "error" entry;
+        the other calls' results are still returned. A running call cannot be
+        cancelled, so a mutating call past the timeout is reported with
+        outcome "unknown" (it may still commit) and later stages start only
+        once it has finished, keeping mutations alone and in order.
+        """
+        results: list[dict[str, Any]] = [{} for _ in tool_calls]
+        pool = _get_tool_pool()
+        unfinished_mutation: Future | None = None
+        for stage in _stages(tool_calls):
+            if unfinished_mutation is not None:
+                wait([unfinished_mutation])
+                unfinished_mutation = None
+            # Each call runs in a copy of this context, so its requests carry the request ids
+            futures = {
+                i: pool.submit(
+                    contextvars.copy_context().run,
+                    self._gateway.execute, tenant_id, user_id, tool_calls[i].tool, tool_calls[i].args,
+                )
+                for i in stage
+            }
+            wait(futures.values(), timeout=self._tool_timeout)
+            for i, fut in futures.items():
+                tool = tool_calls[i].tool
+                if not fut.done() and tool in _MUTATING_TOOLS:
+                    unfinished_mutation = fut
+                    results[i] = {
+                        "tool": tool,
+                        "outcome": "unknown",
+                        "detail": f"still running after {self._tool_timeout:g}s; it may still complete",
+                    }
+                elif not fut.done():
+                    results[i] = {"tool": tool, "error": f"timed out after {self._tool_timeout:g}s"}
+                elif fut.exception() is not None:
+                    results[i] = {"tool": tool, "error": str(fut.exception())}
+                else:
+                    results[i] = {"tool": tool, "result": fut.result()}
+        return results
 
     def execute(
         self,
@@ -52,13 +133,7 @@ class ProcessRequestUseCase:
         text, tool_calls = self._llm.chat(msgs, context=context)
         if not tool_calls:
             return AgentReply(text=text, tool_calls=[], state="completed", structured=None)
-        tool_results = []
-        for tc in tool_calls[:5]:
-            try:
-                result = self._gateway.execute(tenant_id, user_id, tc.tool, tc.args)
-                tool_results.append({"tool": tc.tool, "result": result})
-            except Exception as e:
-                tool_results.append({"tool": tc.tool, "error": str(e)})
+        tool_results = self._run_tools(tenant_id, user_id, tool_calls[:_MAX_TOOL_CALLS])
         cards = []
         best_deal = None
         reasoning = ""
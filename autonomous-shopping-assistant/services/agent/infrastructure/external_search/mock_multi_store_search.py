@@ -1,7 +1,12 @@
 """Mock adapter: simulates searching multiple online stores with different prices (for demo)."""
 from __future__ import annotations
 
-import random
+import re
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
 from shared.ports.external_search_port import IExternalProductSearch
 from shared.domain.external_product import ExternalOffer
 
@@ -34,8 +39,97 @@ _MOCK_PRODUCTS = [
 ]
 
 
+# Synthetic catalog vocabulary (small on purpose: keeps the token index compact at 1M SKUs)
+_SYNTHETIC_BRANDS = ["Acme", "Nova", "Vertex", "Zenith", "Orbit", "Summit", "Pulse", "Apex", "Nimbus", "Echo"]
+_SYNTHETIC_VARIANTS = ["", "Pro", "Lite", "Max", "Plus", "Mini", "Sport", "Classic", "Eco", "Ultra"]
+
+_TOKEN_RE = re.compile(r"\S+")
+_WORD_CACHE_MAX = 4096
+
+
 class MockMultiStoreSearch(IExternalProductSearch):
-    """Returns the same products from multiple 'stores' with different prices so we can compare and find best deal."""
+    """Returns the same products from multiple 'stores' with different prices so we can compare and find best deal.
+
+    A token -> product-index inverted index is built once per instance; base prices,
+    categories and store discounts are NumPy arrays so filtering and per-store pricing
+    are vectorized. With ``seed`` set, prices and ratings are a pure function of
+    (seed, query, filters), so load tests are reproducible and independent of call order.
+    """
+
+    def __init__(self, products: list[dict] | None = None, seed: int | None = None):
+        products = _MOCK_PRODUCTS if products is None else products
+        self._seed = seed
+        self._titles = [p["title"] for p in products]
+        self._skus = [p.get("sku") or p["title"].replace(" ", "-")[:20] for p in products]
+        self._base = np.array([p["base_price"] for p in products], dtype=np.float64)
+        cat_names = sorted({p["category"] for p in products})
+        self._cat_code = {c: i for i, c in enumerate(cat_names)}
+        self._cats = np.array([self._cat_code[p["category"]] for p in products], dtype=np.int32)
+        self._discount = np.array([s["discount"] for s in _MOCK_STORES], dtype=np.float64)
+        self._postings = self._build_index(products)
+        self._word_cache: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def synthetic(cls, size: int, seed: int = 0) -> "MockMultiStoreSearch":
+        """Catalog of ``size`` SKUs derived from the demo products (brand + title + variant)."""
+        rng = np.random.default_rng(seed)
+        base_idx = rng.integers(0, len(_MOCK_PRODUCTS), size)
+        brand_idx = rng.integers(0, len(_SYNTHETIC_BRANDS), size)
+        variant_idx = rng.integers(0, len(_SYNTHETIC_VARIANTS), size)
+        factors = np.round(rng.uniform(0.6, 1.6, size), 2)
+        titles: dict[tuple[int, int, int], str] = {}
+        products = []
+        for i, (b, br, v, f) in enumerate(zip(base_idx.tolist(), brand_idx.tolist(), variant_idx.tolist(), factors.tolist())):
+            src = _MOCK_PRODUCTS[b]
+            title = titles.get((b, br, v))
+            if title is None:
+                title = titles[(b, br, v)] = f"{_SYNTHETIC_BRANDS[br]} {src['title']} {_SYNTHETIC_VARIANTS[v]}".rstrip()
+            products.append({
+                "title": title,
+                "category": src["category"],
+                "base_price": round(src["base_price"] * f, 2),
+                "sku": f"{title.replace(' ', '-')[:20]}-{i}",
+            })
+        return cls(products, seed=seed)
+
+    @staticmethod
+    def _build_index(products: list[dict]) -> dict[str, np.ndarray]:
+        """token -> sorted product indices; tokens come from the title and category."""
+        token_ids: dict[str, int] = {}
+        seen: dict[tuple[str, str], list[int]] = {}   # synthetic catalogs repeat titles a lot
+        flat_tokens: list[int] = []
+        flat_products: list[int] = []
+        for i, p in enumerate(products):
+            key = (p["title"], p["category"])
+            ids = seen.get(key)
+            if ids is None:
+                toks = set(_TOKEN_RE.findall(f"{key[0]} {key[1]}".lower()))
+                ids = seen[key] = [token_ids.setdefault(t, len(token_ids)) for t in toks]
+            flat_tokens.extend(ids)
+            flat_products.extend([i] * len(ids))
+        tokens = np.array(flat_tokens, dtype=np.int64)
+        prods = np.array(flat_products, dtype=np.int64)
+        order = np.argsort(tokens, kind="stable")   # stable: product indices stay sorted
+        splits = np.searchsorted(tokens[order], np.arange(1, len(token_ids)))
+        groups = np.split(prods[order], splits)
+        return {tok: groups[tid] for tok, tid in token_ids.items()}
+
+    def _word_postings(self, word: str) -> np.ndarray:
+        """Products whose title/category contains ``word`` as a substring (old matching semantics)."""
+        hit = self._word_cache.get(word)
+        if hit is None:
+            lists = [ids for tok, ids in self._postings.items() if word in tok]
+            hit = np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int64)
+            if len(self._word_cache) >= _WORD_CACHE_MAX:
+                self._word_cache.clear()
+            self._word_cache[word] = hit
+        return hit
+
+    def _rng(self, query: str, category: str | None, max_price: float | None) -> np.random.Generator:
+        if self._seed is None:
+            return np.random.default_rng()
+        key = f"{query}|{category}|{max_price}".encode()
+        return np.random.default_rng([self._seed, zlib.crc32(key)])
 
     def search(
         self,
@@ -47,39 +141,60 @@ class MockMultiStoreSearch(IExternalProductSearch):
         query_lower = (query or "").lower().strip()
         # Match by words: "gaming laptop" -> match products containing "gaming" or "laptop"
         query_words = [w for w in query_lower.split() if len(w) > 1]
-        matches = []
-        for p in _MOCK_PRODUCTS:
-            title_lower = p["title"].lower()
-            cat_lower = p["category"].lower()
-            # Include if any query word is in title or category (so different prompts -> different results)
-            if not query_words:
-                match = True
+        postings = [self._word_postings(w) for w in query_words]
+        if query_words and not any(len(p) for p in postings):
+            return []
+        cat_code = None
+        if category:
+            cat_code = self._cat_code.get(category)
+            if cat_code is None:
+                return []
+
+        cap = limit_per_source * len(_MOCK_STORES)
+        rng = self._rng(query_lower, category, max_price)
+        offers: list[ExternalOffer] = []
+        # Scan the catalog in growing index windows so only the first `cap` offers'
+        # worth of postings is merged and priced, however common the query words are
+        n = len(self._titles)
+        lo, width = 0, max(cap, 64)
+        while lo < n:
+            hi = min(n, lo + width)
+            if postings:
+                parts = [p[np.searchsorted(p, lo):np.searchsorted(p, hi)] for p in postings]
+                ids = np.unique(np.concatenate(parts)) if len(parts) > 1 else parts[0]
             else:
-                match = any(
-                    w in title_lower or w in cat_lower
-                    for w in query_words
-                )
-            if not match:
+                ids = np.arange(lo, hi)
+            if cat_code is not None:
+                ids = ids[self._cats[ids] == cat_code]
+            if max_price is not None:
+                ids = ids[self._base[ids] <= max_price]
+            lo, width = hi, width * 2
+            if not len(ids):
                 continue
-            if category and p["category"] != category:
-                continue
-            base = p["base_price"]
-            if max_price is not None and base > max_price:
-                continue
-            for i, store in enumerate(_MOCK_STORES):
-                price = round(base * store["discount"] * (0.98 + random.random() * 0.06), 2)
-                if max_price is not None and price > max_price:
-                    continue
-                sku = f"{p['title'].replace(' ', '-')[:20]}-{i}"
-                offer = ExternalOffer(
+            jitter = rng.random((len(ids), len(_MOCK_STORES)))
+            ratings = np.round(3.5 + rng.random((len(ids), len(_MOCK_STORES))) * 1.5, 1)
+            prices = np.round(self._base[ids, None] * self._discount[None, :] * (0.98 + jitter * 0.06), 2)
+            ok = prices <= max_price if max_price is not None else np.ones(prices.shape, dtype=bool)
+            for row, col in zip(*np.nonzero(ok)):
+                p = int(ids[row])
+                store = _MOCK_STORES[col]
+                sku = f"{self._skus[p]}-{col}"
+                offers.append(ExternalOffer(
                     store_name=store["name"],
-                    title=p["title"],
-                    price=price,
+                    title=self._titles[p],
+                    price=float(prices[row, col]),
                     url=f"{store['base_url']}{sku}",
                     source_id=f"{store['name']}:{sku}",
-                    rating=round(3.5 + random.random() * 1.5, 1),
-                )
-                matches.append(offer)
-            if len(matches) >= limit_per_source * len(_MOCK_STORES):
-                break
-        return matches[: limit_per_source * len(_MOCK_STORES)]
+                    rating=float(ratings[row, col]),
+                ))
+                if len(offers) >= cap:
+                    return offers
+        return offers
+
+
+@lru_cache(maxsize=4)
+def shared_mock_search(catalog_size: int = 0, seed: int | None = None) -> MockMultiStoreSearch:
+    """Process-wide instance so the index is built once (catalog_size=0: demo catalog)."""
+    if catalog_size:
+        return MockMultiStoreSearch.synthetic(catalog_size, seed=seed or 0)
+    return MockMultiStoreSearch(seed=seed)
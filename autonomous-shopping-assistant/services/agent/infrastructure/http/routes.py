@@ -6,6 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
+from shared.adapters.http_adapter import http_client_metrics
 from shared.domain.value_objects import TenantId, UserId
 from services.agent.application.use_cases import ProcessRequestUseCase
 from services.agent.application.ports import ILLMProvider, IToolGateway
@@ -39,12 +40,21 @@ def get_external_search():
     if os.getenv("SERPAPI_KEY"):
         from services.agent.infrastructure.external_search.serpapi_search import SerpAPISearch
         return SerpAPISearch()
-    from services.agent.infrastructure.external_search.mock_multi_store_search import MockMultiStoreSearch
-    return MockMultiStoreSearch()
+    from services.agent.infrastructure.external_search.mock_multi_store_search import shared_mock_search
+    # Load tests: MOCK_SEARCH_CATALOG_SIZE=1000000 MOCK_SEARCH_SEED=42 for a large, reproducible catalog
+    seed = os.getenv("MOCK_SEARCH_SEED")
+    return shared_mock_search(int(os.getenv("MOCK_SEARCH_CATALOG_SIZE", "0")), int(seed) if seed else None)
 
 
-def get_tool_gateway(external_search=Depends(get_external_search)) -> IToolGateway:
-    return HttpToolGateway(get_commerce_url(), get_memory_url(), external_search=external_search)
+_tool_gateway: IToolGateway | None = None
+
+
+def get_tool_gateway() -> IToolGateway:
+    """Built once: the gateway holds the pooled HTTP clients and the external search index."""
+    global _tool_gateway
+    if _tool_gateway is None:
+        _tool_gateway = HttpToolGateway(get_commerce_url(), get_memory_url(), external_search=get_external_search())
+    return _tool_gateway
 
 
 def get_process_use_case(
@@ -79,3 +89,9 @@ def process(
         },
         "state": reply.state,
     }
+
+
+@router.get("/metrics/http")
+def http_metrics():
+    """Per-upstream request counts, retries, errors and latency percentiles."""
+    return http_client_metrics()
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
+from shared.adapters.http_adapter import PooledHttpClient, get_http_client
 from shared.domain.value_objects import TenantId, UserId
 from shared.domain.external_product import ExternalOffer
 from services.agent.application.ports import IToolGateway
@@ -16,10 +16,20 @@ class HttpToolGateway(IToolGateway):
         memory_base_url: str,
         external_search: Any = None,
     ):
-        self._commerce = commerce_base_url.rstrip("/")
-        self._memory = memory_base_url.rstrip("/")
+        self._commerce_url = commerce_base_url
+        self._memory_url = memory_base_url
         self._external_search = external_search
 
+    # Shared keep-alive pools per upstream, looked up per call: close_http_clients()
+    # in the service lifespan drops them, and a restarted app gets fresh ones
+    @property
+    def _commerce(self) -> PooledHttpClient:
+        return get_http_client(self._commerce_url)
+
+    @property
+    def _memory(self) -> PooledHttpClient:
+        return get_http_client(self._memory_url)
+
     def execute(
         self,
         tenant_id: TenantId,
@@ -29,7 +39,7 @@ class HttpToolGateway(IToolGateway):
     ) -> Any:
         tid, uid = str(tenant_id), str(user_id)
         if tool == "search_internet" and self._external_search:
-            from services.agent.infrastructure.external_search.mock_multi_store_search import MockMultiStoreSearch
+            from services.agent.infrastructure.external_search.mock_multi_store_search import shared_mock_search
             offers = self._external_search.search(
                 query=args.get("query", ""),
                 category=args.get("category"),
@@ -38,35 +48,32 @@ class HttpToolGateway(IToolGateway):
             )
             # If real search (e.g. SerpAPI) returns nothing, fall back to mock so user still gets results
             if not offers and self._external_search.__class__.__name__ != "MockMultiStoreSearch":
-                mock = MockMultiStoreSearch()
-                offers = mock.search(
+                offers = shared_mock_search().search(
                     query=args.get("query", ""),
                     max_price=args.get("maxPrice"),
                     limit_per_source=args.get("limit", 5),
                 )
             return [o.to_dict() for o in offers]
         if tool == "add_external_to_cart":
-            r = httpx.post(
-                f"{self._commerce}/v1/tenants/{tid}/users/{uid}/cart/items/external",
+            r = self._commerce.post(
+                f"/v1/tenants/{tid}/users/{uid}/cart/items/external",
                 json={
                     "sourceId": args.get("sourceId", ""),
                     "title": args.get("title", ""),
                     "price": args.get("price", 0),
                     "quantity": args.get("quantity", 1),
                 },
-                timeout=10.0,
             )
             r.raise_for_status()
             return r.json()
         if tool == "product_search":
-            r = httpx.get(
-                f"{self._commerce}/v1/tenants/{tid}/products/search",
+            r = self._commerce.get(
+                f"/v1/tenants/{tid}/products/search",
                 params={
                     "q": args.get("query"),
                     "maxPrice": args.get("maxPrice"),
                     "limit": args.get("limit", 10),
                 },
-                timeout=10.0,
             )
             r.raise_for_status()
             return r.json()
@@ -74,11 +81,11 @@ class HttpToolGateway(IToolGateway):
             pid = args.get("productId")
             if not pid:
                 return None
-            r = httpx.get(f"{self._commerce}/v1/tenants/{tid}/products/{pid}", timeout=10.0)
+            r = self._commerce.get(f"/v1/tenants/{tid}/products/{pid}")
             r.raise_for_status()
             return r.json()
         if tool == "get_cart":
-            r = httpx.get(f"{self._commerce}/v1/tenants/{tid}/users/{uid}/cart", timeout=10.0)
+            r = self._commerce.get(f"/v1/tenants/{tid}/users/{uid}/cart")
             r.raise_for_status()
             return r.json()
         if tool == "add_to_cart":
@@ -86,29 +93,25 @@ class HttpToolGateway(IToolGateway):
             qty = args.get("quantity", 1)
             if not pid:
                 return {"error": "missing productId"}
-            r = httpx.post(
-                f"{self._commerce}/v1/tenants/{tid}/users/{uid}/cart/items",
+            r = self._commerce.post(
+                f"/v1/tenants/{tid}/users/{uid}/cart/items",
                 json={"productId": pid, "quantity": qty},
-                timeout=10.0,
             )
             r.raise_for_status()
             return r.json()
         if tool == "get_memory":
-            r = httpx.get(f"{self._memory}/v1/tenants/{tid}/users/{uid}/memory", timeout=10.0)
+            r = self._memory.get(f"/v1/tenants/{tid}/users/{uid}/memory")
             r.raise_for_status()
             return r.json()
         if tool == "create_order":
-            r = httpx.post(f"{self._commerce}/v1/tenants/{tid}/users/{uid}/orders", timeout=10.0)
+            r = self._commerce.post(f"/v1/tenants/{tid}/users/{uid}/orders")
             r.raise_for_status()
             return r.json()
         if tool == "confirm_payment":
             order_id = args.get("orderId")
             if not order_id:
                 return {"error": "missing orderId"}
-            r = httpx.post(
-                f"{self._commerce}/v1/tenants/{tid}/users/{uid}/orders/{order_id}/confirm-payment",
-                timeout=10.0,
-            )
+            r = self._commerce.post(f"/v1/tenants/{tid}/users/{uid}/orders/{order_id}/confirm-payment")
             r.raise_for_status()
             return r.json()
         return {"error": f"Unknown tool: {tool}"}
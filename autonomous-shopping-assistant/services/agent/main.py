@@ -1,15 +1,26 @@
 """Agent service entrypoint."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.adapters.http_adapter import close_http_clients
+from shared.utils.correlation import CorrelationIdMiddleware
 from services.agent.infrastructure.http.routes import router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    close_http_clients()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Agent Service", version="0.1.0")
+    app = FastAPI(title="Agent Service", version="0.1.0", lifespan=lifespan)
     app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(CorrelationIdMiddleware)
     app.include_router(router)
     return app
 
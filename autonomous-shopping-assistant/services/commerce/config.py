@@ -1,7 +1,7 @@
 """Commerce service config: dev vs prod (DB, logging, etc.)."""
 from __future__ import annotations
 
-from shared.config.settings import get_settings
+from shared.config.settings import CacheSettings, DatabaseSettings, get_settings
 
 _settings = get_settings(service_name="commerce")
 
@@ -10,9 +10,21 @@ def get_database_url() -> str:
     return _settings.database.url
 
 
+def get_database_settings() -> DatabaseSettings:
+    return _settings.database
+
+
+def get_cache_settings() -> CacheSettings:
+    return _settings.cache
+
+
 def get_logging_level() -> str:
     return _settings.logging.level
 
 
 def get_logging_format() -> str:
     return _settings.logging.format
+
+
+def get_logging_debug_sample_rate() -> float:
+    return _settings.logging.debug_sample_rate
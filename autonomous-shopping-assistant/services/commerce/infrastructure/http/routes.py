@@ -20,6 +20,8 @@ from services.commerce.application.use_cases import (
     ConfirmPaymentUseCase,
     AddExternalOfferToCartUseCase,
 )
+from shared.adapters.cache_adapter import create_cache
+from services.commerce.infrastructure.persistence.cached_product_repository import ProductCache
 from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
 from services.commerce.infrastructure.persistence.repositories import (
     ProductRepository,
@@ -42,9 +44,24 @@ class AddExternalToCartBody(BaseModel):
 
 
 # --- Dependency: UoW and use cases ---
+_uow: CommerceUnitOfWork | None = None
+
+
 def get_uow() -> CommerceUnitOfWork:
-    from services.commerce.config import get_database_url
-    return CommerceUnitOfWork(get_database_url())
+    """Process-wide UoW: one pooled engine and session factory, built on first use."""
+    global _uow
+    if _uow is None:
+        from services.commerce.config import get_database_url, get_database_settings, get_cache_settings
+        cache = get_cache_settings()
+        product_cache = ProductCache(
+            create_cache(
+                cache.backend, cache.url, cache.key_prefix, cache.ttl_seconds,
+                max_entries=cache.max_entries, max_bytes=cache.max_bytes,
+            ),
+            ttl_seconds=cache.ttl_seconds,
+        )
+        _uow = CommerceUnitOfWork(get_database_url(), get_database_settings(), product_cache=product_cache)
+    return _uow
 
 
 # --- Router ---
@@ -0,0 +1,215 @@
+"""Read-through cache in front of ProductRepository (ICache: MemoryCache dev / RedisCache prod).
+
+Keys are scoped by tenant and by a per-tenant generation token:
+
+    commerce:gen:{tenant}                          -> random token
+    commerce:product:{tenant}:{gen}:{product_id}   -> product dict, or a miss marker
+    commerce:search:{tenant}:{gen}:{digest}        -> list of product dicts
+
+ProductRepository.add() changes the tenant's token once the transaction commits
+(queued in session.info, applied by CommerceUnitOfWork.session), so
+every cached product and search of that tenant goes cold at once and stale entries
+simply expire. Misses are cached briefly (negative caching), and concurrent misses
+for one key in a process share a single database load (stampede protection).
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from decimal import Decimal
+from typing import Any, Callable, TypeVar
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import Session
+
+from shared.domain.value_objects import TenantId, ProductId
+from shared.ports.cache_port import ICache
+from services.commerce.application.ports import IProductRepository
+from services.commerce.domain.entities import Product
+
+PENDING_PRODUCT_INVALIDATIONS = "pending_product_invalidations"
+_MISSING = {"missing": True}
+# Generation tokens outlive the entries they scope; a lost token is replaced, never reused
+_GENERATION_TTL_SECONDS = 7 * 24 * 3600
+
+T = TypeVar("T")
+
+
+def _product_to_cache(p: Product) -> dict[str, Any]:
+    return {
+        "product_id": str(p.product_id),
+        "tenant_id": str(p.tenant_id),
+        "title": p.title,
+        "description": p.description,
+        "category": p.category,
+        "price": str(p.price),
+        "attributes": p.attributes,
+        "external_id": p.external_id,
+    }
+
+
+def _product_from_cache(d: dict[str, Any]) -> Product:
+    # d may be the cached object itself (MemoryCache, or a dict shared by single-flight
+    # waiters): copy the mutable attributes so callers can't edit the cache
+    return Product(
+        product_id=ProductId(d["product_id"]),
+        tenant_id=TenantId(UUID(d["tenant_id"])),
+        title=d["title"],
+        description=d["description"],
+        category=d["category"],
+        price=Decimal(d["price"]),
+        attributes=copy.deepcopy(d["attributes"]),
+        external_id=d["external_id"],
+    )
+
+
+class _SingleFlight:
+    """Concurrent callers for the same key wait for one loader and share its result."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.value: Any = None
+            self.error: BaseException | None = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _SingleFlight._Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class ProductCache:
+    """Process-wide part of the product cache: the ICache, TTLs, single-flight and counters."""
+
+    def __init__(self, cache: ICache, ttl_seconds: int = 300, negative_ttl_seconds: int = 30):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = min(negative_ttl_seconds, ttl_seconds)
+        self._flight = _SingleFlight()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "negative_hits": 0, "loads": 0, "invalidations": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def generation(self, tenant: str) -> str:
+        key = f"commerce:gen:{tenant}"
+        gen = self.cache.get(key)
+        if gen is None:
+            # Concurrent first readers of a cold tenant must agree on one token, or each
+            # would cache under its own keys (and load) while the last write wins
+            gen = self._flight.do(key, lambda: self._new_generation(key))
+        return str(gen)
+
+    def _new_generation(self, key: str) -> str:
+        gen = self.cache.get(key)
+        if gen is None:
+            gen = uuid4().hex
+            self.cache.set(key, gen, ttl_seconds=_GENERATION_TTL_SECONDS)
+        return gen
+
+    def invalidate_tenant(self, tenant: str) -> None:
+        self.cache.set(f"commerce:gen:{tenant}", uuid4().hex, ttl_seconds=_GENERATION_TTL_SECONDS)
+        self._count("invalidations")
+
+    def read_through(self, key: str, load: Callable[[], Any]) -> Any:
+        """Cached value for key, else load() once per process and cache it (None -> miss marker).
+
+        The value may be the cached object itself: treat it as read-only.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            if cached == _MISSING:
+                self._count("negative_hits")
+                return None
+            self._count("hits")
+            return cached
+        self._count("misses")
+
+        def fill() -> Any:
+            again = self.cache.get(key)  # filled while we queued for the flight
+            if again is not None:
+                return None if again == _MISSING else again
+            self._count("loads")
+            value = load()
+            if value is None:
+                self.cache.set(key, _MISSING, ttl_seconds=self.negative_ttl_seconds)
+            else:
+                self.cache.set(key, value, ttl_seconds=self.ttl_seconds)
+            return value
+
+        return self._flight.do(key, fill)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        reads = stats["hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["negative_hits"]) / reads, 4) if reads else 0.0
+        return stats
+
+
+class CachedProductRepository(IProductRepository):
+    """IProductRepository decorator: cached get_by_id/search, invalidation on add."""
+
+    def __init__(self, inner: IProductRepository, session: Session, cache: ProductCache):
+        self._inner = inner
+        self._session = session
+        self._cache = cache
+
+    def get_by_id(self, tenant_id: TenantId, product_id: ProductId) -> Product | None:
+        tenant = str(tenant_id)
+        key = f"commerce:product:{tenant}:{self._cache.generation(tenant)}:{product_id}"
+
+        def load():
+            p = self._inner.get_by_id(tenant_id, product_id)
+            return _product_to_cache(p) if p is not None else None
+
+        data = self._cache.read_through(key, load)
+        return _product_from_cache(data) if data is not None else None
+
+    def search(
+        self,
+        tenant_id: TenantId,
+        query: str | None = None,
+        category: str | None = None,
+        max_price: float | None = None,
+        limit: int = 20,
+    ) -> list[Product]:
+        tenant = str(tenant_id)
+        params = json.dumps([(query or "").strip().lower(), category, max_price, limit])
+        digest = hashlib.blake2b(params.encode(), digest_size=16).hexdigest()
+        key = f"commerce:search:{tenant}:{self._cache.generation(tenant)}:{digest}"
+
+        def load():
+            return [_product_to_cache(p) for p in self._inner.search(tenant_id, query, category, max_price, limit)]
+
+        return [_product_from_cache(d) for d in self._cache.read_through(key, load) or []]
+
+    def add(self, product: Product) -> None:
+        self._inner.add(product)
+        # Invalidate after commit, so no reader can re-cache the pre-insert state
+        self._session.info.setdefault(PENDING_PRODUCT_INVALIDATIONS, set()).add(str(product.tenant_id))
@@ -5,7 +5,7 @@ from decimal import Decimal
 from uuid import uuid4, UUID
 import json
 
-from sqlalchemy import create_engine, Column, String, Numeric, Text, ForeignKey, Integer, DateTime
+from sqlalchemy import create_engine, Column, String, Numeric, Text, ForeignKey, Integer, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import declarative_base, relationship, Session
 from sqlalchemy.sql import func
@@ -45,6 +45,8 @@ class CartModel(Base):
 
 class CartItemModel(Base):
     __tablename__ = "cart_items"
+    # One row per product per cart: add_item upserts against it (ON CONFLICT ... quantity + n)
+    __table_args__ = (Index("uq_cart_items_cart_product", "cart_id", "product_id", unique=True),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     cart_id = Column(String(36), ForeignKey("carts.cart_id"), nullable=False)
     product_id = Column(String(36), nullable=False)
@@ -5,7 +5,9 @@ import json
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, selectinload
 from shared.domain.value_objects import TenantId, UserId, ProductId, CartId, OrderId
 
 from services.commerce.domain.entities import (
@@ -22,12 +24,20 @@ from services.commerce.infrastructure.persistence.models import (
     OrderModel,
     OrderItemModel,
 )
+from services.commerce.infrastructure.persistence.search_index import (
+    search_products,
+    supports_full_text,
+    tokenize,
+)
 from services.commerce.application.ports import (
     IProductRepository,
     ICartRepository,
     IOrderRepository,
 )
 
+# Dialects with INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
 
 def _tenant_str(t: TenantId) -> str:
     return str(t) if isinstance(t, UUID) else t
@@ -49,29 +59,37 @@ class ProductRepository(IProductRepository):
         max_price: float | None = None,
         limit: int = 20,
     ) -> list[Product]:
+        full_text = supports_full_text(self._session)
+        if query and full_text and tokenize(query):
+            rows = search_products(
+                self._session, _tenant_str(tenant_id), query,
+                category=category, max_price=max_price, limit=limit,
+            )
+            return [self._to_product(r) for r in rows]
         q = self._session.query(ProductModel).filter(ProductModel.tenant_id == _tenant_str(tenant_id))
         if category:
             q = q.filter(ProductModel.category == category)
         if max_price is not None:
             q = q.filter(ProductModel.price <= max_price)
-        if query:
+        if query and not full_text:
+            # With full-text search available, a query with no word tokens ("!!!") lists like no query
             q = q.filter(
                 ProductModel.title.ilike(f"%{query}%") | ProductModel.description.ilike(f"%{query}%")
             )
-        rows = q.limit(limit).all()
-        return [
-            Product(
-                product_id=ProductId(r.product_id),
-                tenant_id=TenantId(UUID(r.tenant_id)),
-                title=r.title,
-                description=r.description,
-                category=r.category,
-                price=Decimal(str(r.price)),
-                attributes=r.get_attributes(),
-                external_id=r.external_id,
-            )
-            for r in rows
-        ]
+        return [self._to_product(r) for r in q.limit(limit).all()]
+
+    @staticmethod
+    def _to_product(r: ProductModel) -> Product:
+        return Product(
+            product_id=ProductId(r.product_id),
+            tenant_id=TenantId(UUID(r.tenant_id)),
+            title=r.title,
+            description=r.description,
+            category=r.category,
+            price=Decimal(str(r.price)),
+            attributes=r.get_attributes(),
+            external_id=r.external_id,
+        )
 
     def get_by_id(self, tenant_id: TenantId, product_id: ProductId) -> Product | None:
         r = (
@@ -84,16 +102,7 @@ class ProductRepository(IProductRepository):
         )
         if not r:
             return None
-        return Product(
-            product_id=ProductId(r.product_id),
-            tenant_id=TenantId(UUID(r.tenant_id)),
-            title=r.title,
-            description=r.description,
-            category=r.category,
-            price=Decimal(str(r.price)),
-            attributes=r.get_attributes(),
-            external_id=r.external_id,
-        )
+        return self._to_product(r)
 
     def add(self, product: Product) -> None:
         m = ProductModel(
@@ -107,22 +116,38 @@ class ProductRepository(IProductRepository):
             external_id=product.external_id,
         )
         self._session.add(m)
+        # autoflush is off: flush now so the search index (FTS triggers / generated
+        # tsvector column) covers the product for later queries in this session
+        self._session.flush()
 
 
 class CartRepository(ICartRepository):
+    """Carts load with their items in one selectin round-trip; item changes are single
+    statements whose result is applied to the already-loaded Cart (no reload)."""
+
     def __init__(self, session: Session):
         self._session = session
 
-    def get_or_create(self, tenant_id: TenantId, user_id: UserId) -> Cart:
-        r = (
+    def _load(self, tenant_id: TenantId, user_id: UserId) -> CartModel | None:
+        return (
             self._session.query(CartModel)
+            .options(selectinload(CartModel.item_models))
             .filter(
                 CartModel.tenant_id == _tenant_str(tenant_id),
                 CartModel.user_id == _user_str(user_id),
             )
+            .execution_options(populate_existing=True)
             .first()
         )
-        if r:
+
+    def get_or_create(self, tenant_id: TenantId, user_id: UserId) -> Cart:
+        r = self._load(tenant_id, user_id)
+        if r is None:
+            r = CartModel(tenant_id=_tenant_str(tenant_id), user_id=_user_str(user_id))
+            self._session.add(r)
+            self._session.flush()
+            items = []
+        else:
             items = [
                 CartItem(
                     product_id=ProductId(i.product_id),
@@ -132,20 +157,11 @@ class CartRepository(ICartRepository):
                 )
                 for i in r.item_models
             ]
-            return Cart(
-                cart_id=CartId(UUID(r.cart_id)),
-                tenant_id=TenantId(UUID(r.tenant_id)),
-                user_id=UserId(UUID(r.user_id)),
-                items=items,
-            )
-        r = CartModel(tenant_id=_tenant_str(tenant_id), user_id=_user_str(user_id))
-        self._session.add(r)
-        self._session.flush()
         return Cart(
             cart_id=CartId(UUID(r.cart_id)),
             tenant_id=TenantId(UUID(r.tenant_id)),
             user_id=UserId(UUID(r.user_id)),
-            items=[],
+            items=items,
         )
 
     def add_item(
@@ -158,35 +174,50 @@ class CartRepository(ICartRepository):
         title: str,
     ) -> Cart:
         cart = self.get_or_create(tenant_id, user_id)
-        existing = next((i for i in cart.items if str(i.product_id) == str(product_id)), None)
-        if existing:
-            for m in self._session.query(CartItemModel).filter(
-                CartItemModel.cart_id == str(cart.cart_id),
-                CartItemModel.product_id == str(product_id),
-            ):
+        values = {
+            "cart_id": str(cart.cart_id),
+            "product_id": str(product_id),
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "title": title,
+        }
+        dialect = self._session.get_bind().dialect.name
+        if dialect in _UPSERT_INSERTS:
+            stmt = _UPSERT_INSERTS[dialect](CartItemModel).values(**values)
+            new_quantity = self._session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[CartItemModel.cart_id, CartItemModel.product_id],
+                    set_={"quantity": CartItemModel.quantity + stmt.excluded.quantity},
+                ).returning(CartItemModel.quantity)
+            ).scalar_one()
+        else:
+            m = self._session.query(CartItemModel).filter_by(
+                cart_id=values["cart_id"], product_id=values["product_id"]
+            ).first()
+            if m is None:
+                m = CartItemModel(**values)
+                self._session.add(m)
+            else:
                 m.quantity += quantity
             self._session.flush()
+            new_quantity = m.quantity
+        existing = next((i for i in cart.items if str(i.product_id) == str(product_id)), None)
+        if existing:
+            existing.quantity = new_quantity
         else:
-            self._session.add(
-                CartItemModel(
-                    cart_id=str(cart.cart_id),
-                    product_id=str(product_id),
-                    quantity=quantity,
-                    unit_price=unit_price,
-                    title=title,
-                )
-            )
-            self._session.flush()
-        return self.get_or_create(tenant_id, user_id)
+            cart.items.append(CartItem(product_id=product_id, quantity=new_quantity, unit_price=unit_price, title=title))
+        return cart
 
     def remove_item(self, tenant_id: TenantId, user_id: UserId, product_id: ProductId) -> Cart:
         cart = self.get_or_create(tenant_id, user_id)
-        self._session.query(CartItemModel).filter(
-            CartItemModel.cart_id == str(cart.cart_id),
-            CartItemModel.product_id == str(product_id),
-        ).delete()
-        self._session.flush()
-        return self.get_or_create(tenant_id, user_id)
+        self._session.execute(
+            delete(CartItemModel).where(
+                CartItemModel.cart_id == str(cart.cart_id),
+                CartItemModel.product_id == str(product_id),
+            )
+        )
+        cart.items = [i for i in cart.items if str(i.product_id) != str(product_id)]
+        return cart
 
     def save(self, cart: Cart) -> None:
         self._session.flush()
@@ -231,6 +262,7 @@ class OrderRepository(IOrderRepository):
     def get(self, tenant_id: TenantId, order_id: OrderId) -> Order | None:
         r = (
             self._session.query(OrderModel)
+            .options(selectinload(OrderModel.item_models))
             .filter(
                 OrderModel.tenant_id == _tenant_str(tenant_id),
                 OrderModel.order_id == str(order_id),
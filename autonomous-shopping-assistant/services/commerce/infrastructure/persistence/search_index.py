@@ -0,0 +1,207 @@
+"""Full-text product search index (dev SQLite FTS5 / prod Postgres tsvector + GIN).
+
+SQLite: `products_fts` is an external-content FTS5 table over `products` (porter
+stemming), kept in sync by insert/update/delete triggers, ranked with bm25();
+`products_fts_prefix` is its unstemmed twin that serves prefix matches on the last token.
+Postgres: generated, weighted `search_vector` (english) and `prefix_vector` (simple)
+tsvector columns with GIN indexes, ranked with ts_rank_cd(). Title matches weigh more
+than description matches.
+"""
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from services.commerce.infrastructure.persistence.models import ProductModel
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PRODUCT_COLUMNS = ", ".join(f"p.{c.name}" for c in ProductModel.__table__.columns)
+
+# bm25() weights per FTS column (title, description); lower score = better match
+_BM25_WEIGHTS = "10.0, 1.0"
+
+_FTS_TABLES = {
+    # stemmed: "running" finds "run"/"runs"; ranks whole-word matches
+    "products_fts": "porter unicode61",
+    # unstemmed with prefix indexes: "runn"* finds "running" (porter stores "run")
+    "products_fts_prefix": "unicode61",
+}
+
+
+def _sqlite_ddl(table: str, tokenizer: str) -> list[str]:
+    prefix = ", prefix='2 3'" if table == "products_fts_prefix" else ""
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            title, description,
+            content='products', content_rowid='rowid',
+            tokenize='{tokenizer}'{prefix}
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON products BEGIN
+            INSERT INTO {table}(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON products BEGIN
+            INSERT INTO {table}({table}, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF title, description ON products BEGIN
+            INSERT INTO {table}({table}, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+            INSERT INTO {table}(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+        """,
+    ]
+
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+    # unstemmed twin for prefix queries: 'runn:*' never matches the english stem 'run'
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS prefix_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_prefix_vector ON products USING GIN (prefix_vector)",
+]
+
+
+def tokenize(query: str) -> list[str]:
+    return [t.lower() for t in _TOKEN_RE.findall(query or "")]
+
+
+def _fts5_match(tokens: list[str], prefix: bool = False) -> str:
+    # Quote every token so user input can't inject FTS5 syntax; implicit AND between terms.
+    # With prefix=True the last (possibly half-typed) token matches as a prefix.
+    terms = [f'"{t}"' for t in tokens]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _tsquery_prefix(tokens: list[str]) -> str:
+    # Tokens are \w+ so they carry no tsquery operators; AND them, last one as a prefix
+    return " & ".join(tokens[:-1] + [f"{tokens[-1]}:*"])
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the index (idempotent). A newly created SQLite index is filled from existing rows."""
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            for table, tokenizer in _FTS_TABLES.items():
+                existed = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": table},
+                ).first()
+                for ddl in _sqlite_ddl(table, tokenizer):
+                    conn.execute(text(ddl))
+                if not existed:
+                    conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+        elif engine.dialect.name == "postgresql":
+            for ddl in _POSTGRES_DDL:
+                conn.execute(text(ddl))
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Bulk rebuild from the products table (after bulk loads or to repair drift)."""
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            for table in _FTS_TABLES:
+                conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+                conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('optimize')"))
+        elif engine.dialect.name == "postgresql":
+            conn.execute(text("REINDEX INDEX ix_products_search_vector"))
+            conn.execute(text("REINDEX INDEX ix_products_prefix_vector"))
+
+
+def supports_full_text(session: Session) -> bool:
+    return session.get_bind().dialect.name in ("sqlite", "postgresql")
+
+
+def _ranked_sql(dialect: str, prefix: bool, filters: str) -> str:
+    if dialect == "sqlite":
+        table = "products_fts_prefix" if prefix else "products_fts"
+        return f"""
+            SELECT {_PRODUCT_COLUMNS} FROM {table}
+            JOIN products AS p ON p.rowid = {table}.rowid
+            WHERE {table} MATCH :match AND p.tenant_id = :tenant_id{filters}
+            ORDER BY bm25({table}, {_BM25_WEIGHTS})
+            LIMIT :limit
+        """
+    if prefix:
+        vector, tsquery = "p.prefix_vector", "to_tsquery('simple', :prefix_terms)"
+    else:
+        vector, tsquery = "p.search_vector", "plainto_tsquery('english', :terms)"
+    return f"""
+        SELECT {_PRODUCT_COLUMNS} FROM products AS p, {tsquery} AS q
+        WHERE {vector} @@ q AND p.tenant_id = :tenant_id{filters}
+        ORDER BY ts_rank_cd({vector}, q) DESC
+        LIMIT :limit
+    """
+
+
+def search_products(
+    session: Session,
+    tenant_id: str,
+    query: str,
+    category: str | None = None,
+    max_price: float | None = None,
+    limit: int = 20,
+) -> list[ProductModel]:
+    """Ranked full-text search with tenant/category/price filters in the same statement.
+
+    Products whose words match every token (stemmed) rank first. When they don't fill
+    `limit`, products where the last token only prefixes a word ("runn" -> "running")
+    follow, so half-typed queries still find something.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    params: dict = {"tenant_id": tenant_id, "limit": limit}
+    filters = ""
+    if category:
+        filters += " AND p.category = :category"
+        params["category"] = category
+    if max_price is not None:
+        filters += " AND p.price <= :max_price"
+        params["max_price"] = max_price
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        params["match"] = _fts5_match(tokens)
+    else:
+        params["terms"] = " ".join(tokens)
+    rows = list(
+        session.query(ProductModel).from_statement(text(_ranked_sql(dialect, False, filters))).params(**params)
+    )
+    if len(rows) >= limit:
+        return rows
+
+    if dialect == "sqlite":
+        params["match"] = _fts5_match(tokens, prefix=True)
+    else:
+        params["prefix_terms"] = _tsquery_prefix(tokens)
+    # Fetch a full `limit`: up to len(rows) of these are whole-word matches already taken
+    seen = {r.product_id for r in rows}
+    prefixed = session.query(ProductModel).from_statement(text(_ranked_sql(dialect, True, filters))).params(**params)
+    rows.extend(r for r in prefixed if r.product_id not in seen)
+    return rows[:limit]
@@ -4,29 +4,80 @@ from __future__ import annotations
 from contextlib import contextmanager
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker, Session
 
+from shared.adapters.db_adapter import get_engine
+from shared.config.settings import DatabaseSettings
 from shared.ports.unit_of_work_port import IUnitOfWork
-from services.commerce.infrastructure.persistence.models import Base
+from services.commerce.infrastructure.persistence.cached_product_repository import (
+    PENDING_PRODUCT_INVALIDATIONS,
+    CachedProductRepository,
+    ProductCache,
+)
+from services.commerce.infrastructure.persistence.models import Base, CartItemModel
+from services.commerce.infrastructure.persistence.search_index import ensure_search_index
 from services.commerce.infrastructure.persistence.repositories import (
     ProductRepository,
     CartRepository,
     OrderRepository,
 )
 
+# Before an older database gets the unique (cart_id, product_id) index: fold duplicate
+# lines into the first one (quantities summed), then drop the rest
+_MERGE_DUPLICATE_CART_ITEMS = [
+    """
+    UPDATE cart_items SET quantity = (
+        SELECT SUM(c.quantity) FROM cart_items c
+        WHERE c.cart_id = cart_items.cart_id AND c.product_id = cart_items.product_id
+    )
+    WHERE id IN (
+        SELECT MIN(id) FROM cart_items GROUP BY cart_id, product_id HAVING COUNT(*) > 1
+    )
+    """,
+    """
+    DELETE FROM cart_items
+    WHERE id NOT IN (SELECT MIN(id) FROM cart_items GROUP BY cart_id, product_id)
+    """,
+]
+
+
+def _ensure_cart_item_indexes(conn: Connection) -> None:
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(CartItemModel.__tablename__)}
+    for index in CartItemModel.__table__.indexes:
+        if index.name in existing:
+            continue
+        if index.unique:
+            for stmt in _MERGE_DUPLICATE_CART_ITEMS:
+                conn.execute(text(stmt))
+        index.create(conn)
+
 
 class CommerceUnitOfWork(IUnitOfWork):
-    """Single UoW for Commerce: same DB URL for dev (SQLite) or prod (Postgres)."""
-
-    def __init__(self, database_url: str):
-        self._engine = create_engine(
-            database_url,
-            echo=False,
-            connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
-        )
-        Base.metadata.create_all(self._engine)
+    """Single UoW for Commerce: same DB URL for dev (SQLite) or prod (Postgres).
+
+    The engine (and its connection pool) is shared per database URL across the
+    process; schema creation is a separate startup step, see create_schema().
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        db_settings: DatabaseSettings | None = None,
+        product_cache: ProductCache | None = None,
+    ):
+        self._engine = get_engine(database_url, db_settings)
         self._session_factory = sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
+        self.product_cache = product_cache
+
+    def create_schema(self) -> None:
+        """Create missing tables and the product search index. Run once at service startup, not per request."""
+        Base.metadata.create_all(self._engine)
+        # create_all skips indexes on tables that already exist (e.g. an older dev.db)
+        with self._engine.begin() as conn:
+            _ensure_cart_item_indexes(conn)
+        ensure_search_index(self._engine)
 
     @contextmanager
     def session(self) -> Generator[Session, None, None]:
@@ -34,14 +85,19 @@ class CommerceUnitOfWork(IUnitOfWork):
         try:
             yield session
             session.commit()
+            for tenant in session.info.pop(PENDING_PRODUCT_INVALIDATIONS, ()):
+                self.product_cache.invalidate_tenant(tenant)
         except Exception:
             session.rollback()
             raise
         finally:
             session.close()
 
-    def product_repo(self, session: Session) -> ProductRepository:
-        return ProductRepository(session)
+    def product_repo(self, session: Session) -> ProductRepository | CachedProductRepository:
+        repo = ProductRepository(session)
+        if self.product_cache is None:
+            return repo
+        return CachedProductRepository(repo, session, self.product_cache)
 
     def cart_repo(self, session: Session) -> CartRepository:
         return CartRepository(session)
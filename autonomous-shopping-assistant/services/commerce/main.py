@@ -8,17 +8,22 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from shared.config.base import get_environment
 from shared.adapters.logging_adapter import create_logger
-from services.commerce.config import get_database_url, get_logging_level, get_logging_format
-from services.commerce.infrastructure.http.routes import router
+from shared.utils.correlation import CorrelationIdMiddleware
+from services.commerce.config import (
+    get_database_url,
+    get_logging_level,
+    get_logging_format,
+    get_logging_debug_sample_rate,
+)
+from shared.adapters.db_adapter import dispose_engines
+from services.commerce.infrastructure.http.routes import router, get_uow
 from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
 from services.commerce.infrastructure.persistence.models import ProductModel
 from decimal import Decimal
 
 
-def seed_products_if_needed():
+def seed_products_if_needed(uow: CommerceUnitOfWork):
     """Seed a few products for dev."""
-    from services.commerce.config import get_database_url
-    uow = CommerceUnitOfWork(get_database_url())
     with uow.session() as s:
         if s.query(ProductModel).count() > 0:
             return
@@ -43,17 +48,22 @@ def seed_products_if_needed():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Engine + pool are created once here; DDL runs only at startup
+    uow = get_uow()
+    uow.create_schema()
     if get_environment().value == "dev":
-        seed_products_if_needed()
+        seed_products_if_needed(uow)
     yield
-    # shutdown
+    dispose_engines()
 
 
 def create_app() -> FastAPI:
     env = get_environment()
     log_format = get_logging_format()
     log_level = get_logging_level()
-    logger = create_logger("commerce", format_type=log_format, level=log_level)
+    logger = create_logger(
+        "commerce", format_type=log_format, level=log_level, debug_sample_rate=get_logging_debug_sample_rate()
+    )
     app = FastAPI(
         title="Commerce Service",
         description="Catalog, cart, orders",
@@ -67,6 +77,7 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(CorrelationIdMiddleware)
     app.include_router(router)
     return app
 
@@ -77,3 +88,10 @@ app = create_app()
 @app.get("/health")
 def health():
     return {"status": "ok", "service": "commerce"}
+
+
+@app.get("/v1/metrics/product-cache")
+def product_cache_metrics():
+    """Product/search cache hits, negative hits, loads and tenant invalidations."""
+    cache = get_uow().product_cache
+    return cache.snapshot() if cache is not None else {"enabled": False}
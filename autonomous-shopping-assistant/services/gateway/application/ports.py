@@ -2,16 +2,47 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable
 
 from shared.ports.auth_port import AuthResult
 
 
 class IRateLimiter(ABC):
     @abstractmethod
-    def allow(self, key: str) -> bool: ...
+    async def allow(self, key: str) -> bool:
+        """Whether a request for key may proceed (awaited on the gateway's event loop)."""
+
+
+class UpstreamTimeoutError(Exception):
+    """Orchestration did not answer in time (gateway returns 504)."""
+
+
+class UpstreamUnavailableError(Exception):
+    """Orchestration is unreachable (gateway returns 502), or its circuit is open or no
+    connection to it is free (503 with retry_after)."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class UpstreamResponse:
+    """An upstream response whose body has not been read yet: iterate `body`, then `close()`.
+
+    `headers` are the raw (name, value) pairs to relay: repeated headers such as
+    Set-Cookie stay separate entries, and the body is still content-encoded.
+    """
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: AsyncIterator[bytes]
+    close: Callable[[], Awaitable[None]]
 
 
 class IUpstreamClient(ABC):
     """Port for calling Orchestration."""
     @abstractmethod
-    def post_sessions(self, tenant_id: str, body: dict, auth: AuthResult) -> dict: ...
+    async def post_sessions(
+        self, tenant_id: str, body: bytes, auth: AuthResult, headers: dict[str, str] | None = None
+    ) -> UpstreamResponse: ...
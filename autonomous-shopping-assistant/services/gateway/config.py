@@ -3,3 +3,26 @@ import os
 
 def get_orchestration_url() -> str:
     return os.getenv("ORCHESTRATION_URL", "http://localhost:8000")
+
+def get_rate_limit_per_minute() -> int:
+    return int(os.getenv("RATE_LIMIT_PER_MINUTE", "120"))
+
+def get_rate_limit_burst() -> int | None:
+    return int(os.getenv("RATE_LIMIT_BURST", "0")) or None
+
+def get_rate_limit_redis_url() -> str | None:
+    """Shared limits across replicas when set (opt-in: REDIS_URL alone does not enable it)."""
+    return os.getenv("RATE_LIMIT_REDIS_URL") or None
+
+def get_upstream_timeout_seconds() -> float:
+    """Connect / read timeout for orchestration calls; a timeout returns 504."""
+    return float(os.getenv("GATEWAY_UPSTREAM_TIMEOUT_SECONDS", "30"))
+
+def get_upstream_max_connections() -> int:
+    return int(os.getenv("GATEWAY_UPSTREAM_MAX_CONNECTIONS", "200"))
+
+def get_circuit_failure_threshold() -> int:
+    return int(os.getenv("GATEWAY_CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+def get_circuit_reset_seconds() -> float:
+    return float(os.getenv("GATEWAY_CIRCUIT_RESET_SECONDS", "10"))
@@ -1,23 +1,158 @@
-"""Rate limiter: in-memory (dev), optional Redis (prod)."""
+"""Rate limiter: in-memory (dev), Redis shared across gateway replicas (prod).
+
+Both use GCRA (the generic cell rate algorithm, a token bucket stored as one
+number): each key keeps a "theoretical arrival time" (TAT). A request is allowed
+when TAT - now <= burst tolerance, and then moves TAT one emission interval
+(period / limit) forward. `limit` requests per `period` on average, bursts of up
+to `burst` requests; O(1) time and one float of state per key. A key whose TAT has
+passed is back to a full bucket, so its state can be dropped.
+"""
 from __future__ import annotations
 
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Any, Callable
+
+from services.gateway.application.ports import IRateLimiter
+from services.gateway.infrastructure.upstream import CircuitBreaker
+
+# Every _EVICT_EVERY calls, drop up to 2 * _EVICT_EVERY refilled keys (amortized cleanup)
+_EVICT_EVERY = 64
+
+
+class InMemoryRateLimiter(IRateLimiter):
+    """GCRA per key in this process: max_per_minute on average, bursts up to `burst`.
+
+    Keys are kept in last-use order; every few calls, keys at the old end whose bucket
+    has refilled are dropped, so idle tenants cost nothing after about burst / rate
+    seconds. max_keys caps memory under a flood of new keys (the oldest
+    keys are forgotten, i.e. get a full bucket back).
+    """
+
+    def __init__(
+        self,
+        max_per_minute: int = 60,
+        burst: int | None = None,
+        max_keys: int = 1_000_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._interval = 60.0 / max_per_minute
+        self._tolerance = self._interval * ((burst or max_per_minute) - 1)
+        self._max_keys = max_keys
+        self._clock = clock
+        self._tat: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self.evictions = 0
+
+    async def allow(self, key: str) -> bool:
+        return self.check(key)
+
+    def check(self, key: str) -> bool:
+        """allow() for synchronous callers (thread-safe, never blocks on I/O)."""
+        with self._lock:
+            now = self._clock()
+            self._calls += 1
+            if self._calls % _EVICT_EVERY == 0:
+                self._evict(now)
+            tats = self._tat
+            tat = tats.get(key, now)
+            if tat < now:
+                tat = now
+            elif tat - now > self._tolerance:
+                return False
+            tats[key] = tat + self._interval
+            tats.move_to_end(key)
+            if len(tats) > self._max_keys:
+                tats.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def _evict(self, now: float) -> None:
+        """Drop least recently used keys whose bucket is full again."""
+        tats = self._tat
+        for _ in range(2 * _EVICT_EVERY):
+            if not tats:
+                return
+            oldest_key, oldest_tat = next(iter(tats.items()))
+            if oldest_tat > now:
+                return
+            del tats[oldest_key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+# KEYS[1] = bucket key; ARGV[1] = emission interval (us), ARGV[2] = burst tolerance (us).
+# Uses the Redis clock so every replica sees the same time; the key expires when
+# its bucket is full again (idle keys evict themselves). Returns {allowed, retry_after_us}.
+_GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local over = tat - now - tolerance
+if over > 0 then return {0, over} end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+return {1, 0}
+"""
+
+
+class RedisRateLimiter(IRateLimiter):
+    """GCRA in Redis via one atomic Lua call per request: limits hold across replicas.
+
+    The call goes through redis.asyncio, so a slow Redis never blocks the gateway's
+    event loop; allow() only runs on that loop, which is what the (lock-free)
+    CircuitBreaker expects. Pass `client` to use an existing redis.asyncio.Redis (or
+    fakeredis.FakeAsyncRedis) instead of connecting to `url`.
+
+    If Redis is unreachable the limiter falls back to a per-process
+    InMemoryRateLimiter with the same limits rather than failing every request.
+    After a failure Redis is skipped for fallback_seconds (a circuit breaker), so
+    an outage costs one socket timeout per window instead of one per request.
+    """
 
-from shared.ports.cache_port import ICache
+    def __init__(
+        self,
+        url: str | None = None,
+        max_per_minute: int = 60,
+        burst: int | None = None,
+        key_prefix: str = "ratelimit",
+        client: Any = None,
+        fallback_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if client is None:
+            import redis.asyncio
+            client = redis.asyncio.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self._client = client
+        self._script = client.register_script(_GCRA_LUA)
+        interval = 60.0 / max_per_minute
+        self._args = [round(interval * 1e6), round(interval * ((burst or max_per_minute) - 1) * 1e6)]
+        self._prefix = key_prefix
+        self._fallback = InMemoryRateLimiter(max_per_minute=max_per_minute, burst=burst, clock=clock)
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=fallback_seconds, clock=clock)
+        self.fallbacks = 0
 
+    async def allow(self, key: str) -> bool:
+        if self.breaker.allow():
+            try:
+                allowed, _ = await self._script(keys=[f"{self._prefix}:{key}"], args=self._args)
+            except Exception:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+                return bool(allowed)
+        self.fallbacks += 1
+        return self._fallback.check(key)
 
-class InMemoryRateLimiter:
-    """Simple sliding window: max 60 req/min per key (dev)."""
-    def __init__(self, max_per_minute: int = 60):
-        self._max = max_per_minute
-        self._counts: dict[str, list[float]] = defaultdict(list)
 
-    def allow(self, key: str) -> bool:
-        now = time.monotonic()
-        window = now - 60
-        self._counts[key] = [t for t in self._counts[key] if t > window]
-        if len(self._counts[key]) >= self._max:
-            return False
-        self._counts[key].append(now)
-        return True
+def create_rate_limiter(redis_url: str | None, max_per_minute: int = 60, burst: int | None = None) -> IRateLimiter:
+    if redis_url:
+        return RedisRateLimiter(redis_url, max_per_minute=max_per_minute, burst=burst)
+    return InMemoryRateLimiter(max_per_minute=max_per_minute, burst=burst)
@@ -1,19 +1,172 @@
-"""HTTP client to Orchestration."""
+"""HTTP client to Orchestration: async, pooled, streamed, behind a circuit breaker.
+
+Requests go through the process-wide AsyncPooledHttpClient for the orchestration
+URL, so every gateway request reuses a keep-alive connection instead of opening
+one per call. The pool is split into shards of a few connections each, which keeps
+httpcore's per-request pool bookkeeping cheap at hundreds of concurrent requests.
+The response body is handed back unread and streamed to the
+caller chunk by chunk.
+"""
 from __future__ import annotations
 
+import time
+from typing import Callable
+
 import httpx
+
+from shared.adapters.http_adapter import get_async_http_client
 from shared.ports.auth_port import AuthResult
+from services.gateway.application.ports import (
+    IUpstreamClient,
+    UpstreamResponse,
+    UpstreamTimeoutError,
+    UpstreamUnavailableError,
+)
+
+# Upstream statuses that mean "orchestration is unhealthy" (not "this request was bad")
+_FAILURE_STATUS = frozenset({502, 503, 504})
+# Retry-After hint when this gateway's own connection pool is exhausted
+_POOL_BUSY_RETRY_AFTER = 1.0
+# Per-connection headers a proxy must not forward (RFC 9110 7.6.1), plus the ones
+# the gateway's own server and middleware set (CorrelationIdMiddleware: x-request-id)
+_NOT_FORWARDED = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade", "date", "server", "x-request-id",
+})
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures -> half-open after
+    `reset_timeout_seconds`, where one trial request decides closed or open again (a
+    trial that never reports back, e.g. a cancelled request, is replaced after another
+    reset_timeout_seconds).
+
+    While open, callers fail fast instead of holding a connection and a client for
+    the full upstream timeout. Meant for one event loop (no locking).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started: float | None = None
+        self.state = self.CLOSED
+        self.rejected = 0
 
+    def retry_after(self) -> float:
+        """Seconds until the next trial request is allowed (0 when closed).
 
-class HttpUpstreamClient:
-    def __init__(self, orchestration_url: str):
+        Half-open with a trial outstanding: reset_timeout, since when the trial
+        ends (and whether it closes the circuit) is unknown.
+        """
+        if self.state == self.OPEN:
+            return max(0.0, self._opened_at + self._reset_timeout - self._clock())
+        if self.state == self.HALF_OPEN and self._trial_started is not None:
+            return self._reset_timeout
+        return 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = self._clock()
+        if self.state == self.OPEN and now >= self._opened_at + self._reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_started = None
+        if self.state == self.HALF_OPEN and (
+            self._trial_started is None or now - self._trial_started > self._reset_timeout
+        ):
+            self._trial_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_started = None
+        self.state = self.CLOSED
+
+    def record_skipped(self) -> None:
+        """An allowed call never reached the upstream: no verdict, free a half-open trial."""
+        self._trial_started = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_started = None
+        if self.state == self.HALF_OPEN or self._failures >= self._threshold:
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "failures": self._failures, "rejected": self.rejected}
+
+
+class HttpUpstreamClient(IUpstreamClient):
+    def __init__(
+        self,
+        orchestration_url: str,
+        timeout_seconds: float = 30.0,
+        max_connections: int = 200,
+        connections_per_shard: int = 8,
+        breaker: CircuitBreaker | None = None,
+    ):
         self._base = orchestration_url.rstrip("/")
+        self._timeout = timeout_seconds
+        self._max_connections = max_connections
+        self._shards = max(1, max_connections // connections_per_shard)
+        self.breaker = breaker or CircuitBreaker()
+
+    def _client(self):
+        # Looked up per call: close_async_http_clients() in the lifespan drops the pool
+        return get_async_http_client(
+            self._base,
+            timeout=self._timeout,
+            max_connections=self._max_connections,
+            max_keepalive_connections=self._max_connections,
+            pool_shards=self._shards,
+        )
 
-    def post_sessions(self, tenant_id: str, body: dict, auth: AuthResult) -> dict:
-        r = httpx.post(
-            f"{self._base}/v1/tenants/{tenant_id}/sessions",
-            json=body,
-            timeout=30.0,
+    async def post_sessions(
+        self, tenant_id: str, body: bytes, auth: AuthResult, headers: dict[str, str] | None = None
+    ) -> UpstreamResponse:
+        breaker = self.breaker
+        if not breaker.allow():
+            raise UpstreamUnavailableError("orchestration circuit open", retry_after=breaker.retry_after())
+        try:
+            resp = await self._client().stream(
+                "POST",
+                f"/v1/tenants/{tenant_id}/sessions",
+                content=body,
+                # The body is relayed still encoded: only ask for what the client accepts
+                headers={"content-type": "application/json", "accept-encoding": "identity", **(headers or {})},
+            )
+        except httpx.PoolTimeout as e:
+            # Our own pool is saturated: overload here, not an orchestration failure
+            breaker.record_skipped()
+            raise UpstreamUnavailableError(
+                "no free connection to orchestration", retry_after=_POOL_BUSY_RETRY_AFTER
+            ) from e
+        except httpx.TimeoutException as e:
+            breaker.record_failure()
+            raise UpstreamTimeoutError(f"orchestration timed out: {type(e).__name__}") from e
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            raise UpstreamUnavailableError(f"orchestration unreachable: {type(e).__name__}") from e
+        if resp.status_code in _FAILURE_STATUS:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return UpstreamResponse(
+            status_code=resp.status_code,
+            headers=[(k, v) for k, v in resp.headers.raw if k.decode("latin-1").lower() not in _NOT_FORWARDED],
+            body=resp.aiter_raw(),
+            close=resp.aclose,
         )
-        r.raise_for_status()
-        return r.json()
@@ -1,19 +1,42 @@
 """Gateway entrypoint: auth, rate limit, proxy to orchestration, serve chat UI."""
 from __future__ import annotations
 
+import math
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Depends, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.datastructures import Headers
 
 from shared.ports.auth_port import IAuthProvider, AuthResult
 from shared.config.settings import get_settings
-from shared.adapters.auth_adapter import create_auth_provider
-from services.gateway.infrastructure.rate_limit import InMemoryRateLimiter
-from services.gateway.infrastructure.upstream import HttpUpstreamClient
-from services.gateway.config import get_orchestration_url
+from shared.adapters.auth_adapter import get_auth_provider
+from shared.adapters.http_adapter import close_async_http_clients
+from shared.utils.correlation import CorrelationIdMiddleware
+from services.gateway.application.ports import (
+    IUpstreamClient,
+    UpstreamResponse,
+    UpstreamTimeoutError,
+    UpstreamUnavailableError,
+)
+from services.gateway.infrastructure.rate_limit import create_rate_limiter
+from services.gateway.infrastructure.upstream import CircuitBreaker, HttpUpstreamClient
+from services.gateway.config import (
+    get_circuit_failure_threshold,
+    get_circuit_reset_seconds,
+    get_orchestration_url,
+    get_rate_limit_burst,
+    get_rate_limit_per_minute,
+    get_rate_limit_redis_url,
+    get_upstream_max_connections,
+    get_upstream_timeout_seconds,
+)
+
+# Request headers passed on to orchestration (the pooled client adds the request ids)
+_FORWARDED_HEADERS = ("authorization", "accept-encoding")
 
 
 class SendMessageBody(BaseModel):
@@ -22,36 +45,58 @@ class SendMessageBody(BaseModel):
     message: dict
 
 
-def get_auth() -> IAuthProvider:
-    s = get_settings(service_name="gateway")
-    auth_vars = {k: v for k, v in vars(s.auth).items() if k != "backend"}
-    return create_auth_provider(s.auth.backend, **auth_vars)
+# Dependencies are async so they run on the event loop, not in the thread pool
+async def get_auth() -> IAuthProvider:
+    return get_auth_provider(get_settings(service_name="gateway").auth)
 
 
-_rate_limiter = InMemoryRateLimiter(max_per_minute=120)
+_rate_limiter = create_rate_limiter(
+    get_rate_limit_redis_url(), max_per_minute=get_rate_limit_per_minute(), burst=get_rate_limit_burst()
+)
 _upstream = None
 
-def get_upstream() -> HttpUpstreamClient:
+async def get_upstream() -> IUpstreamClient:
     global _upstream
     if _upstream is None:
-        _upstream = HttpUpstreamClient(get_orchestration_url())
+        _upstream = HttpUpstreamClient(
+            get_orchestration_url(),
+            timeout_seconds=get_upstream_timeout_seconds(),
+            max_connections=get_upstream_max_connections(),
+            breaker=CircuitBreaker(get_circuit_failure_threshold(), get_circuit_reset_seconds()),
+        )
     return _upstream
 
 
-app = FastAPI(title="Gateway", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_async_http_clients()
+
+
+async def _relay(resp: UpstreamResponse):
+    """Pass the upstream body through chunk by chunk; release the connection even on disconnect."""
+    try:
+        async for chunk in resp.body:
+            yield chunk
+    finally:
+        await resp.close()
+
+
+app = FastAPI(title="Gateway", version="0.1.0", lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(CorrelationIdMiddleware)
 
 
 @app.post("/v1/tenants/{tenant_id}/sessions")
-def proxy_sessions(
+async def proxy_sessions(
     tenant_id: str,
     body: SendMessageBody,
     request: Request,
     auth: IAuthProvider = Depends(get_auth),
-    upstream: HttpUpstreamClient = Depends(get_upstream),
+    upstream: IUpstreamClient = Depends(get_upstream),
 ):
     # Rate limit by tenant (or tenant+user when we have auth)
-    if not _rate_limiter.allow(tenant_id):
+    if not await _rate_limiter.allow(tenant_id):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
     try:
         result = auth.authenticate(None, dict(request.headers))
@@ -59,7 +104,20 @@ def proxy_sessions(
         result = auth.optional_auth(None)
     if not result:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return upstream.post_sessions(tenant_id, body.model_dump(), result)
+    headers = {k: v for k in _FORWARDED_HEADERS if (v := request.headers.get(k))}
+    try:
+        resp = await upstream.post_sessions(tenant_id, body.model_dump_json().encode(), result, headers)
+    except UpstreamTimeoutError:
+        raise HTTPException(status_code=504, detail="Orchestration timed out")
+    except UpstreamUnavailableError as e:
+        if e.retry_after is None:
+            raise HTTPException(status_code=502, detail="Orchestration unreachable")
+        raise HTTPException(
+            status_code=503,
+            detail="Orchestration unavailable",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    return StreamingResponse(_relay(resp), status_code=resp.status_code, headers=Headers(raw=resp.headers))
 
 
 @app.get("/health")
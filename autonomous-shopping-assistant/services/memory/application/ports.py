@@ -15,6 +15,16 @@ class IUserMemoryRepository(ABC):
     @abstractmethod
     def upsert(self, memory: UserMemory) -> None: ...
 
+    @abstractmethod
+    def merge(
+        self,
+        tenant_id: TenantId,
+        user_id: UserId,
+        facts: dict[str, str] | None = None,
+        preferences: dict[str, str] | None = None,
+    ) -> UserMemory:
+        """Merge keys into facts/preferences, creating the memory if missing; returns the result."""
+
     @abstractmethod
     def update_facts(self, tenant_id: TenantId, user_id: UserId, facts: dict[str, str]) -> None: ...
 
@@ -29,5 +39,8 @@ class ISessionHistoryRepository(ABC):
     @abstractmethod
     def append(self, tenant_id: TenantId, session_id: SessionId, turn: SessionTurn) -> None: ...
 
+    @abstractmethod
+    def append_many(self, tenant_id: TenantId, session_id: SessionId, turns: list[SessionTurn]) -> None: ...
+
     @abstractmethod
     def get_last_n(self, tenant_id: TenantId, session_id: SessionId, n: int) -> list[SessionTurn]: ...
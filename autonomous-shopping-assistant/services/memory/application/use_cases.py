@@ -33,9 +33,7 @@ class UpdateUserMemoryUseCase:
         facts: dict[str, str] | None = None,
         preferences: dict[str, str] | None = None,
     ) -> dict:
-        self._repo.update_facts(tenant_id, user_id, facts or {})
-        self._repo.update_preferences(tenant_id, user_id, preferences or {})
-        memory = self._repo.get(tenant_id, user_id)
+        memory = self._repo.merge(tenant_id, user_id, facts, preferences)
         return {"facts": memory.facts, "preferences": memory.preferences, "summary": memory.to_summary()}
 
 
@@ -60,3 +58,16 @@ class AppendSessionTurnUseCase:
         content: str,
     ) -> None:
         self._repo.append(tenant_id, session_id, SessionTurn(role=role, content=content))
+
+
+class AppendSessionTurnsUseCase:
+    """Append several turns (e.g. user + assistant) in one write."""
+
+    def __init__(self, repo: ISessionHistoryRepository):
+        self._repo = repo
+
+    def execute(self, tenant_id: TenantId, session_id: SessionId, turns: list[dict[str, str]]) -> int:
+        self._repo.append_many(
+            tenant_id, session_id, [SessionTurn(role=t["role"], content=t["content"]) for t in turns]
+        )
+        return len(turns)
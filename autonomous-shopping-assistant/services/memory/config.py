@@ -1,16 +1,34 @@
-"""Memory service config."""
-from shared.config.settings import get_settings
+"""Memory service config.
 
-_settings = get_settings(service_name="memory")
+Read through get_settings() on every call, so reload_settings() is picked up by
+anything built after it (see routes.get_uow).
+"""
+from shared.config.settings import AppSettings, DatabaseSettings, HistoryCacheSettings, get_settings
+
+
+def _settings() -> AppSettings:
+    return get_settings(service_name="memory")
 
 
 def get_database_url() -> str:
-    return _settings.database.url
+    return _settings().database.url
+
+
+def get_database_settings() -> DatabaseSettings:
+    return _settings().database
+
+
+def get_history_cache_settings() -> HistoryCacheSettings:
+    return _settings().history_cache
 
 
 def get_logging_format() -> str:
-    return _settings.logging.format
+    return _settings().logging.format
+
+
+def get_logging_debug_sample_rate() -> float:
+    return _settings().logging.debug_sample_rate
 
 
 def get_logging_level() -> str:
-    return _settings.logging.level
+    return _settings().logging.level
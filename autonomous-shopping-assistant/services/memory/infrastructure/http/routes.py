@@ -3,21 +3,39 @@ from __future__ import annotations
 
 from uuid import UUID
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from shared.config.settings import on_settings_reload
 from shared.domain.value_objects import TenantId, UserId, SessionId
 from services.memory.application.use_cases import (
     GetUserMemoryUseCase,
     UpdateUserMemoryUseCase,
     GetSessionHistoryUseCase,
     AppendSessionTurnUseCase,
+    AppendSessionTurnsUseCase,
 )
+from services.memory.infrastructure.persistence.history_cache import SessionHistoryCache
 from services.memory.infrastructure.persistence.unit_of_work import MemoryUnitOfWork
 
 
+_uow: MemoryUnitOfWork | None = None
+
+
 def get_uow() -> MemoryUnitOfWork:
-    from services.memory.config import get_database_url
-    return MemoryUnitOfWork(get_database_url())
+    global _uow
+    if _uow is None:
+        from services.memory.config import get_database_url, get_database_settings, get_history_cache_settings
+        sizing = get_history_cache_settings()
+        cache = SessionHistoryCache(max_turns=sizing.max_turns, max_sessions=sizing.max_sessions)
+        _uow = MemoryUnitOfWork(get_database_url(), get_database_settings(), history_cache=cache)
+    return _uow
+
+
+@on_settings_reload
+def _drop_uow() -> None:
+    # The next request builds a UoW (and history cache) from the reloaded settings
+    global _uow
+    _uow = None
 
 
 class UpdateMemoryBody(BaseModel):
@@ -30,6 +48,10 @@ class AppendTurnBody(BaseModel):
     content: str
 
 
+class AppendTurnsBody(BaseModel):
+    turns: list[AppendTurnBody] = Field(min_length=1, max_length=100)
+
+
 router = APIRouter(prefix="/v1/tenants/{tenant_id}", tags=["memory"])
 
 
@@ -82,3 +104,16 @@ def append_turn(
         uc = AppendSessionTurnUseCase(uow.session_history_repo(s))
         uc.execute(_tenant(tenant_id), _session(session_id), body.role, body.content)
     return {"ok": True}
+
+
+@router.post("/sessions/{session_id}/turns:batch")
+def append_turns(
+    tenant_id: str,
+    session_id: str,
+    body: AppendTurnsBody,
+    uow: MemoryUnitOfWork = Depends(get_uow),
+):
+    with uow.session() as s:
+        uc = AppendSessionTurnsUseCase(uow.session_history_repo(s))
+        count = uc.execute(_tenant(tenant_id), _session(session_id), [t.model_dump() for t in body.turns])
+    return {"ok": True, "count": count}
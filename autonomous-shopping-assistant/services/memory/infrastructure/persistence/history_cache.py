@@ -0,0 +1,130 @@
+"""In-process read cache for the tail of each session's history (write-through on append).
+
+Each cached session keeps its last `max_turns` turns (with row ids) in a deque. Reads
+are served from the deque when it holds enough turns, or the whole session; misses
+load from the DB and fill it. Appends are applied only after their transaction
+commits (see MemoryUnitOfWork.session). A per-session generation counter stops a
+slow read from filling the cache with rows older than a concurrent append.
+
+The cache is per process: with several memory workers and no session affinity,
+set HISTORY_CACHE_TURNS=0 (HistoryCacheSettings) so every read goes to the database.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from services.memory.domain.entities import SessionTurn
+
+CachedTurn = tuple[int, SessionTurn]  # (row id, turn)
+
+
+@dataclass
+class _Entry:
+    turns: deque[CachedTurn]
+    complete: bool  # deque holds every turn of the session
+
+
+@dataclass
+class HistoryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    fills: int = 0
+    stale_fills: int = 0
+    write_through: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    def snapshot(self, sessions: int) -> dict[str, Any]:
+        reads = self.hits + self.misses
+        return {
+            **self.__dict__,
+            "sessions": sessions,
+            "hit_rate": round(self.hits / reads, 4) if reads else 0.0,
+        }
+
+
+@dataclass
+class SessionHistoryCache:
+    max_turns: int = 50
+    max_sessions: int = 10_000
+    stats: HistoryCacheStats = field(default_factory=HistoryCacheStats)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_turns > 0
+
+    def get(self, key: str, n: int) -> list[SessionTurn] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (n > len(entry.turns) and not entry.complete):
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            turns = list(entry.turns)[-n:] if n > 0 else []
+        return [t for _, t in turns]
+
+    def token(self, key: str) -> tuple[int, int]:
+        """Snapshot to pass to fill(); taken before the DB read."""
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def fill(self, key: str, rows: list[CachedTurn], limit: int, token: tuple[int, int]) -> None:
+        """Cache rows (ascending id) read with LIMIT `limit`, unless a write raced the read."""
+        with self._lock:
+            if token != (self._epoch, self._generations.get(key, 0)):
+                self.stats.stale_fills += 1
+                return
+            self._entries[key] = _Entry(
+                turns=deque(rows[-self.max_turns:], maxlen=self.max_turns),
+                complete=len(rows) < limit,
+            )
+            self._entries.move_to_end(key)
+            self.stats.fills += 1
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def apply(self, key: str, turns: list[CachedTurn]) -> None:
+        """Write-through for committed turns; out-of-order ids drop the entry instead."""
+        with self._lock:
+            self._bump(key)
+            turns = sorted(turns, key=lambda t: t[0])
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            last_id = entry.turns[-1][0] if entry.turns else 0
+            if turns[0][0] <= last_id:
+                del self._entries[key]
+                self.stats.invalidations += 1
+                return
+            if len(entry.turns) + len(turns) > self.max_turns:
+                entry.complete = False
+            entry.turns.extend(turns)
+            self.stats.write_through += 1
+
+    def _bump(self, key: str) -> None:
+        if len(self._generations) >= self.max_sessions * 4:
+            # Bound the generation map; a new epoch voids every outstanding token
+            self._generations.clear()
+            self._epoch += 1
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return self.stats.snapshot(len(self._entries))
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import json
-from sqlalchemy import Column, String, Text, Integer, DateTime
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import declarative_base
 
@@ -20,9 +20,11 @@ class UserMemoryModel(Base):
 
 class SessionTurnModel(Base):
     __tablename__ = "session_turns"
+    # get_last_n: WHERE tenant_id, session_id ORDER BY id DESC LIMIT n is one index range scan
+    __table_args__ = (Index("ix_session_turns_tenant_session_id", "tenant_id", "session_id", "id"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
-    tenant_id = Column(String(36), nullable=False, index=True)
-    session_id = Column(String(36), nullable=False, index=True)
+    tenant_id = Column(String(36), nullable=False)
+    session_id = Column(String(36), nullable=False)
     role = Column(String(20), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
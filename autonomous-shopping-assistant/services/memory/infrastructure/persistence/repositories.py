@@ -4,18 +4,50 @@ from __future__ import annotations
 import json
 from uuid import UUID
 
+from sqlalchemy import cast, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from shared.domain.value_objects import TenantId, UserId, SessionId
 from services.memory.domain.entities import UserMemory, SessionTurn
 from services.memory.application.ports import IUserMemoryRepository, ISessionHistoryRepository
+from services.memory.infrastructure.persistence.history_cache import SessionHistoryCache
 from services.memory.infrastructure.persistence.models import Base, UserMemoryModel, SessionTurnModel
 
+PENDING_HISTORY_WRITES = "pending_history_writes"
+
 
 def _t(t) -> str:
     return str(t) if isinstance(t, UUID) else t
 
 
+# Dialects with INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _json_merge(dialect: str, current, excluded, patch: dict):
+    """Shallow JSON object merge in SQL, like {**current, **patch}: keys in patch
+    replace whole values (nested objects are not merged, null is kept as null).
+
+    Postgres: jsonb ||. SQLite: json_set per patch key (json_patch would be an
+    RFC 7396 merge: deep, and deleting keys set to null).
+    """
+    if dialect == "postgresql":
+        merged = func.coalesce(cast(current, postgresql.JSONB), cast("{}", postgresql.JSONB)).op("||")(
+            cast(excluded, postgresql.JSONB)
+        )
+        return cast(merged, current.type)
+    args = []
+    for key, value in patch.items():
+        args += [f'$."{key}"', func.json(json.dumps(value))]
+    return func.json_set(func.coalesce(current, "{}"), *args)
+
+
+def _sql_mergeable(dialect: str, *patches: dict) -> bool:
+    # SQLite JSON paths cannot quote a key that contains '"'
+    return dialect == "postgresql" or not any('"' in key for patch in patches for key in patch)
+
+
 class UserMemoryRepository(IUserMemoryRepository):
     def __init__(self, session: Session):
         self._session = session
@@ -34,59 +66,127 @@ class UserMemoryRepository(IUserMemoryRepository):
             preferences=json.loads(r.preferences) if r.preferences else {},
         )
 
+    def _dialect(self) -> str:
+        return self._session.get_bind().dialect.name
+
     def upsert(self, memory: UserMemory) -> None:
-        r = self.get(memory.tenant_id, memory.user_id)
-        if r:
-            m = self._session.query(UserMemoryModel).filter(
-                UserMemoryModel.tenant_id == _t(memory.tenant_id),
-                UserMemoryModel.user_id == _t(memory.user_id),
-            ).first()
-            if m:
-                m.facts = json.dumps(memory.facts)
-                m.preferences = json.dumps(memory.preferences)
+        """Replace facts and preferences (insert if missing) in one statement."""
+        values = {
+            "user_id": _t(memory.user_id),
+            "tenant_id": _t(memory.tenant_id),
+            "facts": json.dumps(memory.facts),
+            "preferences": json.dumps(memory.preferences),
+        }
+        dialect = self._dialect()
+        if dialect not in _UPSERT_INSERTS:
+            self._session.merge(UserMemoryModel(**values))
             return
-        self._session.add(UserMemoryModel(
-            user_id=_t(memory.user_id),
-            tenant_id=_t(memory.tenant_id),
-            facts=json.dumps(memory.facts),
-            preferences=json.dumps(memory.preferences),
+        stmt = _UPSERT_INSERTS[dialect](UserMemoryModel).values(**values)
+        self._session.execute(stmt.on_conflict_do_update(
+            index_elements=[UserMemoryModel.user_id, UserMemoryModel.tenant_id],
+            set_={"facts": stmt.excluded.facts, "preferences": stmt.excluded.preferences, "updated_at": func.now()},
         ))
 
-    def update_facts(self, tenant_id: TenantId, user_id: UserId, facts: dict) -> None:
-        mem = self.get(tenant_id, user_id)
-        if not mem:
-            mem = UserMemory(user_id=user_id, tenant_id=tenant_id, facts=facts, preferences={})
-        else:
+    def merge(
+        self,
+        tenant_id: TenantId,
+        user_id: UserId,
+        facts: dict[str, str] | None = None,
+        preferences: dict[str, str] | None = None,
+    ) -> UserMemory:
+        """Merge keys into facts/preferences (creating the row if missing) and return the result.
+
+        SQLite and Postgres do it in one INSERT ... ON CONFLICT DO UPDATE ... RETURNING,
+        merging the JSON in the database (see _json_merge); other dialects fall back
+        to read-modify-write. All paths give {**current, **patch}.
+        """
+        facts, preferences = facts or {}, preferences or {}
+        dialect = self._dialect()
+        if dialect not in _UPSERT_INSERTS or not _sql_mergeable(dialect, facts, preferences):
+            mem = self.get(tenant_id, user_id) or UserMemory(user_id=user_id, tenant_id=tenant_id, facts={}, preferences={})
             mem.facts = {**mem.facts, **facts}
-        self.upsert(mem)
+            mem.preferences = {**mem.preferences, **preferences}
+            self.upsert(mem)
+            return mem
+        stmt = _UPSERT_INSERTS[dialect](UserMemoryModel).values(
+            user_id=_t(user_id),
+            tenant_id=_t(tenant_id),
+            facts=json.dumps(facts),
+            preferences=json.dumps(preferences),
+        )
+        set_ = {"updated_at": func.now()}
+        # Skip untouched columns so their JSON is not rewritten
+        if facts:
+            set_["facts"] = _json_merge(dialect, UserMemoryModel.facts, stmt.excluded.facts, facts)
+        if preferences:
+            set_["preferences"] = _json_merge(
+                dialect, UserMemoryModel.preferences, stmt.excluded.preferences, preferences
+            )
+        row = self._session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserMemoryModel.user_id, UserMemoryModel.tenant_id],
+                set_=set_,
+            ).returning(UserMemoryModel.facts, UserMemoryModel.preferences)
+        ).one()
+        return UserMemory(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            facts=json.loads(row.facts) if row.facts else {},
+            preferences=json.loads(row.preferences) if row.preferences else {},
+        )
+
+    def update_facts(self, tenant_id: TenantId, user_id: UserId, facts: dict) -> None:
+        self.merge(tenant_id, user_id, facts=facts)
 
     def update_preferences(self, tenant_id: TenantId, user_id: UserId, preferences: dict) -> None:
-        mem = self.get(tenant_id, user_id)
-        if not mem:
-            mem = UserMemory(user_id=user_id, tenant_id=tenant_id, facts={}, preferences=preferences)
-        else:
-            mem.preferences = {**mem.preferences, **preferences}
-        self.upsert(mem)
+        self.merge(tenant_id, user_id, preferences=preferences)
 
 
 class SessionHistoryRepository(ISessionHistoryRepository):
-    def __init__(self, session: Session):
+    """Optional SessionHistoryCache: reads go through it, appends are queued in
+    session.info[PENDING_HISTORY_WRITES] and applied by the UoW after commit."""
+
+    def __init__(self, session: Session, cache: SessionHistoryCache | None = None):
         self._session = session
+        self._cache = cache if cache is not None and cache.enabled else None
 
     def get(self, tenant_id: TenantId, session_id: SessionId) -> None:
         return None  # We only use get_last_n
 
+    def _queue_write(self, tenant_id: TenantId, session_id: SessionId, turns: list[tuple[int, SessionTurn]]) -> None:
+        if self._cache is not None:
+            key = f"{_t(tenant_id)}:{_t(session_id)}"
+            self._session.info.setdefault(PENDING_HISTORY_WRITES, []).append((key, turns))
+
     def append(self, tenant_id: TenantId, session_id: SessionId, turn: SessionTurn) -> None:
-        self._session.add(SessionTurnModel(
+        row = SessionTurnModel(
             tenant_id=_t(tenant_id),
             session_id=_t(session_id),
             role=turn.role,
             content=turn.content,
-        ))
+        )
+        self._session.add(row)
+        if self._cache is not None:
+            self._session.flush()  # assigns row.id for the write-through
+            self._queue_write(tenant_id, session_id, [(row.id, turn)])
+
+    def append_many(self, tenant_id: TenantId, session_id: SessionId, turns: list[SessionTurn]) -> None:
+        """One multi-row INSERT; rows keep list order (ascending ids)."""
+        if not turns:
+            return
+        tid, sid = _t(tenant_id), _t(session_id)
+        params = [{"tenant_id": tid, "session_id": sid, "role": t.role, "content": t.content} for t in turns]
+        if self._cache is None:
+            self._session.execute(insert(SessionTurnModel), params)
+            return
+        ids = self._session.scalars(
+            insert(SessionTurnModel).returning(SessionTurnModel.id, sort_by_parameter_order=True), params
+        ).all()
+        self._queue_write(tenant_id, session_id, list(zip(ids, turns)))
 
-    def get_last_n(self, tenant_id: TenantId, session_id: SessionId, n: int) -> list[SessionTurn]:
+    def _query_last(self, tenant_id: TenantId, session_id: SessionId, n: int) -> list[tuple[int, SessionTurn]]:
         rows = (
-            self._session.query(SessionTurnModel)
+            self._session.query(SessionTurnModel.id, SessionTurnModel.role, SessionTurnModel.content)
             .filter(
                 SessionTurnModel.tenant_id == _t(tenant_id),
                 SessionTurnModel.session_id == _t(session_id),
@@ -95,4 +195,17 @@ class SessionHistoryRepository(ISessionHistoryRepository):
             .limit(n)
             .all()
         )
-        return [SessionTurn(role=r.role, content=r.content) for r in reversed(rows)]
+        return [(r.id, SessionTurn(role=r.role, content=r.content)) for r in reversed(rows)]
+
+    def get_last_n(self, tenant_id: TenantId, session_id: SessionId, n: int) -> list[SessionTurn]:
+        if self._cache is None:
+            return [t for _, t in self._query_last(tenant_id, session_id, n)]
+        key = f"{_t(tenant_id)}:{_t(session_id)}"
+        cached = self._cache.get(key, n)
+        if cached is not None:
+            return cached
+        token = self._cache.token(key)
+        limit = max(n, self._cache.max_turns)
+        rows = self._query_last(tenant_id, session_id, limit)
+        self._cache.fill(key, rows, limit, token)
+        return [t for _, t in rows[-n:]] if n > 0 else []
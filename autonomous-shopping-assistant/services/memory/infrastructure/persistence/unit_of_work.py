@@ -2,22 +2,38 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
+from shared.adapters.db_adapter import get_engine
+from shared.config.settings import DatabaseSettings
 from shared.ports.unit_of_work_port import IUnitOfWork
-from services.memory.infrastructure.persistence.models import Base
-from services.memory.infrastructure.persistence.repositories import UserMemoryRepository, SessionHistoryRepository
+from services.memory.infrastructure.persistence.history_cache import SessionHistoryCache
+from services.memory.infrastructure.persistence.models import Base, SessionTurnModel
+from services.memory.infrastructure.persistence.repositories import (
+    PENDING_HISTORY_WRITES,
+    UserMemoryRepository,
+    SessionHistoryRepository,
+)
 
 
 class MemoryUnitOfWork(IUnitOfWork):
-    def __init__(self, database_url: str):
-        self._engine = create_engine(
-            database_url,
-            connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
-        )
-        Base.metadata.create_all(self._engine)
+    """Shares the process-wide engine for the URL; call create_schema() once at startup."""
+
+    def __init__(
+        self,
+        database_url: str,
+        db_settings: DatabaseSettings | None = None,
+        history_cache: SessionHistoryCache | None = None,
+    ):
+        self._engine = get_engine(database_url, db_settings)
         self._session_factory = sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
+        self.history_cache = history_cache
+
+    def create_schema(self) -> None:
+        Base.metadata.create_all(self._engine)
+        # create_all skips indexes on tables that already exist (e.g. an older dev.db)
+        for index in SessionTurnModel.__table__.indexes:
+            index.create(self._engine, checkfirst=True)
 
     @contextmanager
     def session(self):
@@ -25,6 +41,9 @@ class MemoryUnitOfWork(IUnitOfWork):
         try:
             yield s
             s.commit()
+            # Write-through only once the turns are durable
+            for key, turns in s.info.pop(PENDING_HISTORY_WRITES, ()):
+                self.history_cache.apply(key, turns)
         except Exception:
             s.rollback()
             raise
@@ -35,4 +54,4 @@ class MemoryUnitOfWork(IUnitOfWork):
         return UserMemoryRepository(s)
 
     def session_history_repo(self, s: Session) -> SessionHistoryRepository:
-        return SessionHistoryRepository(s)
+        return SessionHistoryRepository(s, self.history_cache)
@@ -1,21 +1,33 @@
 """Memory service entrypoint."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from shared.config.base import get_environment
+from shared.adapters.db_adapter import dispose_engines
 from shared.adapters.logging_adapter import create_logger
-from services.memory.config import get_logging_level, get_logging_format
-from services.memory.infrastructure.http.routes import router
+from shared.utils.correlation import CorrelationIdMiddleware
+from services.memory.config import get_logging_level, get_logging_format, get_logging_debug_sample_rate
+from services.memory.infrastructure.http.routes import router, get_uow
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_uow().create_schema()
+    yield
+    dispose_engines()
 
 
 def create_app() -> FastAPI:
     log_format = get_logging_format()
     log_level = get_logging_level()
-    create_logger("memory", format_type=log_format, level=log_level)
-    app = FastAPI(title="Memory Service", version="0.1.0")
+    create_logger("memory", format_type=log_format, level=log_level, debug_sample_rate=get_logging_debug_sample_rate())
+    app = FastAPI(title="Memory Service", version="0.1.0", lifespan=lifespan)
     app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(CorrelationIdMiddleware)
     app.include_router(router)
     return app
 
@@ -26,3 +38,12 @@ app = create_app()
 @app.get("/health")
 def health():
     return {"status": "ok", "service": "memory"}
+
+
+@app.get("/v1/metrics/history-cache")
+def history_cache_metrics():
+    """Session history cache hit rate, fills, write-throughs and evictions."""
+    cache = get_uow().history_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": cache.enabled, **cache.snapshot()}
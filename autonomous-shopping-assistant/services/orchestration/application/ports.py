@@ -27,7 +27,7 @@ class IAgentClient(ABC):
     """Port for calling Agent Service."""
 
     @abstractmethod
-    def process(
+    async def process(
         self,
         tenant_id: TenantId,
         user_id: UserId,
@@ -40,10 +40,14 @@ class IMemoryClient(ABC):
     """Port for calling Memory Service."""
 
     @abstractmethod
-    def get_memory(self, tenant_id: TenantId, user_id: UserId) -> dict: ...
+    async def get_memory(self, tenant_id: TenantId, user_id: UserId) -> dict: ...
 
     @abstractmethod
-    def get_history(self, tenant_id: TenantId, session_id: SessionId, last_n: int) -> list[dict]: ...
+    async def get_history(self, tenant_id: TenantId, session_id: SessionId, last_n: int) -> list[dict]: ...
 
     @abstractmethod
-    def append_turn(self, tenant_id: TenantId, session_id: SessionId, role: str, content: str) -> None: ...
+    async def append_turn(self, tenant_id: TenantId, session_id: SessionId, role: str, content: str) -> None: ...
+
+    @abstractmethod
+    async def append_turns(self, tenant_id: TenantId, session_id: SessionId, turns: list[dict]) -> None:
+        """Append [{role, content}, ...] in one request / one commit."""
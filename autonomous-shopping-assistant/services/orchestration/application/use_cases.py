@@ -1,6 +1,7 @@
 """Orchestration use cases: session, agent, pass last best deal for add-to-cart."""
 from __future__ import annotations
 
+import asyncio
 from uuid import uuid4
 from shared.domain.value_objects import TenantId, UserId, SessionId, TurnId
 from services.orchestration.domain.entities import Session, Turn
@@ -14,6 +15,16 @@ from services.orchestration.application.ports import (
 # Session-scoped last best deal and last order (for "Add best to cart" and "Pay")
 _last_best_deal_by_session: dict[str, dict] = {}
 _last_order_id_by_session: dict[str, str] = {}
+# Turn writes run after the response is sent; the next turn of the same session waits for
+# its predecessor's write so history stays complete and ordered
+_pending_writes: dict[str, asyncio.Task] = {}
+
+
+async def drain_pending_writes() -> None:
+    """Wait for in-flight turn writes (service shutdown)."""
+    tasks = list(_pending_writes.values())
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 class SendMessageUseCase:
@@ -29,7 +40,23 @@ class SendMessageUseCase:
         self._agent_client = agent_client
         self._memory_client = memory_client
 
-    def execute(
+    async def _persist_turn(self, tenant_id: TenantId, session_id: SessionId, user_content: str, reply_text: str) -> None:
+        await self._memory_client.append_turns(tenant_id, session_id, [
+            {"role": "user", "content": user_content},
+            {"role": "assistant", "content": reply_text},
+        ])
+
+    def _schedule_persist(self, tenant_id: TenantId, session_id: SessionId, user_content: str, reply_text: str) -> None:
+        sid = str(session_id)
+        task = asyncio.create_task(self._persist_turn(tenant_id, session_id, user_content, reply_text))
+        _pending_writes[sid] = task
+
+        def _done(t: asyncio.Task) -> None:
+            if _pending_writes.get(sid) is t:
+                del _pending_writes[sid]
+        task.add_done_callback(_done)
+
+    async def execute(
         self,
         tenant_id: TenantId,
         user_id: UserId,
@@ -43,13 +70,18 @@ class SendMessageUseCase:
             session = None
         if not session:
             session = self._session_repo.create(tenant_id, user_id, channel)
-        # Get memory and history for context
-        memory = self._memory_client.get_memory(tenant_id, user_id)
-        history = self._memory_client.get_history(tenant_id, session.session_id, last_n=10)
+        sid_str = str(session.session_id)
+        pending = _pending_writes.get(sid_str)
+        if pending:
+            await asyncio.gather(pending, return_exceptions=True)
+        # Get memory and history for context (independent: fetch concurrently)
+        memory, history = await asyncio.gather(
+            self._memory_client.get_memory(tenant_id, user_id),
+            self._memory_client.get_history(tenant_id, session.session_id, last_n=10),
+        )
         messages = [{"role": h["role"], "content": h["content"]} for h in history]
         user_content = message.get("text") or message.get("payload", {}).get("text", "")
         messages.append({"role": "user", "content": user_content})
-        sid_str = str(session.session_id)
         context = {
             "userPreferences": memory.get("preferences", {}),
             "memorySummary": memory.get("summary", ""),
@@ -57,7 +89,7 @@ class SendMessageUseCase:
             "lastOrderId": _last_order_id_by_session.get(sid_str),
         }
         # Call agent
-        agent_response = self._agent_client.process(tenant_id, user_id, messages, context)
+        agent_response = await self._agent_client.process(tenant_id, user_id, messages, context)
         reply = agent_response.get("reply", {})
         state = agent_response.get("state", "completed")
         structured = reply.get("structured") or {}
@@ -70,9 +102,8 @@ class SendMessageUseCase:
                     _last_order_id_by_session[sid_str] = oid
                     # Stub expects lastBestDeal.orderId for confirm_payment
                     _last_best_deal_by_session[sid_str] = {**_last_best_deal_by_session.get(sid_str, {}), "orderId": oid}
-        # Persist turn
-        self._memory_client.append_turn(tenant_id, session.session_id, "user", user_content)
-        self._memory_client.append_turn(tenant_id, session.session_id, "assistant", reply.get("text", ""))
+        # Persist turn in the background; the reply doesn't wait for the memory write
+        self._schedule_persist(tenant_id, session.session_id, user_content, reply.get("text", ""))
         turn = self._turn_repo.create(
             session.session_id,
             {"message": message},
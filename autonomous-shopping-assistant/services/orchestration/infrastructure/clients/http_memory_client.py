@@ -1,41 +1,48 @@
 """HTTP client for Memory Service."""
 from __future__ import annotations
 
-import httpx
+from shared.adapters.http_adapter import get_async_http_client
 from shared.domain.value_objects import TenantId, UserId, SessionId
 from services.orchestration.application.ports import IMemoryClient
 
 
 class HttpMemoryClient(IMemoryClient):
     def __init__(self, base_url: str):
-        self._base = base_url.rstrip("/")
+        self._http = get_async_http_client(base_url, timeout=5.0)
 
-    def get_memory(self, tenant_id: TenantId, user_id: UserId) -> dict:
+    async def get_memory(self, tenant_id: TenantId, user_id: UserId) -> dict:
         try:
-            r = httpx.get(f"{self._base}/v1/tenants/{tenant_id}/users/{user_id}/memory", timeout=5.0)
+            r = await self._http.get(f"/v1/tenants/{tenant_id}/users/{user_id}/memory")
             r.raise_for_status()
             return r.json()
         except Exception:
             return {"facts": {}, "preferences": {}, "summary": ""}
 
-    def get_history(self, tenant_id: TenantId, session_id: SessionId, last_n: int) -> list[dict]:
+    async def get_history(self, tenant_id: TenantId, session_id: SessionId, last_n: int) -> list[dict]:
         try:
-            r = httpx.get(
-                f"{self._base}/v1/tenants/{tenant_id}/sessions/{session_id}/history",
+            r = await self._http.get(
+                f"/v1/tenants/{tenant_id}/sessions/{session_id}/history",
                 params={"last_n": last_n},
-                timeout=5.0,
             )
             r.raise_for_status()
             return r.json()
         except Exception:
             return []
 
-    def append_turn(self, tenant_id: TenantId, session_id: SessionId, role: str, content: str) -> None:
+    async def append_turn(self, tenant_id: TenantId, session_id: SessionId, role: str, content: str) -> None:
         try:
-            httpx.post(
-                f"{self._base}/v1/tenants/{tenant_id}/sessions/{session_id}/turns",
+            await self._http.post(
+                f"/v1/tenants/{tenant_id}/sessions/{session_id}/turns",
                 json={"role": role, "content": content},
-                timeout=5.0,
+            )
+        except Exception:
+            pass
+
+    async def append_turns(self, tenant_id: TenantId, session_id: SessionId, turns: list[dict]) -> None:
+        try:
+            await self._http.post(
+                f"/v1/tenants/{tenant_id}/sessions/{session_id}/turns:batch",
+                json={"turns": turns},
             )
         except Exception:
             pass
@@ -28,10 +28,8 @@ class SendMessageBody(BaseModel):
 
 def get_auth() -> IAuthProvider:
     from shared.config.settings import get_settings
-    from shared.adapters.auth_adapter import create_auth_provider
-    s = get_settings(service_name="orchestration")
-    auth_vars = {k: v for k, v in vars(s.auth).items() if k != "backend"}
-    return create_auth_provider(s.auth.backend, **auth_vars)
+    from shared.adapters.auth_adapter import get_auth_provider
+    return get_auth_provider(get_settings(service_name="orchestration").auth)
 
 
 def get_agent_client() -> IAgentClient:
@@ -62,7 +60,7 @@ router = APIRouter(prefix="/v1/tenants/{tenant_id}", tags=["orchestration"])
 
 
 @router.post("/sessions")
-def send_message(
+async def send_message(
     tenant_id: str,
     body: SendMessageBody,
     use_case: SendMessageUseCase = Depends(get_send_message_use_case),
@@ -79,5 +77,5 @@ def send_message(
     msg = body.message or {}
     if not (isinstance(msg, dict) and msg.get("payload") and "text" in msg.get("payload", {})):
         msg = {"type": "text", "payload": {"text": str(msg.get("text", msg))}}
-    out = use_case.execute(tenant_id=tid, user_id=uid, session_id=session_id, channel=body.channel, message=msg)
+    out = await use_case.execute(tenant_id=tid, user_id=uid, session_id=session_id, channel=body.channel, message=msg)
     return out
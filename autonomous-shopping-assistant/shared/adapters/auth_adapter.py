@@ -1,9 +1,14 @@
 """Auth adapters: mock (dev), JWT (prod)."""
 from __future__ import annotations
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from typing import Any
 from uuid import UUID
 
+from shared.config.settings import AuthSettings, on_settings_reload
 from shared.domain.exceptions import UnauthorizedError
 from shared.domain.value_objects import TenantId, UserId
 from shared.ports.auth_port import AuthResult, IAuthProvider
@@ -23,18 +28,86 @@ class MockAuthProvider(IAuthProvider):
         return self.authenticate(token, headers)
 
 
+class _VerifiedTokens:
+    """LRU of verified tokens: sha256(token) -> (AuthResult, expires_at).
+
+    Entries live until the token's exp (capped at max_ttl_seconds, which also covers
+    tokens without exp), so a signature is checked once per token lifetime rather
+    than once per request. Only successful verifications are stored; raw tokens are not.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_ttl_seconds: float = 300.0):
+        self._max_entries = max_entries
+        self._max_ttl = max_ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[AuthResult, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> AuthResult | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, result: AuthResult) -> None:
+        expires_at = time.time() + self._max_ttl
+        exp = result.claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
 class JwtAuthProvider(IAuthProvider):
-    """Prod: validate JWT and extract tenant_id, user_id from claims."""
+    """Prod: validate JWT and extract tenant_id, user_id from claims.
+
+    Verified tokens are remembered until they expire (see _VerifiedTokens); set
+    cache_entries=0 to verify on every call.
+    """
 
-    def __init__(self, secret: str, algorithm: str = "HS256"):
+    def __init__(self, secret: str, algorithm: str = "HS256", cache_entries: int = 10_000, cache_max_ttl: float = 300.0):
         self._secret = secret
         self._algorithm = algorithm
+        self.verified = _VerifiedTokens(cache_entries, cache_max_ttl) if cache_entries > 0 else None
 
     def authenticate(self, token: str | None, headers: dict[str, str] | None = None) -> AuthResult:
         if not token and headers:
-            token = headers.get("Authorization", "").replace("Bearer ", "").strip() or None
+            # Starlette's request.headers are lower-case
+            bearer = headers.get("Authorization") or headers.get("authorization") or ""
+            token = bearer.replace("Bearer ", "").strip() or None
         if not token:
             raise UnauthorizedError("Missing token")
+        key = None
+        if self.verified is not None:
+            key = hashlib.sha256(token.encode()).digest()
+            cached = self.verified.get(key)
+            if cached is not None:
+                return cached
+        result = self._verify(token)
+        if key is not None:
+            self.verified.put(key, result)
+        return result
+
+    def _verify(self, token: str) -> AuthResult:
         try:
             import jwt
             payload = jwt.decode(token, self._secret, algorithms=[self._algorithm])
@@ -57,6 +130,29 @@ class JwtAuthProvider(IAuthProvider):
             return None
 
 
+_providers_lock = threading.Lock()
+_providers: dict[tuple, IAuthProvider] = {}
+
+
+def get_auth_provider(settings: AuthSettings) -> IAuthProvider:
+    """Process-wide provider for these settings, built on first use and then reused."""
+    key = tuple(sorted(vars(settings).items()))
+    provider = _providers.get(key)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.get(key)
+            if provider is None:
+                options = {k: v for k, v in vars(settings).items() if k != "backend"}
+                provider = _providers[key] = create_auth_provider(settings.backend, **options)
+    return provider
+
+
+@on_settings_reload
+def _drop_auth_providers() -> None:
+    with _providers_lock:
+        _providers.clear()
+
+
 def create_auth_provider(backend: str, **kwargs: Any) -> IAuthProvider:
     if backend == "mock":
         return MockAuthProvider(
@@ -64,5 +160,10 @@ def create_auth_provider(backend: str, **kwargs: Any) -> IAuthProvider:
             kwargs.get("mock_default_user", "00000000-0000-0000-0000-000000000002"),
         )
     if backend == "jwt":
-        return JwtAuthProvider(secret=kwargs.get("jwt_secret", ""), algorithm=kwargs.get("jwt_algorithm", "HS256"))
+        return JwtAuthProvider(
+            secret=kwargs.get("jwt_secret", ""),
+            algorithm=kwargs.get("jwt_algorithm", "HS256"),
+            cache_entries=kwargs.get("jwt_cache_entries", 10_000),
+            cache_max_ttl=kwargs.get("jwt_cache_max_ttl_seconds", 300.0),
+        )
     raise ValueError(f"Unknown auth backend: {backend}")
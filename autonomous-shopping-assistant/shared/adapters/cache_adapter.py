@@ -1,71 +1,234 @@
 """Cache adapters: in-memory (dev), Redis (prod)."""
 from __future__ import annotations
 
+import heapq
+import pickle
+import sys
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 
+from shared.adapters.cache_codec import CacheCodec
 from shared.ports.cache_port import ICache
 
 
 class MemoryCache(ICache):
-    """Dev: in-memory cache with TTL."""
-    _store: dict[str, tuple[Any, float]]
+    """Dev / single node: thread-safe LRU + TTL cache.
 
-    def __init__(self, default_ttl: int = 300):
-        self._store = {}
+    get/set/delete are O(1): an OrderedDict in recency order, with expiry checked
+    lazily on access. A min-heap of deadlines lets each write also drop a few
+    already-expired keys (amortized), so dead entries do not wait for eviction.
+    Bounded by max_entries and, optionally, max_bytes (pickled size estimate);
+    least recently used keys go first.
+    """
+
+    _EXPIRE_PER_WRITE = 8
+
+    def __init__(self, default_ttl: int = 300, max_entries: int = 10_000, max_bytes: int | None = None):
+        self._store: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()  # key -> (value, deadline, size)
+        self._deadlines: list[tuple[float, str]] = []
         self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
 
-    def _expire(self) -> None:
-        now = time.monotonic()
-        for k in list(self._store):
-            if self._store[k][1] <= now:
-                del self._store[k]
+    def _remove(self, key: str) -> None:
+        _, _, size = self._store.pop(key)
+        self._bytes -= size
 
-    def get(self, key: str) -> Any | None:
-        self._expire()
-        if key not in self._store:
+    def _live(self, key: str, now: float) -> tuple[Any, float, int] | None:
+        entry = self._store.get(key)
+        if entry is not None and entry[1] <= now:
+            self._remove(key)
+            self.expirations += 1
             return None
-        return self._store[key][0]
+        return entry
+
+    def _expire_some(self, now: float) -> None:
+        heap = self._deadlines
+        for _ in range(self._EXPIRE_PER_WRITE):
+            if not heap or heap[0][0] > now:
+                break
+            deadline, key = heapq.heappop(heap)
+            entry = self._store.get(key)
+            if entry is not None and entry[1] == deadline:  # not overwritten since
+                self._remove(key)
+                self.expirations += 1
+        # Overwrites leave stale heap items behind; rebuild before they dominate
+        if len(heap) > 2 * len(self._store) + 64:
+            self._deadlines = [(d, k) for k, (_, d, _) in self._store.items()]
+            heapq.heapify(self._deadlines)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            if entry is None:
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, key: str, value: Any, deadline: float, size: int) -> None:
+        # Caller holds the lock; _evict() restores the bounds afterwards
+        if key in self._store:
+            self._remove(key)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return  # would evict everything else and still not fit
+        self._store[key] = (value, deadline, size)
+        self._bytes += size
+        heapq.heappush(self._deadlines, (deadline, key))
+
+    def _evict(self) -> None:
+        while len(self._store) > self._max_entries or (
+            self._max_bytes is not None and self._bytes > self._max_bytes
+        ):
+            self._remove(next(iter(self._store)))
+            self.evictions += 1
 
     def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
-        ttl = ttl_seconds or self._default_ttl
-        self._store[key] = (value, time.monotonic() + ttl)
+        ttl = self._default_ttl if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            self.delete(key)  # expired on arrival
+            return
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        now = time.monotonic()
+        with self._lock:
+            self._put(key, value, now + ttl, size)
+            self._expire_some(now)
+            self._evict()
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        found = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                entry = self._live(key, now)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._store.move_to_end(key)
+                self.hits += 1
+                found[key] = entry[0]
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl_seconds: int | None = None) -> None:
+        if not items:
+            return
+        ttl = self._default_ttl if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            with self._lock:
+                for key in items:
+                    if key in self._store:
+                        self._remove(key)
+            return
+        sized = self._max_bytes is not None
+        entries = [(k, v, self._sizeof(v) if sized else 0) for k, v in items.items()]
+        now = time.monotonic()
+        with self._lock:
+            for key, value, size in entries:
+                self._put(key, value, now + ttl, size)
+            self._expire_some(now)
+            self._evict()
 
     def delete(self, key: str) -> None:
-        self._store.pop(key, None)
+        with self._lock:
+            if key in self._store:
+                self._remove(key)
 
     def exists(self, key: str) -> bool:
-        self._expire()
-        return key in self._store
+        with self._lock:
+            return self._live(key, time.monotonic()) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._store)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            reads = self.hits + self.misses
+            return {
+                "entries": len(self._store),
+                "bytes": self._bytes if self._max_bytes is not None else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / reads, 4) if reads else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
 
 
 class RedisCache(ICache):
-    """Prod: Redis backend."""
-
-    def __init__(self, url: str, key_prefix: str = "", default_ttl: int = 300):
-        import redis
-        self._client = redis.from_url(url, decode_responses=True)
+    """Prod: Redis backend.
+
+    Values are stored as bytes through CacheCodec (type-tagged, msgpack if installed,
+    zlib above compress_min_bytes). get_many is one MGET and set_many one pipelined
+    round-trip of SET ... EX commands. Pass `client` to use an existing redis.Redis (or a
+    compatible stand-in such as fakeredis) instead of connecting to `url`.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        key_prefix: str = "",
+        default_ttl: int = 300,
+        codec: CacheCodec | None = None,
+        client: Any = None,
+    ):
+        if client is None:
+            import redis
+            client = redis.from_url(url)
+        self._client = client
         self._prefix = key_prefix.rstrip(":") + ":" if key_prefix else ""
         self._default_ttl = default_ttl
+        self._codec = codec or CacheCodec()
 
     def _key(self, key: str) -> str:
         return f"{self._prefix}{key}"
 
     def get(self, key: str) -> Any | None:
-        import json
         raw = self._client.get(self._key(key))
-        if raw is None:
-            return None
-        try:
-            return json.loads(raw)
-        except Exception:
-            return raw
+        return None if raw is None else self._codec.decode(raw)
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        raws = self._client.mget([self._key(k) for k in keys])
+        return {k: self._codec.decode(raw) for k, raw in zip(keys, raws) if raw is not None}
 
     def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
-        import json
-        ttl = ttl_seconds or self._default_ttl
-        serialized = json.dumps(value) if not isinstance(value, (str, int, float)) else value
-        self._client.setex(self._key(key), ttl, str(serialized))
+        ttl = self._default_ttl if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            self._client.delete(self._key(key))  # SET rejects EX 0
+            return
+        self._client.set(self._key(key), self._codec.encode(value), ex=ttl)
+
+    def set_many(self, items: dict[str, Any], ttl_seconds: int | None = None) -> None:
+        if not items:
+            return
+        ttl = self._default_ttl if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            self._client.delete(*(self._key(k) for k in items))
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._key(key), self._codec.encode(value), ex=ttl)
+        pipe.execute()
 
     def delete(self, key: str) -> None:
         self._client.delete(self._key(key))
@@ -74,9 +237,14 @@ class RedisCache(ICache):
         return bool(self._client.exists(self._key(key)))
 
 
-def create_cache(backend: str, url: str | None = None, key_prefix: str = "", ttl_seconds: int = 300) -> ICache:
-    if backend == "memory":
-        return MemoryCache(default_ttl=ttl_seconds)
+def create_cache(
+    backend: str,
+    url: str | None = None,
+    key_prefix: str = "",
+    ttl_seconds: int = 300,
+    max_entries: int = 10_000,
+    max_bytes: int | None = None,
+) -> ICache:
     if backend == "redis" and url:
         return RedisCache(url, key_prefix=key_prefix, default_ttl=ttl_seconds)
-    return MemoryCache(default_ttl=ttl_seconds)
+    return MemoryCache(default_ttl=ttl_seconds, max_entries=max_entries, max_bytes=max_bytes)
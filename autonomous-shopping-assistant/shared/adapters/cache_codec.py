@@ -0,0 +1,99 @@
+"""Binary value codec for remote caches (RedisCache).
+
+Every encoded value starts with one tag byte naming its type, so values round-trip
+exactly: "1" stays a str and 1 stays an int, bytes stay bytes, Decimal stays
+Decimal. Containers go through msgpack when it is installed, else compact JSON;
+the tag records which, so readers decode either. Payloads of at least
+`compress_min_bytes` are zlib-compressed when that actually shrinks them (high bit
+of the tag).
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from decimal import Decimal
+from typing import Any
+
+# Tags are control bytes (0x01-0x08, or 0x81-0x88 compressed) so they can never be
+# the first byte of a value written as text by the previous RedisCache
+_STR, _BYTES, _INT, _FLOAT, _BOOL, _DECIMAL, _JSON, _MSGPACK = range(1, 9)
+_COMPRESSED = 0x80
+
+
+def _msgpack():
+    try:
+        import msgpack  # optional: faster, smaller than JSON for nested values
+        return msgpack
+    except ImportError:
+        return None
+
+
+class CacheCodec:
+    """encode(value) -> bytes and decode(bytes) -> value, type-exact for scalars."""
+
+    def __init__(self, use_msgpack: bool | None = None, compress_min_bytes: int | None = 1024, level: int = 1):
+        mp = _msgpack()
+        self._msgpack = mp if (use_msgpack is None or use_msgpack) else None
+        if use_msgpack and mp is None:
+            raise ImportError("msgpack is not installed")
+        self._compress_min = compress_min_bytes
+        self._level = level
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, str):
+            tag, body = _STR, value.encode()
+        elif isinstance(value, (bytes, bytearray)):
+            tag, body = _BYTES, bytes(value)
+        elif isinstance(value, bool):  # before int: bool is an int subclass
+            tag, body = _BOOL, b"1" if value else b"0"
+        elif isinstance(value, int):
+            tag, body = _INT, str(value).encode()
+        elif isinstance(value, float):
+            tag, body = _FLOAT, repr(value).encode()
+        elif isinstance(value, Decimal):
+            tag, body = _DECIMAL, str(value).encode()
+        elif self._msgpack is not None:
+            tag, body = _MSGPACK, self._msgpack.packb(value, use_bin_type=True)
+        else:
+            tag, body = _JSON, json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+        if self._compress_min is not None and len(body) >= self._compress_min:
+            packed = zlib.compress(body, self._level)
+            if len(packed) < len(body):
+                return bytes((tag | _COMPRESSED,)) + packed
+        return bytes((tag,)) + body
+
+    def decode(self, raw: bytes) -> Any:
+        if not raw:
+            return ""
+        tag, body = raw[0] & ~_COMPRESSED, raw[1:]
+        if not _STR <= tag <= _MSGPACK:
+            return _decode_legacy(raw)
+        if raw[0] & _COMPRESSED:
+            body = zlib.decompress(body)
+        if tag == _STR:
+            return body.decode()
+        if tag == _BYTES:
+            return body
+        if tag == _INT:
+            return int(body)
+        if tag == _FLOAT:
+            return float(body)
+        if tag == _BOOL:
+            return body == b"1"
+        if tag == _DECIMAL:
+            return Decimal(body.decode())
+        if tag == _JSON:
+            return json.loads(body)
+        mp = self._msgpack or _msgpack()  # _MSGPACK
+        if mp is None:
+            raise ValueError("cached value is msgpack-encoded but msgpack is not installed")
+        return mp.unpackb(body, raw=False)
+
+
+def _decode_legacy(raw: bytes) -> Any:
+    """Untagged values written by the old str/JSON RedisCache (expire within one TTL)."""
+    text = raw.decode()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
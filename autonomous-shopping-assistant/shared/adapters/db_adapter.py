@@ -0,0 +1,73 @@
+"""Database engine adapter: one pooled SQLAlchemy engine per database URL per process."""
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+from shared.config.settings import DatabaseSettings
+
+_engines: dict[str, Engine] = {}
+_lock = threading.Lock()
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    """Any spelling of an in-memory SQLite URL, driver-qualified ones included."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _configure_sqlite(engine: Engine, busy_timeout_ms: int) -> None:
+    """WAL lets readers run alongside the single writer; busy_timeout makes
+    concurrent writers wait for the lock instead of failing with 'database is locked'."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.close()
+
+
+def _build_engine(url: str, settings: DatabaseSettings) -> Engine:
+    kwargs: dict = {"echo": settings.echo, "pool_pre_ping": settings.pool_pre_ping}
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if _is_memory_sqlite(url):
+            # In-memory DB lives in a single connection; share it across threads
+            kwargs["poolclass"] = StaticPool
+            return create_engine(url, **kwargs)
+        kwargs["pool_size"] = settings.pool_size
+        engine = create_engine(url, **kwargs)
+        _configure_sqlite(engine, settings.sqlite_busy_timeout_ms)
+        return engine
+    kwargs["pool_size"] = settings.pool_size
+    return create_engine(url, **kwargs)
+
+
+def get_engine(url: str, settings: DatabaseSettings | None = None) -> Engine:
+    """Return the process-wide engine for url, creating it (and its pool) on first use."""
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _build_engine(url, settings or DatabaseSettings(url=url))
+            _engines[url] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection (service shutdown, tests)."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
@@ -0,0 +1,289 @@
+"""HTTP client adapter: one pooled keep-alive client per upstream base URL per process."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Any
+
+import httpx
+
+from shared.utils.correlation import get_correlation_id, get_request_id
+
+_IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS"})
+_RETRY_STATUS = frozenset({502, 503, 504})
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  (optional: httpx[http2])
+        return True
+    except ImportError:
+        return False
+
+
+def _with_request_ids(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Forward the current request's X-Request-ID / X-Correlation-ID unless the caller set them."""
+    request_id = get_request_id()
+    if not request_id:
+        return kwargs
+    headers = httpx.Headers(kwargs.get("headers"))
+    headers.setdefault("x-request-id", request_id)
+    headers.setdefault("x-correlation-id", get_correlation_id())
+    return {**kwargs, "headers": headers}
+
+
+class HttpClientMetrics:
+    """Request counters and recent latencies for one upstream (thread-safe)."""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._latencies_ms: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+
+    def record(self, elapsed_ms: float, ok: bool, retries: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += 0 if ok else 1
+            self.retries += retries
+            self._latencies_ms.append(elapsed_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._latencies_ms)
+            stats = {"requests": self.requests, "errors": self.errors, "retries": self.retries}
+        if samples:
+            stats["p50_ms"] = round(samples[len(samples) // 2], 2)
+            stats["p99_ms"] = round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2)
+            stats["avg_ms"] = round(sum(samples) / len(samples), 2)
+        return stats
+
+
+class _RetryingClientBase:
+    """Shared by the sync and async pooled clients: limits, metrics, and retries with
+    full-jitter exponential backoff (idempotent methods only; transport errors and
+    502/503/504). Subclasses own the httpx client(s) and the send loop."""
+
+    def __init__(
+        self,
+        base_url: str,
+        retries: int = 2,
+        backoff_base_seconds: float = 0.05,
+        backoff_max_seconds: float = 1.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self._retries = retries
+        self._backoff_base = backoff_base_seconds
+        self._backoff_max = backoff_max_seconds
+        self.metrics = HttpClientMetrics()
+
+    @staticmethod
+    def _limits(max_connections: int, max_keepalive_connections: int) -> httpx.Limits:
+        return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+
+    def _max_retries(self, method: str) -> int:
+        return self._retries if method in _IDEMPOTENT else 0
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * (2 ** attempt)))
+
+    def _record(self, start: float, ok: bool, attempt: int) -> None:
+        self.metrics.record((time.perf_counter() - start) * 1000, ok, attempt)
+
+    def _final(self, resp: httpx.Response, start: float, attempt: int, max_retries: int) -> bool:
+        """True (and recorded) when resp is the answer; False when it should be retried."""
+        if resp.status_code in _RETRY_STATUS and attempt < max_retries:
+            return False
+        self._record(start, resp.status_code < 500, attempt)
+        return True
+
+    def _give_up(self, start: float, attempt: int, max_retries: int) -> bool:
+        """After a transport error: True (and recorded) when out of retries."""
+        if attempt < max_retries:
+            return False
+        self._record(start, False, attempt)
+        return True
+
+
+class PooledHttpClient(_RetryingClientBase):
+    """Long-lived httpx.Client for one base URL: connection limits, keep-alive, metrics,
+    and retries with full-jitter exponential backoff for idempotent requests."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        retries: int = 2,
+        backoff_base_seconds: float = 0.05,
+        backoff_max_seconds: float = 1.0,
+    ):
+        super().__init__(base_url, retries, backoff_base_seconds, backoff_max_seconds)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=self._limits(max_connections, max_keepalive_connections),
+            http2=_http2_available(),
+        )
+
+    def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        method = method.upper()
+        max_retries = self._max_retries(method)
+        kwargs = _with_request_ids(kwargs)
+        start = time.perf_counter()
+        for attempt in itertools.count():
+            try:
+                resp = self._client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if self._give_up(start, attempt, max_retries):
+                    raise
+            else:
+                if self._final(resp, start, attempt, max_retries):
+                    return resp
+                resp.close()
+            time.sleep(self._backoff(attempt))
+
+    def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        return self.request("POST", path, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_clients: dict[str, PooledHttpClient] = {}
+_lock = threading.Lock()
+
+
+class AsyncPooledHttpClient(_RetryingClientBase):
+    """httpx.AsyncClient counterpart of PooledHttpClient for async services.
+
+    Bound to the event loop it is first used on: create and close it within the
+    service lifespan (see close_async_http_clients).
+
+    httpcore rescans every pooled connection on each request and response, so one
+    pool's CPU cost per request grows with its size. For many concurrent
+    connections (a proxy), pool_shards splits max_connections across that many
+    smaller clients, used round-robin."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        retries: int = 2,
+        backoff_base_seconds: float = 0.05,
+        backoff_max_seconds: float = 1.0,
+        pool_shards: int = 1,
+    ):
+        super().__init__(base_url, retries, backoff_base_seconds, backoff_max_seconds)
+        limits = self._limits(
+            math.ceil(max_connections / pool_shards), math.ceil(max_keepalive_connections / pool_shards)
+        )
+        self._shards = [
+            httpx.AsyncClient(base_url=self.base_url, timeout=timeout, limits=limits, http2=_http2_available())
+            for _ in range(pool_shards)
+        ]
+        self._next_shard = itertools.cycle(self._shards).__next__
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        method = method.upper()
+        max_retries = self._max_retries(method)
+        kwargs = _with_request_ids(kwargs)
+        start = time.perf_counter()
+        for attempt in itertools.count():
+            try:
+                resp = await self._next_shard().request(method, path, **kwargs)
+            except httpx.TransportError:
+                if self._give_up(start, attempt, max_retries):
+                    raise
+            else:
+                if self._final(resp, start, attempt, max_retries):
+                    return resp
+                await resp.aclose()
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def stream(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send without reading the body (no retries): the caller iterates and must aclose() it.
+
+        Latency is recorded when the response headers arrive.
+        """
+        start = time.perf_counter()
+        try:
+            client = self._next_shard()
+            request = client.build_request(method.upper(), path, **_with_request_ids(kwargs))
+            resp = await client.send(request, stream=True)
+        except httpx.TransportError:
+            self._record(start, False, 0)
+            raise
+        self._record(start, resp.status_code < 500, 0)
+        return resp
+
+    async def aclose(self) -> None:
+        for client in self._shards:
+            await client.aclose()
+
+
+def get_http_client(base_url: str, **kwargs: Any) -> PooledHttpClient:
+    """Process-wide client for base_url (kwargs only apply on first creation)."""
+    key = base_url.rstrip("/")
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = PooledHttpClient(key, **kwargs)
+        return client
+
+
+_async_clients: dict[str, AsyncPooledHttpClient] = {}
+
+
+def get_async_http_client(base_url: str, **kwargs: Any) -> AsyncPooledHttpClient:
+    """Process-wide async client for base_url (kwargs only apply on first creation)."""
+    key = base_url.rstrip("/")
+    client = _async_clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = _async_clients[key] = AsyncPooledHttpClient(key, **kwargs)
+        return client
+
+
+def http_client_metrics() -> dict[str, dict[str, Any]]:
+    clients = {**_clients, **_async_clients}
+    return {url: c.metrics.snapshot() for url, c in list(clients.items())}
+
+
+def close_http_clients() -> None:
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+async def close_async_http_clients() -> None:
+    with _lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -1,12 +1,20 @@
 """Logging adapters: console (dev), json (prod)."""
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
+import random
 import sys
-from typing import Any
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, TextIO
 
 from shared.ports.logging_port import ILogger
+from shared.utils.correlation import correlation_id_var, request_id_var
 
 
 class ConsoleLogger(ILogger):
@@ -24,8 +32,14 @@ class ConsoleLogger(ILogger):
         self._context: dict[str, Any] = {}
 
     def _msg(self, message: str, **kwargs: Any) -> str:
-        if kwargs or self._context:
-            extra = {**self._context, **kwargs}
+        extra = {**self._context, **kwargs}
+        request_id = request_id_var.get()
+        if request_id and "request_id" not in extra:
+            extra["request_id"] = request_id
+            correlation_id = correlation_id_var.get()
+            if correlation_id and correlation_id != request_id and "correlation_id" not in extra:
+                extra["correlation_id"] = correlation_id
+        if extra:
             return f"{message} | {extra}"
         return message
 
@@ -51,50 +65,198 @@ class ConsoleLogger(ILogger):
         return child
 
 
+# One encoder for every line (json.dumps with options builds a new one per call)
+_encode = json.JSONEncoder(default=str, separators=(",", ":"), ensure_ascii=False).encode
+
+
+class _LineWriter:
+    """Writes log lines from a background thread, in batches, out of a bounded ring buffer.
+
+    Callers only append to the buffer. When the stream cannot keep up the oldest
+    unwritten lines are overwritten, and the next batch reports how many were lost.
+    """
+
+    def __init__(self, stream: TextIO, capacity: int = 10_000):
+        self._stream = stream
+        self._capacity = capacity
+        self._buf: deque[str] = deque(maxlen=capacity)
+        self._cond = threading.Condition(threading.Lock())
+        self._writing = False
+        self._thread: threading.Thread | None = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._dropped_unreported = 0
+        atexit.register(self.flush)
+        # A forked child has the buffer but not the thread: start a new one on first write
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        self._buf = deque(maxlen=self._capacity)  # the parent writes its own lines
+        self._dropped_unreported = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+        self._writing = False
+
+    def write(self, line: str) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            if len(self._buf) == self._capacity:
+                self.dropped += 1
+                self._dropped_unreported += 1
+            elif not self._buf:
+                self._cond.notify_all()
+            self._buf.append(line)
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buf:
+                    self._cond.wait()
+                lines, self._buf = self._buf, deque(maxlen=self._capacity)
+                dropped, self._dropped_unreported = self._dropped_unreported, 0
+                self._writing = True
+            data = "\n".join(lines) + "\n"
+            if dropped:
+                report = {"level": "WARNING", "logger": "logging", "message": "log buffer full, lines dropped", "dropped": dropped}
+                data = _encode(report) + "\n" + data
+            try:
+                self._stream.write(data)
+                self._stream.flush()
+            except (OSError, ValueError):
+                pass  # closed or broken stream: logging must not take the process down
+            with self._cond:
+                self._writing = False
+                self.written += len(lines) + bool(dropped)
+                self.batches += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Wait until buffered lines are written (used at exit and by tests/benchmarks)."""
+        with self._cond:
+            if self._thread is None:
+                return
+            self._cond.wait_for(lambda: not self._buf and not self._writing, timeout)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {"buffered": len(self._buf), "written": self.written, "dropped": self.dropped, "batches": self.batches}
+
+
+_writer_lock = threading.Lock()
+_stdout_writer: _LineWriter | None = None
+
+
+def get_log_writer(capacity: int = 10_000) -> _LineWriter:
+    """The process-wide stdout writer (capacity applies to the first call only)."""
+    global _stdout_writer
+    with _writer_lock:
+        if _stdout_writer is None:
+            _stdout_writer = _LineWriter(sys.stdout, capacity)
+        return _stdout_writer
+
+
+def _dumps_fields(fields: dict[str, Any]) -> str:
+    """',"k":v,...' for fields (empty string for none); non-JSON values via str()."""
+    if not fields:
+        return ""
+    return "," + _encode(fields)[1:-1]
+
+
 class JsonLogger(ILogger):
-    """Prod: structured JSON logs for aggregation."""
+    """Prod: structured JSON lines for aggregation, written by a background thread.
+
+    Calls below the level return before touching their arguments. Bound context is
+    serialized once, in with_context(). The request and correlation ids of the current
+    request (shared.utils.correlation) are added to every line. DEBUG lines are kept
+    with probability debug_sample_rate.
+    """
     _LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+    _RESERVED = frozenset({"ts", "level", "logger", "message"})
 
-    def __init__(self, name: str, level: str = "INFO"):
+    def __init__(
+        self,
+        name: str,
+        level: str = "INFO",
+        debug_sample_rate: float = 1.0,
+        writer: _LineWriter | None = None,
+    ):
         self._name = name
         self._level = self._LEVELS.get(level, 20)
+        self._debug_sample_rate = debug_sample_rate
+        self._writer = writer or get_log_writer()
+        self._logger_json = json.dumps(name)
         self._context: dict[str, Any] = {}
+        self._context_json = ""
+        self._context_overrides = False  # bound context replaces a built-in key
 
-    def _emit(self, level: str, message: str, **kwargs: Any) -> None:
-        if self._LEVELS.get(level, 0) < self._level:
-            return
-        payload = {
-            "level": level,
-            "logger": self._name,
-            "message": message,
-            **self._context,
-            **kwargs,
-        }
-        print(json.dumps(payload), file=sys.stdout, flush=True)
+    def _emit(self, level: str, message: str, fields: dict[str, Any]) -> None:
+        if self._context_overrides or (
+            fields and (not self._RESERVED.isdisjoint(fields) or not self._context.keys().isdisjoint(fields))
+        ):
+            # Overrides of bound or built-in keys: merge as dicts so the line has no duplicate keys
+            merged = {"level": level, "logger": self._name, "message": message, **self._context, **fields}
+            ts = merged.pop("ts", None)
+            line = '{"ts":%s%s' % (_encode(ts) if ts is not None else "%.3f" % time.time(), _dumps_fields(merged))
+        else:
+            line = '{"ts":%.3f,"level":"%s","logger":%s,"message":%s%s%s' % (
+                time.time(), level, self._logger_json, _encode(message),
+                self._context_json, _dumps_fields(fields),
+            )
+        request_id = request_id_var.get()
+        if request_id and "request_id" not in fields and "request_id" not in self._context:
+            line += ',"request_id":%s' % _encode(request_id)
+            correlation_id = correlation_id_var.get()
+            if correlation_id and correlation_id != request_id and "correlation_id" not in fields:
+                line += ',"correlation_id":%s' % _encode(correlation_id)
+        self._writer.write(line + "}")
 
     def debug(self, message: str, **kwargs: Any) -> None:
-        self._emit("DEBUG", message, **kwargs)
+        if self._level > 10:
+            return
+        if self._debug_sample_rate < 1.0 and random.random() >= self._debug_sample_rate:
+            return
+        self._emit("DEBUG", message, kwargs)
 
     def info(self, message: str, **kwargs: Any) -> None:
-        self._emit("INFO", message, **kwargs)
+        if self._level <= 20:
+            self._emit("INFO", message, kwargs)
 
     def warning(self, message: str, **kwargs: Any) -> None:
-        self._emit("WARNING", message, **kwargs)
+        if self._level <= 30:
+            self._emit("WARNING", message, kwargs)
 
     def error(self, message: str, **kwargs: Any) -> None:
-        self._emit("ERROR", message, **kwargs)
+        self._emit("ERROR", message, kwargs)
 
     def exception(self, message: str, **kwargs: Any) -> None:
-        self._emit("ERROR", message, **kwargs)
+        if sys.exc_info()[0] is not None and "exc_info" not in kwargs:
+            kwargs["exc_info"] = traceback.format_exc()
+        self._emit("ERROR", message, kwargs)
 
     def with_context(self, **kwargs: Any) -> ILogger:
-        child = JsonLogger(self._name)
+        child = JsonLogger(self._name, debug_sample_rate=self._debug_sample_rate, writer=self._writer)
         child._level = self._level
         child._context = {**self._context, **kwargs}
+        child._context_json = _dumps_fields(child._context)
+        child._context_overrides = bool(child._context.keys() & self._RESERVED)
         return child
 
+    def flush(self) -> None:
+        self._writer.flush()
+
 
-def create_logger(service_name: str, format_type: str = "console", level: str = "DEBUG") -> ILogger:
+def create_logger(
+    service_name: str,
+    format_type: str = "console",
+    level: str = "DEBUG",
+    debug_sample_rate: float = 1.0,
+) -> ILogger:
     if format_type == "json":
-        return JsonLogger(service_name, level=level)
+        return JsonLogger(service_name, level=level, debug_sample_rate=debug_sample_rate)
     return ConsoleLogger(service_name, level=level)
@@ -2,49 +2,292 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+import inspect
+import json
+import threading
+import time
+from abc import abstractmethod
+from collections import deque
+from dataclasses import dataclass
 from typing import Any, Callable, Awaitable
+from uuid import uuid4
 
-from shared.ports.queue_port import IMessageQueue
+from shared.ports.queue_port import IMessageQueue, IQueueConsumer
 
 
 class MemoryQueue(IMessageQueue):
-    """Dev: in-memory queues; subscribe runs handler in same process."""
+    """Dev: bounded in-process queues drained by asyncio worker tasks.
 
-    def __init__(self):
-        self._queues: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        self._handlers: dict[str, list[Callable]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+    Behaves like RedisQueue: publish enqueues an envelope {id, attempts, ts, body},
+    subscribe registers the handler, and consumer() returns a worker pool that retries
+    failed messages and dead-letters them after max_attempts. Each queue holds at most
+    max_size messages. When it is full, overflow="block" makes publishers wait
+    (`await publish_async()`, or publish() from a thread other than the consumer's
+    loop) and overflow="drop" discards the message and counts it.
+    """
+
+    _FULL_POLL_SECONDS = 0.01
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        overflow: str = "block",
+        max_attempts: int = 5,
+        dead_letter_size: int = 1000,
+    ):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"overflow must be 'block' or 'drop', not {overflow!r}")
+        self.max_size = max_size
+        self.overflow = overflow
+        self.max_attempts = max_attempts
+        self._dead_letter_size = dead_letter_size
+        self._channels: dict[str, _Channel] = {}
+        # Guards _channels and, per channel, the consumer loop and the jobs queue swap
+        self._lock = threading.Lock()
+
+    def _channel(self, queue_name: str) -> "_Channel":
+        with self._lock:
+            ch = self._channels.get(queue_name)
+            if ch is None:
+                ch = self._channels[queue_name] = _Channel(
+                    jobs=asyncio.Queue(maxsize=self.max_size),
+                    dead=deque(maxlen=self._dead_letter_size),
+                )
+            return ch
 
     def publish(self, queue_name: str, message: dict[str, Any]) -> None:
-        self._queues[queue_name].append(message)
-        for h in self._handlers[queue_name]:
-            try:
-                result = h(message)
-                if asyncio.iscoroutine(result):
-                    asyncio.create_task(result)
-            except Exception:
-                pass
+        ch = self._channel(queue_name)
+        env = {"id": uuid4().hex, "attempts": 0, "ts": time.time(), "body": message}
+        with self._lock:  # a consumer starting now moves ch.jobs under the same lock
+            loop = _running(ch.loop)
+            if loop is None or _on_loop(loop):
+                queued = self._offer(ch, env)
+        if loop is not None and not _on_loop(loop):
+            # asyncio.Queue is not thread-safe: hand the put to the consumer's loop
+            asyncio.run_coroutine_threadsafe(self._put(ch, env), loop).result()
+        elif queued is None:
+            # Blocking here would stall the loop that drains the queue
+            raise asyncio.QueueFull(f"queue {queue_name!r} is full; use await publish_async() for backpressure")
+
+    async def publish_async(self, queue_name: str, message: dict[str, Any]) -> bool:
+        """Enqueue, waiting for space (overflow="block"); False if dropped (overflow="drop").
+
+        With no consumer running, a full queue is polled until a consumer starts or
+        room appears: waiting on ch.jobs itself would bind it to this loop, and the
+        consumer replaces it when it starts.
+        """
+        ch = self._channel(queue_name)
+        env = {"id": uuid4().hex, "attempts": 0, "ts": time.time(), "body": message}
+        while True:
+            with self._lock:
+                loop = _running(ch.loop)
+                if loop is None:
+                    queued = self._offer(ch, env)
+            if loop is None:
+                if queued is not None:
+                    return queued
+                await asyncio.sleep(self._FULL_POLL_SECONDS)
+            elif _on_loop(loop):
+                return await self._put(ch, env)
+            else:
+                return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._put(ch, env), loop))
+
+    def _offer(self, ch: "_Channel", env: dict[str, Any]) -> bool | None:
+        """put_nowait: True if queued, False if dropped, None if full and overflow="block"."""
+        try:
+            ch.jobs.put_nowait(env)
+        except asyncio.QueueFull:
+            if self.overflow == "block":
+                return None
+            ch.dropped += 1
+            return False
+        ch.published += 1
+        ch.high_water = max(ch.high_water, ch.jobs.qsize())
+        return True
+
+    async def _put(self, ch: "_Channel", env: dict[str, Any]) -> bool:
+        # On the consumer's loop, which owns ch.jobs
+        if self.overflow == "drop":
+            return self._offer(ch, env)
+        await ch.jobs.put(env)
+        ch.published += 1
+        ch.high_water = max(ch.high_water, ch.jobs.qsize())
+        return True
 
     def subscribe(
         self,
         queue_name: str,
         handler: Callable[[dict[str, Any]], Awaitable[None] | None],
     ) -> None:
-        self._handlers[queue_name].append(handler)
+        self._channel(queue_name).handler = handler
+
+    def consumer(self, queue_name: str, concurrency: int = 16, drain_timeout: float = 30.0) -> "MemoryQueueConsumer":
+        ch = self._channel(queue_name)
+        if ch.handler is None:
+            raise KeyError(f"no handler subscribed for queue {queue_name!r}")
+        return MemoryQueueConsumer(self, queue_name, ch, concurrency=concurrency, drain_timeout=drain_timeout)
+
+    def dead_letters(self, queue_name: str) -> list[dict[str, Any]]:
+        return list(self._channel(queue_name).dead)
+
+    def stats(self, queue_name: str) -> dict[str, Any]:
+        ch = self._channel(queue_name)
+        return {
+            "depth": ch.jobs.qsize(),
+            "max_size": self.max_size,
+            "high_water": ch.high_water,
+            "published": ch.published,
+            "dropped": ch.dropped,
+            "dead_letters": len(ch.dead),
+        }
+
+
+@dataclass
+class _Channel:
+    jobs: asyncio.Queue
+    dead: deque
+    handler: Callable | None = None
+    loop: asyncio.AbstractEventLoop | None = None  # set while a consumer runs
+    published: int = 0
+    dropped: int = 0
+    high_water: int = 0
+
+
+def _running(loop: asyncio.AbstractEventLoop | None) -> asyncio.AbstractEventLoop | None:
+    return loop if loop is not None and loop.is_running() else None
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+async def _call(handler: Callable, body: Any) -> None:
+    """Await coroutine handlers on the loop; run plain functions in the default thread pool."""
+    if inspect.iscoroutinefunction(handler):
+        await handler(body)
+        return
+    result = await asyncio.to_thread(handler, body)
+    if inspect.isawaitable(result):
+        await result
+
+
+class QueueMetrics:
+    """Consumer counters plus recent end-to-end (publish -> ack) and handler latencies."""
+
+    def __init__(self, window: int = 4096):
+        self._lock = threading.Lock()
+        self._e2e_ms: deque[float] = deque(maxlen=window)
+        self._handler_ms: deque[float] = deque(maxlen=window)
+        self._started = time.monotonic()
+        self.counts = {"processed": 0, "failed": 0, "retried": 0, "dead_lettered": 0, "expired": 0}
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += n
+
+    def record(self, e2e_ms: float, handler_ms: float) -> None:
+        with self._lock:
+            self.counts["processed"] += 1
+            self._e2e_ms.append(e2e_ms)
+            self._handler_ms.append(handler_ms)
+
+    @staticmethod
+    def _pcts(samples: list[float], prefix: str) -> dict[str, float]:
+        if not samples:
+            return {}
+        samples.sort()
+        return {
+            f"{prefix}_p50_ms": round(samples[len(samples) // 2], 2),
+            f"{prefix}_p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self.counts)
+            e2e, handler = list(self._e2e_ms), list(self._handler_ms)
+            elapsed = time.monotonic() - self._started
+        stats["throughput_per_s"] = round(stats["processed"] / elapsed, 1) if elapsed else 0.0
+        stats.update(self._pcts(e2e, "e2e"))
+        stats.update(self._pcts(handler, "handler"))
+        return stats
+
+
+# Move up to ARGV[1] messages queue -> processing and lease each until ARGV[2]
+_POP_LUA = """
+local out = {}
+for i = 1, tonumber(ARGV[1]) do
+  local v = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+  if not v then break end
+  redis.call('ZADD', KEYS[3], ARGV[2], v)
+  out[#out + 1] = v
+end
+return out
+"""
+
+# Take ARGV[1] out of processing (only if still there) and push ARGV[2] to the queue
+# (ARGV[3] == '0') or the dead-letter list (ARGV[3] == '1')
+_RETRY_LUA = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[1])
+if ARGV[3] == '1' then
+  redis.call('LPUSH', KEYS[4], ARGV[2])
+else
+  redis.call('LPUSH', KEYS[3], ARGV[2])
+end
+return 1
+"""
 
 
 class RedisQueue(IMessageQueue):
-    """Prod: Redis list as queue (LPUSH/BRPOP)."""
+    """Prod: reliable Redis list queue (at-least-once).
+
+    publish LPUSHes a JSON envelope {id, attempts, ts, body}. Consumers BLMOVE it to
+    "<queue>:processing" and lease it in the "<queue>:inflight" sorted set (score =
+    visibility deadline). Ack removes it from both. A failed handler, or a lease
+    that expires (consumer died or the handler overran visibility_timeout), puts it
+    back on the queue with attempts + 1, or on "<queue>:dead" after max_attempts.
+    Needs Redis >= 6.2 (BLMOVE/LMOVE).
+    """
 
-    def __init__(self, url: str):
-        import redis
-        self._client = redis.from_url(url, decode_responses=True)
+    def __init__(
+        self,
+        url: str | None = None,
+        visibility_timeout: float = 30.0,
+        max_attempts: int = 5,
+        client: Any = None,
+        async_client_factory: Callable[[], Any] | None = None,
+    ):
+        if client is None:
+            import redis
+            client = redis.from_url(url, decode_responses=True)
+        self._client = client
+        self._url = url
+        self._async_client_factory = async_client_factory
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
         self._handlers: dict[str, Callable] = {}
 
+    @staticmethod
+    def processing_key(queue_name: str) -> str:
+        return f"{queue_name}:processing"
+
+    @staticmethod
+    def inflight_key(queue_name: str) -> str:
+        return f"{queue_name}:inflight"
+
+    @staticmethod
+    def dead_letter_key(queue_name: str) -> str:
+        return f"{queue_name}:dead"
+
     def publish(self, queue_name: str, message: dict[str, Any]) -> None:
-        import json
-        self._client.lpush(queue_name, json.dumps(message))
+        self._client.lpush(queue_name, _envelope(message))
+
+    def publish_many(self, queue_name: str, messages: list[dict[str, Any]]) -> None:
+        if messages:
+            self._client.lpush(queue_name, *[_envelope(m) for m in messages])
 
     def subscribe(
         self,
@@ -53,27 +296,304 @@ class RedisQueue(IMessageQueue):
     ) -> None:
         self._handlers[queue_name] = handler
 
-    def blocking_consume(self, queue_name: str, timeout: int = 5) -> None:
-        """Block and process messages (run in worker process)."""
-        import json
+    def stats(self, queue_name: str) -> dict[str, Any]:
+        with self._client.pipeline(transaction=False) as pipe:
+            pipe.llen(queue_name)
+            pipe.llen(self.processing_key(queue_name))
+            pipe.llen(self.dead_letter_key(queue_name))
+            depth, processing, dead = pipe.execute()
+        return {"depth": depth, "processing": processing, "dead_letters": dead}
+
+    def async_client(self) -> Any:
+        if self._async_client_factory is not None:
+            return self._async_client_factory()
+        import redis.asyncio
+        return redis.asyncio.from_url(self._url, decode_responses=True)
+
+    def consumer(self, queue_name: str, concurrency: int = 16, batch_size: int = 32) -> "RedisQueueConsumer":
+        handler = self._handlers.get(queue_name)
+        if handler is None:
+            raise KeyError(f"no handler subscribed for queue {queue_name!r}")
+        return RedisQueueConsumer(self, queue_name, handler, concurrency=concurrency, batch_size=batch_size)
+
+    def blocking_consume(self, queue_name: str, timeout: int = 5, concurrency: int = 16) -> None:
+        """Block and process messages (run in worker process) until interrupted."""
+        consumer = self.consumer(queue_name, concurrency=concurrency)
+        consumer.block_timeout = timeout
+        asyncio.run(consumer.run())
+
+
+def _envelope(message: dict[str, Any], attempts: int = 0, msg_id: str | None = None, ts: float | None = None) -> str:
+    return json.dumps({"id": msg_id or uuid4().hex, "attempts": attempts, "ts": ts or time.time(), "body": message})
+
+
+def _parse(raw: str) -> dict[str, Any] | None:
+    """Envelope for raw; bare JSON messages (older publishers) are wrapped, non-JSON is None."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and "body" in data and "id" in data:
+        return data
+    return {"id": None, "attempts": 0, "body": data}
+
+
+class _LoopConsumer(IQueueConsumer):
+    """start()/stop() for consumers that work in `async run()` until stop() is called."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._stopping: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @abstractmethod
+    async def run(self) -> None: ...
+
+    def stop(self) -> None:
+        """Stop taking work, finish what is in hand, and (if started with start()) join the thread."""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def start(self) -> None:
+        """Run the consumer on its own event loop in a background thread."""
+        started = threading.Event()
+
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._stopping = asyncio.Event()
+            # Signal once run() has reached its first await, i.e. has finished setting up
+            self._loop.call_soon(started.set)
+            await self.run()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(main(),), name=f"consumer-{self._name}", daemon=True)
+        self._thread.start()
+        started.wait()
+
+
+class MemoryQueueConsumer(_LoopConsumer):
+    """`concurrency` worker tasks draining one MemoryQueue queue on one event loop.
+
+    stop() lets the workers finish the messages already queued (up to drain_timeout);
+    whatever is left stays queued for the next consumer.
+    """
+
+    def __init__(
+        self,
+        queue: MemoryQueue,
+        queue_name: str,
+        channel: _Channel,
+        concurrency: int = 16,
+        drain_timeout: float = 30.0,
+    ):
+        super().__init__(queue_name)
+        self._queue = queue
+        self._ch = channel
+        self._concurrency = concurrency
+        self.drain_timeout = drain_timeout
+        self.metrics = QueueMetrics()
+
+    async def run(self) -> None:
+        ch = self._ch
+        self._loop = asyncio.get_running_loop()
+        # asyncio.Queue binds to the first loop that waits on it: move pending messages
+        # to a fresh queue so a consumer on a new loop (another asyncio.run) can use it.
+        # Under the queue lock, so a publish() from another thread lands in one or the other
+        with self._queue._lock:
+            if _running(ch.loop) is not None:
+                raise RuntimeError(f"queue {self._name!r} already has a running consumer")
+            fresh: asyncio.Queue = asyncio.Queue(maxsize=self._queue.max_size)
+            while not ch.jobs.empty():
+                fresh.put_nowait(ch.jobs.get_nowait())
+            ch.jobs, ch.loop = fresh, self._loop
+        if self._stopping is None:
+            self._stopping = asyncio.Event()
+        workers = [asyncio.create_task(self._work(fresh)) for _ in range(self._concurrency)]
+        try:
+            await self._stopping.wait()
+        finally:
+            try:
+                await asyncio.wait_for(fresh.join(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            with self._queue._lock:
+                ch.loop = None
+            self._stopping = None
+
+    async def _work(self, jobs: asyncio.Queue) -> None:
+        while True:
+            env = await jobs.get()
+            try:
+                while not await self._handle(env):
+                    try:
+                        jobs.put_nowait(env)
+                        break
+                    except asyncio.QueueFull:
+                        continue  # no room to requeue: retry it here rather than block the pool
+            finally:
+                jobs.task_done()
+
+    async def _handle(self, env: dict[str, Any]) -> bool:
+        """Run the handler once; True when the message is done (acked or dead-lettered)."""
+        start = time.perf_counter()
+        try:
+            await _call(self._ch.handler, env["body"])
+        except Exception as e:
+            self.metrics.count("failed")
+            env["attempts"] += 1
+            env["error"] = repr(e)
+            if env["attempts"] >= self._queue.max_attempts:
+                self._ch.dead.append(env)
+                self.metrics.count("dead_lettered")
+                return True
+            self.metrics.count("retried")
+            return False
+        self.metrics.record((time.time() - env["ts"]) * 1000, (time.perf_counter() - start) * 1000)
+        return True
+
+
+class RedisQueueConsumer(_LoopConsumer):
+    """Async worker pool for one RedisQueue on one event loop.
+
+    A fetcher BLMOVEs one message (blocking up to block_timeout), then leases up to
+    batch_size - 1 more in one script call, and feeds a bounded asyncio.Queue that
+    `concurrency` worker tasks drain. Coroutine handlers are awaited on the loop;
+    plain functions run in the default thread pool. A reaper requeues expired
+    leases. start()/stop() run it on a background thread; `await run()` runs it on
+    the caller's loop.
+    """
+
+    def __init__(
+        self,
+        queue: RedisQueue,
+        queue_name: str,
+        handler: Callable[[dict[str, Any]], Awaitable[None] | None],
+        concurrency: int = 16,
+        batch_size: int = 32,
+        block_timeout: float = 1.0,
+    ):
+        super().__init__(queue_name)
+        self._queue = queue
+        self._handler = handler
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self.block_timeout = block_timeout
+        self._keys = (queue_name, queue.processing_key(queue_name), queue.inflight_key(queue_name))
+        self._dead = queue.dead_letter_key(queue_name)
+        self.metrics = QueueMetrics()
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self._stopping is None:
+            self._stopping = asyncio.Event()
+        redis = self._queue.async_client()
+        self._pop = redis.register_script(_POP_LUA)
+        self._retry = redis.register_script(_RETRY_LUA)
+        # Bounded prefetch: the fetcher stalls instead of leasing more than workers can start
+        jobs: asyncio.Queue[str] = asyncio.Queue(maxsize=self._concurrency * 2)
+        workers = [asyncio.create_task(self._work(redis, jobs)) for _ in range(self._concurrency)]
+        fetcher = asyncio.create_task(self._fetch(redis, jobs))
+        reaper = asyncio.create_task(self._reap(redis))
+        try:
+            await self._stopping.wait()
+        finally:
+            fetcher.cancel()
+            reaper.cancel()
+            await asyncio.gather(fetcher, reaper, return_exceptions=True)
+            await jobs.join()  # finish and ack what was already leased
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await redis.aclose()
+            self._stopping = None
+
+    async def _fetch(self, redis: Any, jobs: asyncio.Queue) -> None:
+        queue_key, processing, inflight = self._keys
         while True:
-            _, raw = self._client.brpop(queue_name, timeout=timeout)
-            if not raw:
+            started = time.monotonic()
+            raw = await redis.blmove(queue_key, processing, self.block_timeout, "RIGHT", "LEFT")
+            if raw is None:
+                # A server (or stand-in) that answers an empty BLMOVE without blocking
+                # must not turn this loop into a busy spin that starves the workers
+                if time.monotonic() - started < self.block_timeout / 2:
+                    await asyncio.sleep(min(0.05, self.block_timeout))
                 continue
+            deadline = time.time() + self._queue.visibility_timeout
+            await redis.zadd(inflight, {raw: deadline})
+            batch = [raw]
+            if self._batch_size > 1:
+                batch += await self._pop(keys=list(self._keys), args=[self._batch_size - 1, deadline])
+            for item in batch:
+                await jobs.put(item)
+
+    async def _work(self, redis: Any, jobs: asyncio.Queue) -> None:
+        _, processing, inflight = self._keys
+        while True:
+            raw = await jobs.get()
             try:
-                msg = json.loads(raw)
-                h = self._handlers.get(queue_name)
-                if h:
-                    result = h(msg)
-                    if asyncio.iscoroutine(result):
-                        asyncio.run(result)
-            except Exception:
-                pass
+                env = _parse(raw)
+                if env is None:  # not JSON: retrying cannot help
+                    await self._requeue(redis, raw, {"body": raw, "attempts": self._queue.max_attempts}, "undecodable")
+                    continue
+                start = time.perf_counter()
+                try:
+                    await _call(self._handler, env["body"])
+                except Exception as e:
+                    self.metrics.count("failed")
+                    await self._requeue(redis, raw, env, error=repr(e))
+                    continue
+                handler_ms = (time.perf_counter() - start) * 1000
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.lrem(processing, 1, raw)
+                    pipe.zrem(inflight, raw)
+                    await pipe.execute()
+                self.metrics.record((time.time() - env.get("ts", time.time())) * 1000, handler_ms)
+            finally:
+                jobs.task_done()
+
+    async def _requeue(self, redis: Any, raw: str, env: dict[str, Any], error: str | None = None) -> bool:
+        attempts = env.get("attempts", 0) + 1
+        dead = attempts >= self._queue.max_attempts
+        new = {**env, "attempts": attempts}
+        if error is not None:
+            new["error"] = error
+        moved = await self._retry(keys=[self._keys[1], self._keys[2], self._keys[0], self._dead],
+                                  args=[raw, json.dumps(new), "1" if dead else "0"])
+        if moved:
+            self.metrics.count("dead_lettered" if dead else "retried")
+        return bool(moved)
+
+    async def _reap(self, redis: Any) -> None:
+        _, processing, inflight = self._keys
+        interval = max(0.05, min(self._queue.visibility_timeout / 2, 5.0))
+        while True:
+            await asyncio.sleep(interval)
+            # Lease messages moved by a consumer that died before its ZADD
+            tail = await redis.lrange(processing, -100, -1)
+            if tail:
+                deadline = time.time() + self._queue.visibility_timeout
+                await redis.zadd(inflight, {raw: deadline for raw in tail}, nx=True)
+            for raw in await redis.zrangebyscore(inflight, "-inf", time.time(), start=0, num=100):
+                if await self._requeue(redis, raw, _parse(raw) or {"body": raw, "attempts": self._queue.max_attempts}):
+                    self.metrics.count("expired")
+                else:
+                    await redis.zrem(inflight, raw)  # acked meanwhile: drop the stale lease
 
 
-def create_queue(backend: str, url: str | None = None) -> IMessageQueue:
-    if backend == "memory":
-        return MemoryQueue()
+def create_queue(
+    backend: str,
+    url: str | None = None,
+    visibility_timeout: float = 30.0,
+    max_attempts: int = 5,
+    max_size: int = 1000,
+    overflow: str = "block",
+) -> IMessageQueue:
     if backend == "redis" and url:
-        return RedisQueue(url)
-    return MemoryQueue()
+        return RedisQueue(url, visibility_timeout=visibility_timeout, max_attempts=max_attempts)
+    return MemoryQueue(max_size=max_size, overflow=overflow, max_attempts=max_attempts)
@@ -1,8 +1,9 @@
 """Central settings: dev vs prod for DB, cache, logging, auth, queue."""
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
 from shared.config.base import get_environment, get_env, is_dev, is_prod, Environment
 
@@ -13,6 +14,7 @@ class DatabaseSettings:
     echo: bool = False
     pool_size: int = 5
     pool_pre_ping: bool = True
+    sqlite_busy_timeout_ms: int = 5000
 
     @classmethod
     def for_environment(cls, env: Environment) -> "DatabaseSettings":
@@ -38,6 +40,8 @@ class CacheSettings:
     url: str | None = None
     ttl_seconds: int = 300
     key_prefix: str = "shopping"
+    max_entries: int = 10_000  # memory backend only
+    max_bytes: int | None = None  # memory backend only
 
     @classmethod
     def for_environment(cls, env: Environment) -> "CacheSettings":
@@ -53,6 +57,24 @@ class CacheSettings:
             url=None,
             ttl_seconds=60,
             key_prefix="shopping:dev",
+            max_entries=int(get_env("CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(get_env("CACHE_MAX_BYTES", "0")) or None,
+        )
+
+
+@dataclass
+class HistoryCacheSettings:
+    """Memory service: in-process cache of each session's latest turns."""
+
+    max_turns: int = 50  # per session; 0 disables the cache
+    max_sessions: int = 10_000
+
+    @classmethod
+    def for_environment(cls, env: Environment) -> "HistoryCacheSettings":
+        # Same in dev and prod; set HISTORY_CACHE_TURNS=0 for several workers without session affinity
+        return cls(
+            max_turns=int(get_env("HISTORY_CACHE_TURNS", "50")),
+            max_sessions=int(get_env("HISTORY_CACHE_SESSIONS", "10000")),
         )
 
 
@@ -61,6 +83,7 @@ class LoggingSettings:
     level: str
     format: str  # "console" | "json"
     include_trace: bool = True
+    debug_sample_rate: float = 1.0  # json: fraction of DEBUG lines kept
 
     @classmethod
     def for_environment(cls, env: Environment) -> "LoggingSettings":
@@ -69,6 +92,7 @@ class LoggingSettings:
                 level=get_env("LOG_LEVEL", "INFO"),
                 format="json",
                 include_trace=True,
+                debug_sample_rate=float(get_env("LOG_DEBUG_SAMPLE_RATE", "1.0")),
             )
         return cls(
             level=get_env("LOG_LEVEL", "DEBUG"),
@@ -82,6 +106,8 @@ class AuthSettings:
     backend: str  # "mock" | "jwt"
     jwt_secret: str | None = None
     jwt_algorithm: str = "HS256"
+    jwt_cache_entries: int = 10_000  # verified tokens kept until exp; 0 verifies every request
+    jwt_cache_max_ttl_seconds: float = 300.0  # cap for tokens without exp (and revocation delay)
     mock_default_tenant: str | None = None
     mock_default_user: str | None = None
 
@@ -92,6 +118,7 @@ class AuthSettings:
                 backend="jwt",
                 jwt_secret=get_env("JWT_SECRET", "change-me-in-prod"),
                 jwt_algorithm="HS256",
+                jwt_cache_entries=int(get_env("JWT_CACHE_ENTRIES", "10000")),
             )
         return cls(
             backend="mock",
@@ -105,6 +132,10 @@ class QueueSettings:
     backend: str  # "memory" | "redis" | "rabbitmq"
     url: str | None = None
     default_queue: str = "default"
+    visibility_timeout_seconds: float = 30.0  # redis: lease before an unacked job is redelivered
+    max_attempts: int = 5  # deliveries before a job is dead-lettered
+    max_size: int = 1000  # memory backend only: messages held per queue
+    overflow: str = "block"  # memory backend only: "block" (backpressure) | "drop"
 
     @classmethod
     def for_environment(cls, env: Environment) -> "QueueSettings":
@@ -118,6 +149,8 @@ class QueueSettings:
             backend="memory",
             url=None,
             default_queue="shopping:dev",
+            max_size=int(get_env("QUEUE_MAX_SIZE", "1000")),
+            overflow=get_env("QUEUE_OVERFLOW", "block"),
         )
 
 
@@ -127,6 +160,9 @@ class AppSettings:
     service_name: str = "shopping"
     database: DatabaseSettings = field(default_factory=lambda: DatabaseSettings.for_environment(get_environment()))
     cache: CacheSettings = field(default_factory=lambda: CacheSettings.for_environment(get_environment()))
+    history_cache: HistoryCacheSettings = field(
+        default_factory=lambda: HistoryCacheSettings.for_environment(get_environment())
+    )
     logging: LoggingSettings = field(default_factory=lambda: LoggingSettings.for_environment(get_environment()))
     auth: AuthSettings = field(default_factory=lambda: AuthSettings.for_environment(get_environment()))
     queue: QueueSettings = field(default_factory=lambda: QueueSettings.for_environment(get_environment()))
@@ -139,11 +175,45 @@ class AppSettings:
             service_name=service_name,
             database=DatabaseSettings.for_environment(env),
             cache=CacheSettings.for_environment(env),
+            history_cache=HistoryCacheSettings.for_environment(env),
             logging=LoggingSettings.for_environment(env),
             auth=AuthSettings.for_environment(env),
             queue=QueueSettings.for_environment(env),
         )
 
 
+_settings_lock = threading.Lock()
+_settings_cache: dict[str, AppSettings] = {}
+_reload_hooks: list[Callable[[], None]] = []
+
+
 def get_settings(service_name: str = "shopping") -> AppSettings:
-    return AppSettings.load(service_name=service_name)
+    """Settings for service_name, read from the environment once per process.
+
+    The instance is shared: treat it as read-only. Call reload_settings() to re-read.
+    """
+    settings = _settings_cache.get(service_name)
+    if settings is None:
+        with _settings_lock:
+            settings = _settings_cache.get(service_name)
+            if settings is None:
+                settings = _settings_cache[service_name] = AppSettings.load(service_name=service_name)
+    return settings
+
+
+def on_settings_reload(hook: Callable[[], None]) -> Callable[[], None]:
+    """Register hook to run after reload_settings() (e.g. to drop objects built from settings)."""
+    _reload_hooks.append(hook)
+    return hook
+
+
+def reload_settings() -> None:
+    """Re-read ENV, .env.{env} and the environment on the next get_settings(), then run hooks.
+
+    Modules that copied values at import (service config, engines, pools) keep them.
+    """
+    with _settings_lock:
+        _settings_cache.clear()
+        get_environment.cache_clear()
+    for hook in list(_reload_hooks):
+        hook()
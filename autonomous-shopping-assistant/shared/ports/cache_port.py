@@ -14,10 +14,24 @@ class ICache(ABC):
     def get(self, key: str) -> Any | None: ...
 
     @abstractmethod
-    def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None: ...
+    def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
+        """ttl_seconds=None uses the adapter's default TTL; 0 or less expires at once (removes key)."""
 
     @abstractmethod
     def delete(self, key: str) -> None: ...
 
     @abstractmethod
     def exists(self, key: str) -> bool: ...
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Values for the keys that are present (adapters override with one round-trip)."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl_seconds: int | None = None) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl_seconds)
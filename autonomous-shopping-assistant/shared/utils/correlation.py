@@ -19,3 +19,40 @@ def get_request_id() -> str:
 
 def get_correlation_id() -> str:
     return correlation_id_var.get() or get_request_id()
+
+
+class CorrelationIdMiddleware:
+    """ASGI middleware: takes X-Request-ID / X-Correlation-ID (or makes a request id),
+    sets them for the request's context (loggers pick them up), and echoes X-Request-ID
+    as the response's only X-Request-ID header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = correlation_id = ""
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif name == b"x-correlation-id":
+                correlation_id = value.decode("latin-1")
+        request_id = request_id or uuid.uuid4().hex
+        rid_token = request_id_var.set(request_id)
+        cid_token = correlation_id_var.set(correlation_id or request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                # Replace, not append: a handler (or a relayed upstream) may have set one already
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"x-request-id"]
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(rid_token)
+            correlation_id_var.reset(cid_token)
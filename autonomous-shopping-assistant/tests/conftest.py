@@ -0,0 +1,7 @@
+"""Shared pytest setup: run from the project root (`python -m pytest -q tests`)."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
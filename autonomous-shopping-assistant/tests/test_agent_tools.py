@@ -0,0 +1,82 @@
+"""ProcessRequestUseCase._run_tools: concurrent reads, mutations alone and in order."""
+import threading
+import time
+from uuid import UUID
+
+from shared.domain.value_objects import TenantId, UserId
+from services.agent.application.ports import IToolGateway, ILLMProvider
+from services.agent.application.use_cases import ProcessRequestUseCase
+from services.agent.domain.entities import ToolCall
+
+TENANT = TenantId(UUID("00000000-0000-0000-0000-000000000001"))
+USER = UserId(UUID("00000000-0000-0000-0000-000000000002"))
+
+
+class RecordingGateway(IToolGateway):
+    """Sleeps per tool and records (tool, start, end)."""
+
+    def __init__(self, latency_s: dict[str, float]):
+        self._latency = latency_s
+        self.calls: list[tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    def execute(self, tenant_id, user_id, tool, args):
+        start = time.monotonic()
+        time.sleep(self._latency.get(tool, 0.01))
+        if tool == "broken":
+            raise RuntimeError("boom")
+        with self._lock:
+            self.calls.append((tool, start, time.monotonic()))
+        return {"tool": tool}
+
+
+class NoLLM(ILLMProvider):
+    def chat(self, messages, tools=None, context=None):
+        return "", []
+
+
+def _run(gateway, calls, timeout=1.0):
+    return ProcessRequestUseCase(NoLLM(), gateway, tool_timeout_seconds=timeout)._run_tools(TENANT, USER, calls)
+
+
+def test_reads_run_concurrently_and_keep_order():
+    gateway = RecordingGateway({"product_search": 0.2, "get_cart": 0.2})
+    start = time.monotonic()
+    results = _run(gateway, [ToolCall("product_search", {}), ToolCall("get_cart", {}), ToolCall("broken", {})])
+    assert time.monotonic() - start < 0.35
+    assert [r["tool"] for r in results] == ["product_search", "get_cart", "broken"]
+    assert results[2]["error"] == "boom"
+
+
+def test_timed_out_read_is_an_error():
+    results = _run(RecordingGateway({"product_search": 0.3}), [ToolCall("product_search", {})], timeout=0.05)
+    assert "timed out" in results[0]["error"]
+
+
+def test_timed_out_mutation_is_unknown_and_blocks_later_stages():
+    gateway = RecordingGateway({"add_to_cart": 0.3, "create_order": 0.01, "get_cart": 0.01})
+    calls = [ToolCall("add_to_cart", {}), ToolCall("get_cart", {}), ToolCall("create_order", {})]
+    results = _run(gateway, calls, timeout=0.05)
+    assert results[0]["outcome"] == "unknown" and "error" not in results[0]
+    assert results[1]["result"] == {"tool": "get_cart"} and results[2]["result"] == {"tool": "create_order"}
+    spans = {tool: (start, end) for tool, start, end in gateway.calls}
+    # Nothing after the slow mutation started before it had finished
+    assert spans["get_cart"][0] >= spans["add_to_cart"][1]
+    assert spans["create_order"][0] >= spans["get_cart"][1]
+
+
+def test_tools_run_in_the_callers_request_context():
+    import contextvars
+
+    from shared.utils.correlation import get_request_id, set_request_context
+
+    class IdGateway(RecordingGateway):
+        def execute(self, tenant_id, user_id, tool, args):
+            return {"request_id": get_request_id()}
+
+    def in_request():
+        set_request_context("req-1")
+        return _run(IdGateway({}), [ToolCall("product_search", {}), ToolCall("get_cart", {})])
+
+    results = contextvars.copy_context().run(in_request)
+    assert [r["result"]["request_id"] for r in results] == ["req-1", "req-1"]
@@ -0,0 +1,97 @@
+"""JwtAuthProvider: verified-token cache lifetime and provider reuse."""
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+
+from shared.adapters import auth_adapter
+from shared.adapters.auth_adapter import JwtAuthProvider, get_auth_provider
+from shared.config.settings import AuthSettings, reload_settings
+from shared.domain.exceptions import UnauthorizedError
+
+SECRET = "test-secret-at-least-32-bytes-long"
+CLAIMS = {"tenant_id": "00000000-0000-0000-0000-000000000001", "sub": "00000000-0000-0000-0000-000000000002"}
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(auth_adapter.time, "time", lambda: now[0])
+    return now
+
+
+def _provider(**kw) -> tuple[JwtAuthProvider, list[str]]:
+    provider = JwtAuthProvider(SECRET, **kw)
+    verified: list[str] = []
+    verify = provider._verify
+
+    def counting(token):
+        verified.append(token)
+        return verify(token)
+
+    provider._verify = counting
+    return provider, verified
+
+
+def _token(**claims) -> str:
+    return jwt.encode({**CLAIMS, **claims}, SECRET, algorithm="HS256")
+
+
+def test_cached_until_token_expiry(clock):
+    provider, verified = _provider(cache_max_ttl=300)
+    token = _token(exp=int(clock[0]) + 60)
+    first = provider.authenticate(None, {"authorization": f"Bearer {token}"})
+    assert provider.authenticate(token) is first and len(verified) == 1
+    clock[0] += 59
+    provider.authenticate(token)
+    assert len(verified) == 1
+    clock[0] += 2  # past exp: verified again (PyJWT's own clock still accepts it)
+    provider.authenticate(token)
+    assert len(verified) == 2
+    assert provider.verified.stats() == {"entries": 1, "hits": 2, "misses": 2}
+
+
+def test_tokens_without_exp_are_capped_at_max_ttl(clock):
+    provider, verified = _provider(cache_max_ttl=30)
+    token = _token()
+    provider.authenticate(token)
+    clock[0] += 29
+    provider.authenticate(token)
+    clock[0] += 2
+    provider.authenticate(token)
+    assert len(verified) == 2
+
+
+def test_failures_are_not_cached_and_expired_tokens_rejected():
+    provider, verified = _provider()
+    bad = jwt.encode(CLAIMS, "other-secret-at-least-32-bytes-long", algorithm="HS256")
+    for _ in range(2):
+        with pytest.raises(UnauthorizedError):
+            provider.authenticate(bad)
+    assert len(verified) == 2 and provider.verified.stats()["entries"] == 0
+    with pytest.raises(UnauthorizedError, match="expired"):
+        provider.authenticate(_token(exp=int(time.time()) - 10))
+
+
+def test_cache_is_bounded_and_can_be_disabled():
+    provider, verified = _provider(cache_entries=2)
+    tokens = [_token(n=n) for n in range(3)]
+    for token in tokens + tokens[1:]:
+        provider.authenticate(token)
+    assert len(verified) == 3 and provider.verified.stats()["entries"] == 2
+    provider.authenticate(tokens[0])  # evicted as least recently used
+    assert len(verified) == 4
+    uncached, verified = _provider(cache_entries=0)
+    uncached.authenticate(tokens[0])
+    uncached.authenticate(tokens[0])
+    assert uncached.verified is None and len(verified) == 2
+
+
+def test_providers_are_reused_until_settings_reload():
+    settings = AuthSettings(backend="jwt", jwt_secret=SECRET)
+    provider = get_auth_provider(settings)
+    assert get_auth_provider(AuthSettings(backend="jwt", jwt_secret=SECRET)) is provider
+    assert get_auth_provider(AuthSettings(backend="jwt", jwt_secret="other")) is not provider
+    reload_settings()
+    assert get_auth_provider(settings) is not provider
@@ -0,0 +1,148 @@
+"""MemoryCache LRU/TTL bounds and CacheCodec round-trips."""
+import threading
+from decimal import Decimal
+
+import pytest
+
+from shared.adapters import cache_adapter
+from shared.adapters.cache_adapter import MemoryCache, RedisCache
+from shared.adapters.cache_codec import CacheCodec
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_adapter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=3)
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    assert cache.get("a") == 1  # a is now the most recent
+    cache.set("d", 4)
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b", "c", "d"]) == {"a": 1, "c": 3, "d": 4}
+    cache.set_many({"e": 5, "f": 6})
+    assert sorted(cache.get_many(list("abcdef"))) == ["d", "e", "f"]
+    assert cache.stats()["evictions"] == 3
+
+
+def test_memory_cache_bounds_bytes():
+    cache = MemoryCache(max_bytes=10)
+    cache.set_many({"a": "xxxx", "b": "yyyy"})
+    cache.set("c", "zzzz")
+    assert cache.get_many(["a", "b", "c"]) == {"b": "yyyy", "c": "zzzz"}
+    cache.set("big", "x" * 11)
+    assert not cache.exists("big")
+    assert cache.stats()["bytes"] == 8
+
+
+def test_memory_cache_expires_entries(clock):
+    cache = MemoryCache(default_ttl=10)
+    cache.set("short", 1, ttl_seconds=5)
+    cache.set_many({"a": 1, "b": 2})
+    clock[0] += 5
+    assert cache.get("short") is None
+    assert cache.get_many(["a", "b"]) == {"a": 1, "b": 2}
+    cache.set("a", 3)  # overwrite restarts the TTL
+    clock[0] += 5
+    # Writes sweep expired keys without waiting for a read
+    cache.set("c", 4)
+    assert len(cache) == 2
+    assert cache.get("a") == 3 and cache.get("b") is None
+    assert cache.stats()["expirations"] == 2
+
+
+def test_memory_cache_evicts_by_recency_under_byte_pressure():
+    cache = MemoryCache(max_bytes=12)
+    cache.set_many({"a": "aaaa", "b": "bbbb", "c": "cccc"})
+    assert cache.get("a") == "aaaa"  # b is now least recently used
+    cache.set("d", "dddddd")
+    assert cache.get_many(["a", "b", "c", "d"]) == {"a": "aaaa", "d": "dddddd"}
+    cache.set("a", "aa")  # overwrites release the old size
+    assert cache.stats()["bytes"] == 8 and len(cache) == 2
+
+
+@pytest.mark.parametrize("ttl", [0, -1])
+def test_memory_cache_non_positive_ttl_expires_at_once(clock, ttl):
+    cache = MemoryCache(default_ttl=60)
+    cache.set_many({"a": 1, "b": 2})
+    cache.set("a", 3, ttl_seconds=ttl)
+    cache.set_many({"b": 4, "c": 5}, ttl_seconds=ttl)
+    assert cache.get_many(["a", "b", "c"]) == {} and len(cache) == 0
+    cache.set("d", 6, ttl_seconds=None)  # None still means the default
+    clock[0] += 59
+    assert cache.get("d") == 6
+
+
+def test_memory_cache_explicit_ttl_is_not_replaced_by_the_default(clock):
+    cache = MemoryCache(default_ttl=60)
+    cache.set("one", 1, ttl_seconds=1)
+    cache.set_many({"two": 2}, ttl_seconds=1)
+    clock[0] += 1
+    assert cache.get("one") is None and cache.get("two") is None
+
+
+def test_memory_cache_stays_bounded_under_concurrent_writers():
+    cache = MemoryCache(max_entries=50, max_bytes=400)
+    sizes = []
+
+    def writer(n):
+        for i in range(500):
+            cache.set(f"{n}:{i}", "x" * (i % 12))
+            if i % 50 == 0:
+                cache.set_many({f"{n}:m{i}:{j}": "y" * 5 for j in range(10)})
+            sizes.append(len(cache))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = cache.stats()
+    assert max(sizes) <= 50 and stats["entries"] <= 50 and stats["bytes"] <= 400
+
+
+def test_redis_cache_non_positive_ttl_deletes():
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisCache(key_prefix="t", default_ttl=60, client=fakeredis.FakeRedis())
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    cache.set("a", 9, ttl_seconds=0)
+    cache.set_many({"b": 9, "c": 9}, ttl_seconds=0)
+    assert cache.get_many(["a", "b", "c"]) == {}
+    cache.set("d", 1, ttl_seconds=5)
+    assert 0 < cache._client.ttl("t:d") <= 5
+
+
+_VALUES = [
+    "", "1", "héllo", 1, -(2 ** 70), 0.1, float("inf"), True, False,
+    Decimal("19.99"), b"\x00\xffbin", {"a": [1, "1", None, {"b": 2.5}]}, [1, 2, "x"], None,
+]
+
+
+@pytest.mark.parametrize("use_msgpack", [False, None])
+@pytest.mark.parametrize("value", _VALUES, ids=repr)
+def test_codec_round_trips_exactly(use_msgpack, value):
+    codec = CacheCodec(use_msgpack=use_msgpack)
+    decoded = codec.decode(codec.encode(value))
+    assert decoded == value and type(decoded) is type(value)
+
+
+def test_codec_compresses_large_payloads_and_reads_legacy_text():
+    codec = CacheCodec(use_msgpack=False, compress_min_bytes=64)
+    value = {"items": ["same product title"] * 50}
+    raw = codec.encode(value)
+    assert raw[0] & 0x80 and len(raw) < 200
+    assert codec.decode(raw) == value
+    # Written by the untagged str/JSON RedisCache
+    assert codec.decode(b'{"a": 1}') == {"a": 1}
+    assert codec.decode(b"plain text") == "plain text"
+
+
+def test_redis_cache_batches_round_trip():
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisCache(key_prefix="t", client=fakeredis.FakeRedis())
+    cache.set_many({"a": "1", "b": 1, "c": {"d": [1.5]}})
+    assert cache.get_many(["a", "b", "c", "missing"]) == {"a": "1", "b": 1, "c": {"d": [1.5]}}
+    assert cache.exists("a") and not cache.exists("missing")
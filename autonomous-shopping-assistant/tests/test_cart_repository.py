@@ -0,0 +1,56 @@
+"""Cart lines: add_item upserts against the unique (cart_id, product_id) index."""
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from shared.domain.value_objects import ProductId, TenantId, UserId
+from services.commerce.infrastructure.persistence.models import CartItemModel
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+
+@pytest.fixture()
+def uow(tmp_path):
+    uow = CommerceUnitOfWork(f"sqlite:///{tmp_path / 'commerce.db'}")
+    uow.create_schema()
+    return uow
+
+
+def _add(uow, tenant, user, product, quantity, price="9.99"):
+    with uow.session() as s:
+        return uow.cart_repo(s).add_item(tenant, user, product, quantity, Decimal(price), "Mug")
+
+
+def test_add_item_sums_quantities_on_one_line(uow):
+    tenant, user, product = TenantId(uuid4()), UserId(uuid4()), ProductId(uuid4())
+    assert [i.quantity for i in _add(uow, tenant, user, product, 2).items] == [2]
+    cart = _add(uow, tenant, user, product, 3)
+    assert [(str(i.product_id), i.quantity) for i in cart.items] == [(str(product), 5)]
+    other = _add(uow, tenant, user, ProductId(uuid4()), 1)
+    assert sorted(i.quantity for i in other.items) == [1, 5]
+    with uow.session() as s:
+        reloaded = uow.cart_repo(s).get_or_create(tenant, user)
+        assert sorted(i.quantity for i in reloaded.items) == [1, 5]
+        assert s.query(CartItemModel).count() == 2
+
+
+def test_create_schema_merges_duplicate_lines_of_older_databases(tmp_path):
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    uow = CommerceUnitOfWork(url)
+    uow.create_schema()
+    tenant, user, product = TenantId(uuid4()), UserId(uuid4()), ProductId(uuid4())
+    cart_id = str(_add(uow, tenant, user, product, 1).cart_id)
+    with uow.session() as s:
+        # What a database from before the unique index could hold
+        s.execute(text("DROP INDEX uq_cart_items_cart_product"))
+        for quantity in (2, 4):
+            s.add(CartItemModel(
+                cart_id=cart_id, product_id=str(product), quantity=quantity,
+                unit_price=Decimal("9.99"), title="Mug",
+            ))
+    uow.create_schema()
+    with uow.session() as s:
+        rows = s.query(CartItemModel).filter_by(cart_id=cart_id).all()
+        assert [(r.product_id, r.quantity) for r in rows] == [(str(product), 7)]
+    assert [i.quantity for i in _add(uow, tenant, user, product, 1).items] == [8]
@@ -0,0 +1,219 @@
+"""Gateway CircuitBreaker transitions and how upstream errors reach it."""
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from shared.adapters.http_adapter import AsyncPooledHttpClient
+from services.gateway.application.ports import UpstreamTimeoutError, UpstreamUnavailableError
+from services.gateway.infrastructure.upstream import CircuitBreaker, HttpUpstreamClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold_and_fails_fast():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=10, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    breaker.record_success()  # consecutive failures only
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow() and breaker.rejected == 1
+    clock.now += 4
+    assert breaker.retry_after() == 6
+
+
+def test_half_open_trial_closes_or_reopens():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    # One trial at a time; the others are told to wait out the trial
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.retry_after() == 10
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.retry_after() == 0
+    assert breaker.snapshot() == {"state": "closed", "failures": 0, "rejected": 1}
+
+
+def test_half_open_trial_replaced_when_it_never_reports():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    clock.now += 5
+    assert not breaker.allow()
+    clock.now += 6
+    assert breaker.allow()
+    breaker.record_skipped()  # e.g. never got a connection: the next caller may try
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def _upstream(handler, **kw) -> HttpUpstreamClient:
+    upstream = HttpUpstreamClient("http://orchestration.test", breaker=CircuitBreaker(**kw))
+    pooled = AsyncPooledHttpClient(upstream._base)
+    pooled._shards = [httpx.AsyncClient(base_url=pooled.base_url, transport=httpx.MockTransport(handler))]
+    pooled._next_shard = lambda: pooled._shards[0]
+    upstream._client = lambda: pooled
+    return upstream
+
+
+def _raise(exc_type):
+    def handler(request):
+        raise exc_type("boom", request=request)
+
+    return handler
+
+
+def _post(upstream):
+    async def main():
+        resp = await upstream.post_sessions("t", b"{}", None)
+        await resp.close()
+        return resp
+
+    return asyncio.run(main())
+
+
+def test_pool_timeout_is_overload_not_an_upstream_failure():
+    upstream = _upstream(_raise(httpx.PoolTimeout), failure_threshold=1)
+    with pytest.raises(UpstreamUnavailableError) as e:
+        _post(upstream)
+    assert e.value.retry_after is not None
+    assert upstream.breaker.snapshot()["failures"] == 0 and upstream.breaker.state == "closed"
+
+
+@pytest.mark.parametrize("exc_type, error", [
+    (httpx.ReadTimeout, UpstreamTimeoutError),
+    (httpx.ConnectError, UpstreamUnavailableError),
+])
+def test_upstream_errors_open_the_circuit(exc_type, error):
+    upstream = _upstream(_raise(exc_type), failure_threshold=1, reset_timeout_seconds=30)
+    with pytest.raises(error):
+        _post(upstream)
+    assert upstream.breaker.state == "open"
+    with pytest.raises(UpstreamUnavailableError, match="circuit open") as e:
+        _post(upstream)
+    assert 29 < e.value.retry_after <= 30
+
+
+def test_failure_statuses_count_and_others_reset():
+    statuses = iter([503, 400, 502, 200])
+    upstream = _upstream(lambda request: httpx.Response(next(statuses)), failure_threshold=2)
+    assert [_post(upstream).status_code for _ in range(4)] == [503, 400, 502, 200]
+    assert upstream.breaker.state == "closed"
+
+
+def test_gateway_maps_upstream_errors_to_status(monkeypatch):
+    from services.gateway import main
+
+    class Failing:
+        def __init__(self, exc):
+            self.exc = exc
+
+        async def post_sessions(self, *args):
+            raise self.exc
+
+    cases = [
+        (UpstreamTimeoutError("slow"), 504, None),
+        (UpstreamUnavailableError("down"), 502, None),
+        (UpstreamUnavailableError("busy", retry_after=0.2), 503, "1"),
+    ]
+    client = TestClient(main.app)
+    for exc, status, retry_after in cases:
+        main.app.dependency_overrides[main.get_upstream] = lambda exc=exc: Failing(exc)
+        try:
+            resp = client.post(
+                "/v1/tenants/t/sessions", json={"message": {"text": "hi"}}, headers={"X-Request-ID": "rid-2"}
+            )
+        finally:
+            main.app.dependency_overrides.clear()
+        assert resp.status_code == status and resp.headers.get("retry-after") == retry_after
+        assert resp.headers["content-type"] == "application/json" and "detail" in resp.json()
+        assert resp.headers.get_list("x-request-id") == ["rid-2"]
+
+
+def test_gateway_relays_exactly_one_request_id():
+    from services.gateway import main
+
+    def handler(request):
+        # Orchestration echoes the id it was sent; the gateway sets its own
+        headers = {"Content-Type": "application/json", "X-Request-ID": request.headers.get("x-request-id", "up")}
+        return httpx.Response(200, headers=headers, stream=httpx.ByteStream(b'{"ok": true}'))  # unread, as relayed
+
+    upstream = _upstream(handler)
+    assert b"x-request-id" not in [k.lower() for k, _ in _post(upstream).headers]
+    main.app.dependency_overrides[main.get_upstream] = lambda: upstream
+    try:
+        client = TestClient(main.app)
+        resp = client.post("/v1/tenants/t/sessions", json={"message": {"text": "hi"}}, headers={"X-Request-ID": "rid-1"})
+        generated = client.post("/v1/tenants/t/sessions", json={"message": {"text": "hi"}})
+    finally:
+        main.app.dependency_overrides.clear()
+    assert resp.status_code == 200 and resp.json() == {"ok": True}
+    assert resp.headers.get_list("x-request-id") == ["rid-1"]
+    assert len(generated.headers.get_list("x-request-id")) == 1
+
+
+def test_gateway_relays_upstream_headers_and_encoding():
+    import gzip
+    import json
+
+    from services.gateway import main
+
+    seen = []
+
+    def handler(request):
+        encoding = request.headers.get("accept-encoding")
+        seen.append(encoding)
+        body = json.dumps({"ok": True}).encode()
+        headers = [
+            ("Content-Type", "application/json"),
+            ("Set-Cookie", "a=1; Path=/"),
+            ("Set-Cookie", "b=2; Path=/"),
+            ("X-Session-Id", "s-1"),
+            ("Connection", "keep-alive"),
+            ("Keep-Alive", "timeout=5"),
+        ]
+        if "gzip" in encoding:
+            body = gzip.compress(body)
+            headers.append(("Content-Encoding", "gzip"))
+        headers.append(("Content-Length", str(len(body))))
+        return httpx.Response(201, headers=headers, stream=httpx.ByteStream(body))
+
+    upstream = _upstream(handler)
+    _post(upstream)
+    assert seen == ["identity"]  # the gateway's own calls never ask for compression
+    main.app.dependency_overrides[main.get_upstream] = lambda: upstream
+    try:
+        client = TestClient(main.app)
+        responses = {
+            encoding: client.post(
+                "/v1/tenants/t/sessions", json={"message": {"text": "hi"}}, headers={"Accept-Encoding": encoding}
+            )
+            for encoding in ("identity", "gzip")
+        }
+    finally:
+        main.app.dependency_overrides.clear()
+    assert seen[1:] == ["identity", "gzip"]
+    for encoding, resp in responses.items():
+        assert resp.status_code == 201 and resp.json() == {"ok": True}
+        assert resp.headers.get_list("set-cookie") == ["a=1; Path=/", "b=2; Path=/"]
+        assert resp.headers["x-session-id"] == "s-1" and "keep-alive" not in resp.headers
+        assert resp.headers.get("content-encoding") == ("gzip" if encoding == "gzip" else None)
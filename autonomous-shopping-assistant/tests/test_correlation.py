@@ -0,0 +1,97 @@
+"""Request ids: set by CorrelationIdMiddleware, forwarded by the pooled clients, logged."""
+import asyncio
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from shared.adapters.http_adapter import AsyncPooledHttpClient, PooledHttpClient
+from shared.adapters.logging_adapter import ConsoleLogger
+from shared.utils.correlation import CorrelationIdMiddleware, set_request_context
+
+
+def _echo(request):
+    return httpx.Response(200, json={k: v for k, v in request.headers.items() if k.startswith("x-")})
+
+
+@pytest.fixture()
+def app():
+    upstream = PooledHttpClient("http://upstream.test")
+    upstream._client = httpx.Client(base_url=upstream.base_url, transport=httpx.MockTransport(_echo))
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware)
+
+    @app.get("/call")
+    def call():  # sync: runs in the thread pool, like the agent's routes
+        return upstream.get("/x").json()
+
+    return TestClient(app)
+
+
+def test_middleware_ids_reach_upstream_requests(app):
+    resp = app.get("/call", headers={"X-Request-ID": "req-1", "X-Correlation-ID": "flow-1"})
+    assert resp.headers["x-request-id"] == "req-1"
+    assert resp.json() == {"x-request-id": "req-1", "x-correlation-id": "flow-1"}
+    resp = app.get("/call")
+    generated = resp.headers["x-request-id"]
+    assert generated and resp.json() == {"x-request-id": generated, "x-correlation-id": generated}
+
+
+def test_middleware_replaces_a_request_id_set_by_the_handler():
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware)
+
+    @app.get("/own")
+    def own():
+        return JSONResponse({}, headers={"X-Request-ID": "from-handler"})
+
+    resp = TestClient(app).get("/own", headers={"X-Request-ID": "req-5"})
+    assert resp.headers.get_list("x-request-id") == ["req-5"]
+
+
+def test_async_client_forwards_ids_unless_set():
+    client = AsyncPooledHttpClient("http://upstream.test")
+    client._shards = [httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(_echo))]
+    client._next_shard = lambda: client._shards[0]
+
+    async def main():
+        assert (await client.get("/x")).json() == {}  # outside a request
+        set_request_context("req-2", "flow-2")
+        sent = (await client.get("/x")).json()
+        streamed = await client.stream("POST", "/x", headers={"X-Request-ID": "mine"})
+        await streamed.aread()
+        return sent, streamed.json()
+
+    sent, streamed = asyncio.run(main())
+    assert sent == {"x-request-id": "req-2", "x-correlation-id": "flow-2"}
+    assert streamed == {"x-request-id": "mine", "x-correlation-id": "flow-2"}
+
+
+@pytest.mark.parametrize("service", ["gateway", "orchestration", "agent", "commerce", "memory"])
+def test_every_service_echoes_request_id(service):
+    import importlib
+
+    app = importlib.import_module(f"services.{service}.main").app
+    resp = TestClient(app).get("/health", headers={"X-Request-ID": "req-3"})
+    assert resp.headers["x-request-id"] == "req-3"
+
+
+def test_console_logger_adds_ids(caplog):
+    logger = ConsoleLogger("test-correlation")
+
+    async def main():
+        logger.info("outside")
+        set_request_context("req-4", "flow-4")
+        logger.info("inside", n=1)
+        logger.with_context(request_id="bound").info("bound")
+
+    with caplog.at_level(logging.INFO, logger="test-correlation"):
+        asyncio.run(main())
+    assert [r.getMessage() for r in caplog.records] == [
+        "outside",
+        "inside | {'n': 1, 'request_id': 'req-4', 'correlation_id': 'flow-4'}",
+        "bound | {'request_id': 'bound'}",
+    ]
@@ -0,0 +1,118 @@
+"""Process-wide engines: one per database URL, SQLite configured for concurrency."""
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+
+from shared.adapters.db_adapter import dispose_engines, get_engine
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+
+@pytest.fixture(autouse=True)
+def _fresh_engines():
+    dispose_engines()
+    yield
+    dispose_engines()
+
+
+def test_one_engine_and_pool_per_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    engine = get_engine(url)
+    assert get_engine(url) is engine
+    assert get_engine(f"sqlite:///{tmp_path / 'other.db'}") is not engine
+    first, second = CommerceUnitOfWork(url), CommerceUnitOfWork(url)
+    assert first._engine is second._engine is engine
+    dispose_engines()
+    assert get_engine(url) is not engine
+
+
+def test_engines_created_once_under_concurrent_first_use(tmp_path):
+    url = f"sqlite:///{tmp_path / 'race.db'}"
+    barrier = threading.Barrier(8)
+    engines = []
+
+    def first_use():
+        barrier.wait()
+        engines.append(get_engine(url))
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(e) for e in engines}) == 1
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:", "sqlite+pysqlite:///:memory:"])
+def test_in_memory_sqlite_is_one_database_across_threads(url):
+    engine = get_engine(url)
+    assert isinstance(engine.pool, StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (n INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+    seen = []
+
+    def read():
+        with engine.connect() as conn:
+            seen.append(conn.execute(text("SELECT n FROM t")).scalar_one())
+
+    worker = threading.Thread(target=read)
+    worker.start()
+    worker.join()
+    assert seen == [1]
+
+
+def test_sqlite_files_use_wal_and_busy_timeout(tmp_path):
+    from shared.config.settings import DatabaseSettings
+
+    url = f"sqlite:///{tmp_path / 'wal.db'}"
+    engine = get_engine(url, DatabaseSettings(url=url, sqlite_busy_timeout_ms=1234))
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar_one() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar_one() == 1234
+
+
+def test_sqlite_concurrent_writers_wait_and_readers_do_not_block(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'busy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (n INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (-1)"))
+    errors = []
+
+    def write(worker: int):
+        try:
+            for i in range(25):
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO t VALUES (:n)"), {"n": worker * 100 + i})
+        except Exception as e:  # 'database is locked' without busy_timeout
+            errors.append(e)
+
+    # A reader sees the last committed state while a write transaction is open
+    with engine.connect() as writer:
+        writer.execute(text("BEGIN IMMEDIATE"))
+        writer.execute(text("INSERT INTO t VALUES (-2)"))
+        with engine.connect() as reader:
+            assert reader.execute(text("SELECT COUNT(*) FROM t")).scalar_one() == 1
+        writer.execute(text("COMMIT"))
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar_one() == 102
+
+
+def test_memory_unit_of_work_shares_the_engine_and_creates_schema_once(tmp_path):
+    from services.memory.infrastructure.persistence.unit_of_work import MemoryUnitOfWork
+
+    url = f"sqlite:///{tmp_path / 'memory.db'}"
+    uow = MemoryUnitOfWork(url)
+    assert MemoryUnitOfWork(url)._engine is uow._engine is get_engine(url)
+    uow.create_schema()
+    uow.create_schema()  # idempotent: safe on every startup
+    with uow._engine.connect() as conn:
+        tables = {r[0] for r in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+    assert {"user_memory", "session_turns"} <= tables
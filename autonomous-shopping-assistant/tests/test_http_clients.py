@@ -0,0 +1,65 @@
+"""Process-wide pooled HTTP clients and their owners across app restarts."""
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from shared.adapters.http_adapter import AsyncPooledHttpClient, PooledHttpClient, close_http_clients
+from services.agent.infrastructure.tools.http_tool_gateway import HttpToolGateway
+
+
+def test_tool_gateway_survives_lifespan_close():
+    gateway = HttpToolGateway("http://commerce.test", "http://memory.test")
+    before = gateway._commerce
+    close_http_clients()
+    after = gateway._commerce
+    assert after is not before and not after._client.is_closed
+    assert gateway._memory is gateway._memory
+
+
+def test_agent_app_restart_in_process():
+    from services.agent.infrastructure.http import routes
+    from services.agent.main import create_app
+
+    for _ in range(2):
+        with TestClient(create_app()):
+            gateway = routes.get_tool_gateway()
+            assert not gateway._commerce._client.is_closed
+
+
+def _flaky(statuses: list[int]):
+    """MockTransport handler answering the given statuses in turn; counts calls."""
+    calls = {"n": 0}
+
+    def handler(request):
+        calls["n"] += 1
+        return httpx.Response(statuses[min(calls["n"], len(statuses)) - 1], json={"ok": True})
+
+    return handler, calls
+
+
+def test_sync_client_retries_idempotent_only():
+    client = PooledHttpClient("http://upstream.test", retries=2, backoff_base_seconds=0)
+    handler, calls = _flaky([503, 503, 200])
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    assert client.get("/x").status_code == 200 and calls["n"] == 3
+    handler, calls = _flaky([503, 200])
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    assert client.post("/x").status_code == 503 and calls["n"] == 1
+    assert client.metrics.snapshot()["retries"] == 2
+
+
+def test_async_client_gives_up_after_retries():
+    client = AsyncPooledHttpClient("http://upstream.test", retries=1, backoff_base_seconds=0)
+    calls = {"n": 0}
+
+    def handler(request):
+        calls["n"] += 1
+        raise httpx.ConnectError("refused", request=request)
+
+    client._shards = [httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))]
+    client._next_shard = lambda: client._shards[0]
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(client.get("/x"))
+    assert calls["n"] == 2 and client.metrics.snapshot()["errors"] == 1
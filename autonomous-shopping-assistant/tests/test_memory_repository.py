@@ -0,0 +1,50 @@
+"""UserMemoryRepository.merge: one SQL upsert, same result as {**current, **patch}."""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from shared.domain.value_objects import TenantId, UserId
+from services.memory.infrastructure.persistence.models import Base
+from services.memory.infrastructure.persistence.repositories import UserMemoryRepository
+
+
+@pytest.fixture()
+def repo():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield UserMemoryRepository(session)
+    session.close()
+    engine.dispose()
+
+
+def _ids():
+    return TenantId(uuid4()), UserId(uuid4())
+
+
+def test_merge_creates_then_merges_shallowly(repo):
+    tenant, user = _ids()
+    current = {"a": {"x": 1, "y": 2}, "b": "1", "keep": [1, 2], "flag": True}
+    patch = {"a": {"x": 9}, "b": None, "flag": False, "new": "v"}
+    created = repo.merge(tenant, user, facts=current)
+    assert created.facts == current and created.preferences == {}
+    merged = repo.merge(tenant, user, facts=patch)
+    assert merged.facts == {**current, **patch}
+    assert repo.get(tenant, user).facts == {**current, **patch}
+
+
+def test_merge_touches_only_given_column(repo):
+    tenant, user = _ids()
+    repo.merge(tenant, user, facts={"size": "M"}, preferences={"color": "red"})
+    mem = repo.merge(tenant, user, preferences={"brand": "acme", "color": None})
+    assert mem.facts == {"size": "M"}
+    assert mem.preferences == {"color": None, "brand": "acme"}
+
+
+def test_merge_keys_sqlite_paths_cannot_quote(repo):
+    tenant, user = _ids()
+    repo.merge(tenant, user, facts={"a.b": 1, "$[0]": 2})
+    mem = repo.merge(tenant, user, facts={'say "hi"': {"n": 1}, "a.b": 3})
+    assert mem.facts == {"a.b": 3, "$[0]": 2, 'say "hi"': {"n": 1}}
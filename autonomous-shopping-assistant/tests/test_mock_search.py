@@ -0,0 +1,77 @@
+"""MockMultiStoreSearch: the inverted index returns what a linear scan of the catalog would."""
+import pytest
+
+from services.agent.infrastructure.external_search.mock_multi_store_search import (
+    _MOCK_STORES,
+    MockMultiStoreSearch,
+)
+
+CATALOG_SIZE = 3000
+
+
+@pytest.fixture(scope="module")
+def search():
+    return MockMultiStoreSearch.synthetic(CATALOG_SIZE, seed=7)
+
+
+def _scan(search, query, category=None, max_price=None):
+    """Indices of matching products in catalog order, the pre-index way: any query word
+    (longer than one character) is a substring of the title or category."""
+    words = [w for w in (query or "").lower().split() if len(w) > 1]
+    category_names = {code: name for name, code in search._cat_code.items()}
+    hits = []
+    for i, title in enumerate(search._titles):
+        product_category = category_names[int(search._cats[i])]
+        if words and not any(w in f"{title} {product_category}".lower() for w in words):
+            continue
+        if category is not None and product_category != category:
+            continue
+        if max_price is not None and search._base[i] > max_price:
+            continue
+        hits.append(i)
+    return hits
+
+
+def _expected_source_ids(search, products, limit_per_source):
+    ids = [f"{s['name']}:{search._skus[p]}-{col}" for p in products for col, s in enumerate(_MOCK_STORES)]
+    return ids[: limit_per_source * len(_MOCK_STORES)]
+
+
+@pytest.mark.parametrize("query", [
+    "laptop", "gaming laptop", "GAMING", "pro", "cme", "running shoes", "phone", "x laptop", "", "zzz",
+])
+@pytest.mark.parametrize("limit_per_source", [1, 5, 200])
+def test_index_matches_linear_scan(search, query, limit_per_source):
+    offers = search.search(query, limit_per_source=limit_per_source)
+    expected = _expected_source_ids(search, _scan(search, query), limit_per_source)
+    assert [o.source_id for o in offers] == expected
+
+
+@pytest.mark.parametrize("query,category", [
+    ("laptop", "electronics"), ("pro", "footwear"), ("", "sports"), ("shoes", "electronics"), ("mat", "nope"),
+])
+def test_category_filter_matches_linear_scan(search, query, category):
+    offers = search.search(query, category=category, limit_per_source=50)
+    expected = _expected_source_ids(search, _scan(search, query, category=category), 50)
+    assert [o.source_id for o in offers] == expected
+
+
+@pytest.mark.parametrize("query,max_price", [("laptop", 400.0), ("headphones", 60.0), ("", 20.0), ("gaming", 1.0)])
+def test_price_cap_only_keeps_offers_of_scanned_products(search, query, max_price):
+    offers = search.search(query, max_price=max_price, limit_per_source=50)
+    allowed = {f"{s['name']}:{search._skus[p]}-{col}"
+               for p in _scan(search, query, max_price=max_price) for col, s in enumerate(_MOCK_STORES)}
+    assert all(o.source_id in allowed and o.price <= max_price for o in offers)
+    # Store prices jitter around base * discount, so a product can drop out at some stores,
+    # but never all of them when its cheapest store sits well under the cap
+    cheapest = min(s["discount"] for s in _MOCK_STORES) * 1.04
+    assured = [p for p in _scan(search, query, max_price=max_price) if search._base[p] * cheapest <= max_price]
+    seen = {o.source_id.rsplit("-", 1)[0].split(":", 1)[1] for o in offers}
+    if len(offers) < 50 * len(_MOCK_STORES):
+        assert {search._skus[p] for p in assured} <= seen
+
+
+def test_seeded_results_are_reproducible(search):
+    first = search.search("laptop", max_price=500.0)
+    again = MockMultiStoreSearch.synthetic(CATALOG_SIZE, seed=7).search("laptop", max_price=500.0)
+    assert [(o.source_id, o.price, o.rating) for o in first] == [(o.source_id, o.price, o.rating) for o in again]
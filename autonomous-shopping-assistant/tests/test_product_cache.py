@@ -0,0 +1,181 @@
+"""Read-through product cache: copies out, negative caching, single-flight, post-commit invalidation."""
+import threading
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from shared.adapters import cache_adapter
+from shared.adapters.cache_adapter import MemoryCache
+from shared.domain.value_objects import ProductId, TenantId
+from services.commerce.domain.entities import Product
+from services.commerce.infrastructure.persistence.cached_product_repository import (
+    CachedProductRepository,
+    ProductCache,
+)
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_adapter.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture()
+def uow(tmp_path):
+    uow = CommerceUnitOfWork(f"sqlite:///{tmp_path / 'commerce.db'}", product_cache=ProductCache(MemoryCache()))
+    uow.create_schema()
+    return uow
+
+
+def _product(tenant, title="Mug", **attributes):
+    return Product(
+        product_id=ProductId(uuid4()), tenant_id=tenant, title=title, description="",
+        category="home", price=Decimal("9.99"), attributes=attributes,
+    )
+
+
+class _StubRepo:
+    """Inner repository that counts loads and can hold them until released."""
+
+    def __init__(self, products=(), gate: threading.Event | None = None):
+        self.products = {str(p.product_id): p for p in products}
+        self.gate = gate
+        self.loads = 0
+
+    def get_by_id(self, tenant_id, product_id):
+        self.loads += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.products.get(str(product_id))
+
+    def search(self, tenant_id, query=None, category=None, max_price=None, limit=20):
+        self.loads += 1
+        return list(self.products.values())
+
+
+def test_mutating_a_returned_product_leaves_the_cache_intact():
+    tenant = TenantId(uuid4())
+    product = _product(tenant, colors=["red"], size={"h": 10})
+    repo = CachedProductRepository(_StubRepo([product]), None, ProductCache(MemoryCache()))
+    first = repo.get_by_id(tenant, product.product_id)  # filled on this call
+    first.attributes["colors"].append("blue")
+    first.attributes["size"]["h"] = 99
+    again = repo.get_by_id(tenant, product.product_id)  # served from the cache
+    again.attributes.clear()
+    assert repo.get_by_id(tenant, product.product_id).attributes == {"colors": ["red"], "size": {"h": 10}}
+    listed = repo.search(tenant, "mug")
+    listed[0].attributes["colors"].append("green")
+    assert repo.search(tenant, "mug")[0].attributes == {"colors": ["red"], "size": {"h": 10}}
+
+
+def test_misses_are_cached_for_the_negative_ttl(clock):
+    tenant = TenantId(uuid4())
+    inner = _StubRepo()
+    cache = ProductCache(MemoryCache(), ttl_seconds=300, negative_ttl_seconds=30)
+    repo = CachedProductRepository(inner, None, cache)
+    missing = ProductId(uuid4())
+    assert repo.get_by_id(tenant, missing) is None
+    assert repo.get_by_id(tenant, missing) is None
+    assert inner.loads == 1 and cache.stats["negative_hits"] == 1
+    clock[0] += 31
+    assert repo.get_by_id(tenant, missing) is None
+    assert inner.loads == 2
+
+
+def test_negative_ttl_never_exceeds_the_ttl():
+    assert ProductCache(MemoryCache(), ttl_seconds=10, negative_ttl_seconds=30).negative_ttl_seconds == 10
+
+
+def test_concurrent_misses_share_one_load():
+    tenant = TenantId(uuid4())
+    product = _product(tenant, colors=["red"])
+    gate = threading.Event()
+    inner = _StubRepo([product], gate=gate)
+    repo = CachedProductRepository(inner, None, ProductCache(MemoryCache()))
+    results = []
+
+    def read():
+        results.append(repo.get_by_id(tenant, product.product_id))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)  # let every reader queue behind the leader
+    gate.set()
+    for t in threads:
+        t.join(5)
+    assert inner.loads == 1
+    assert len(results) == 8 and all(r.title == "Mug" for r in results)
+    # waiters share the loaded dict, but not each other's attributes
+    results[0].attributes["colors"].append("blue")
+    assert all(r.attributes == {"colors": ["red"]} for r in results[1:])
+
+
+def test_failed_load_is_raised_to_every_waiter_and_not_cached():
+    tenant = TenantId(uuid4())
+    gate = threading.Event()
+
+    class Broken(_StubRepo):
+        def get_by_id(self, tenant_id, product_id):
+            super().get_by_id(tenant_id, product_id)
+            raise RuntimeError("db down")
+
+    inner = Broken(gate=gate)
+    repo = CachedProductRepository(inner, None, ProductCache(MemoryCache()))
+    errors = []
+
+    def read():
+        try:
+            repo.get_by_id(tenant, ProductId("p1"))
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join(5)
+    assert len(errors) == 4 and inner.loads == 1
+    with pytest.raises(RuntimeError):
+        repo.get_by_id(tenant, ProductId("p1"))
+    assert inner.loads == 2
+
+
+def test_add_invalidates_the_tenant_only_after_commit(uow):
+    tenant, other = TenantId(uuid4()), TenantId(uuid4())
+    with uow.session() as s:
+        uow.product_repo(s).add(_product(tenant, "Mug"))
+        uow.product_repo(s).add(_product(other, "Mug"))
+    with uow.session() as s:
+        assert [p.title for p in uow.product_repo(s).search(tenant, "mug")] == ["Mug"]
+        assert len(uow.product_repo(s).search(other, "mug")) == 1
+    cache = uow.product_cache
+    before, other_before = cache.generation(str(tenant)), cache.generation(str(other))
+
+    with uow.session() as s:
+        uow.product_repo(s).add(_product(tenant, "Travel mug"))
+        # not committed: the tenant keeps its generation, so readers see the cached state
+        assert cache.generation(str(tenant)) == before
+        with uow.session() as reader:
+            assert [p.title for p in uow.product_repo(reader).search(tenant, "mug")] == ["Mug"]
+    assert cache.generation(str(tenant)) != before
+    assert cache.generation(str(other)) == other_before
+    with uow.session() as s:
+        assert sorted(p.title for p in uow.product_repo(s).search(tenant, "mug")) == ["Mug", "Travel mug"]
+
+
+def test_rolled_back_add_does_not_invalidate(uow):
+    tenant = TenantId(uuid4())
+    cache = uow.product_cache
+    before = cache.generation(str(tenant))
+    with pytest.raises(RuntimeError):
+        with uow.session() as s:
+            uow.product_repo(s).add(_product(tenant))
+            raise RuntimeError("abort")
+    assert cache.generation(str(tenant)) == before and cache.stats["invalidations"] == 0
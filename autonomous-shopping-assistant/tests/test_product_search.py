@@ -0,0 +1,120 @@
+"""Product search on the SQLite FTS5 index: stemming, prefix matching, filters, odd queries."""
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from shared.domain.value_objects import ProductId, TenantId
+from services.commerce.domain.entities import Product
+from services.commerce.infrastructure.persistence.unit_of_work import CommerceUnitOfWork
+
+TENANT = TenantId(uuid4())
+CATALOG = [
+    ("Trail running shoes", "Grippy outsole for muddy runs", "footwear", "89.00"),
+    ("Road runner sneakers", "Light and breathable", "footwear", "59.00"),
+    ("Wireless headphones", "Noise cancelling, 30h battery", "audio", "129.00"),
+    ("Headphone stand", "Aluminium desk stand", "audio", "25.00"),
+    ("Rain jacket", "Packable shell for running in the rain", "apparel", "75.00"),
+]
+
+
+@pytest.fixture()
+def uow(tmp_path):
+    uow = CommerceUnitOfWork(f"sqlite:///{tmp_path / 'commerce.db'}")
+    uow.create_schema()
+    with uow.session() as s:
+        repo = uow.product_repo(s)
+        for title, description, category, price in CATALOG:
+            repo.add(_product(TENANT, title, description, category, price))
+    return uow
+
+
+def _product(tenant, title, description="", category="misc", price="10.00"):
+    return Product(
+        product_id=ProductId(uuid4()), tenant_id=tenant, title=title,
+        description=description, category=category, price=Decimal(price), attributes={},
+    )
+
+
+def _titles(uow, query, tenant=TENANT, **filters):
+    with uow.session() as s:
+        return [p.title for p in uow.product_repo(s).search(tenant, query, **filters)]
+
+
+def test_stemmed_words_match_inflections(uow):
+    # "runs" is no prefix of "running": these come from the stemmed index
+    assert set(_titles(uow, "runs")) == {"Trail running shoes", "Rain jacket"}
+    assert set(_titles(uow, "shoe trail")) == {"Trail running shoes"}
+
+
+def test_last_token_matches_as_prefix(uow):
+    # porter indexes "running" as "run": only the unstemmed prefix index finds "runn"
+    assert set(_titles(uow, "runn")) == {"Trail running shoes", "Road runner sneakers", "Rain jacket"}
+    assert set(_titles(uow, "head")) == {"Wireless headphones", "Headphone stand"}
+    assert _titles(uow, "wireless head") == ["Wireless headphones"]
+    # only the last token is a prefix; earlier ones must be whole words
+    assert _titles(uow, "wire headphones") == []
+
+
+def test_whole_word_matches_rank_above_prefix_completions(uow):
+    tenant = TenantId(uuid4())
+    with uow.session() as s:
+        repo = uow.product_repo(s)
+        for title in ("Capsule coffee machine", "Baseball cap", "Capybara plush"):
+            repo.add(_product(tenant, title))
+    assert _titles(uow, "cap", tenant=tenant)[0] == "Baseball cap"
+    assert set(_titles(uow, "cap", tenant=tenant)[1:]) == {"Capsule coffee machine", "Capybara plush"}
+    # a page filled by whole-word matches needs no prefix completions
+    assert _titles(uow, "cap", tenant=tenant, limit=1) == ["Baseball cap"]
+
+
+def test_title_matches_rank_above_description_matches(uow):
+    assert _titles(uow, "running")[0] == "Trail running shoes"
+
+
+def test_category_and_price_filters_apply_to_matches(uow):
+    assert set(_titles(uow, "runn", category="footwear")) == {"Trail running shoes", "Road runner sneakers"}
+    assert _titles(uow, "runn", category="footwear", max_price=60) == ["Road runner sneakers"]
+    assert _titles(uow, "headphones", max_price=10) == []
+
+
+@pytest.mark.parametrize("query", [None, "", "!!!", " -- "])
+def test_queries_without_words_list_the_filtered_catalog(uow, query):
+    assert len(_titles(uow, query)) == len(CATALOG)
+    assert set(_titles(uow, query, category="audio")) == {"Wireless headphones", "Headphone stand"}
+
+
+def test_fts_syntax_in_queries_is_literal(uow):
+    assert _titles(uow, 'shoes" OR "jacket') == []
+    assert _titles(uow, "rain* ^jacket") == ["Rain jacket"]
+    assert _titles(uow, "NEAR(rain jacket)") == []  # "near" is just another word
+
+
+def test_search_is_tenant_scoped(uow):
+    other = TenantId(uuid4())
+    with uow.session() as s:
+        uow.product_repo(s).add(_product(other, "Running belt"))
+    assert _titles(uow, "runn", tenant=other) == ["Running belt"]
+    assert "Running belt" not in _titles(uow, "runn")
+
+
+def test_updates_and_deletes_reach_both_indexes(uow):
+    with uow.session() as s:
+        s.execute(text("UPDATE products SET title = 'Hiking boots' WHERE title = 'Trail running shoes'"))
+        s.execute(text("DELETE FROM products WHERE title = 'Road runner sneakers'"))
+    assert _titles(uow, "runn") == ["Rain jacket"]
+    assert _titles(uow, "hik") == ["Hiking boots"]
+
+
+def test_existing_index_gains_the_prefix_table(tmp_path):
+    uow = CommerceUnitOfWork(f"sqlite:///{tmp_path / 'old.db'}")
+    uow.create_schema()
+    with uow.session() as s:
+        uow.product_repo(s).add(_product(TENANT, "Running shoes"))
+        # what a database indexed before the prefix table existed looks like
+        for suffix in ("ai", "ad", "au"):
+            s.execute(text(f"DROP TRIGGER products_fts_prefix_{suffix}"))
+        s.execute(text("DROP TABLE products_fts_prefix"))
+    uow.create_schema()
+    assert _titles(uow, "runn") == ["Running shoes"]
@@ -0,0 +1,133 @@
+"""Queue consumers: ack, retry and dead-letter for MemoryQueue and RedisQueue."""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from shared.adapters.queue_adapter import MemoryQueue, RedisQueue
+
+
+def _flaky_handler(seen: dict, acked: list):
+    """Fails n == 3 always and n == 5 on its first delivery only."""
+
+    async def handler(msg):
+        n = msg["n"]
+        seen[n] = seen.get(n, 0) + 1
+        if n == 3 or (n == 5 and seen[n] == 1):
+            raise ValueError(n)
+        acked.append(n)
+
+    return handler
+
+
+async def _drain(consumer, finished, timeout: float = 10.0):
+    runner = asyncio.create_task(consumer.run())
+    deadline = time.monotonic() + timeout
+    while not finished() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    consumer.stop()
+    await runner
+
+
+def test_memory_queue_acks_retries_and_dead_letters():
+    queue = MemoryQueue(max_size=4, max_attempts=3)
+    seen, acked = {}, []
+    queue.subscribe("jobs", _flaky_handler(seen, acked))
+    consumer = queue.consumer("jobs", concurrency=2)
+    consumer.start()
+    # From another thread than the consumer's loop publish() waits for room
+    publisher = threading.Thread(target=lambda: [queue.publish("jobs", {"n": i}) for i in range(20)])
+    publisher.start()
+    publisher.join()
+    consumer.stop()
+    assert sorted(acked) == [n for n in range(20) if n != 3]
+    dead = queue.dead_letters("jobs")
+    assert [d["body"]["n"] for d in dead] == [3]
+    assert dead[0]["attempts"] == 3 and "ValueError" in dead[0]["error"]
+    assert seen[5] == 2
+    counts = consumer.metrics.counts
+    assert (counts["processed"], counts["retried"], counts["dead_lettered"]) == (19, 3, 1)
+    assert queue.stats("jobs")["high_water"] <= 4
+
+
+def test_memory_queue_keeps_messages_between_consumers_on_different_loops():
+    queue = MemoryQueue(max_size=2, max_attempts=1)
+    acked = []
+    queue.subscribe("jobs", lambda msg: acked.append(msg["n"]))
+
+    async def consume_until(n: int):
+        await _drain(queue.consumer("jobs", concurrency=2), lambda: len(acked) >= n)
+
+    queue.publish("jobs", {"n": 0})
+    asyncio.run(consume_until(1))  # binds that consumer's queue to this loop
+
+    async def second_loop():
+        assert await queue.publish_async("jobs", {"n": 1})
+        assert await queue.publish_async("jobs", {"n": 2})
+        # Full and nobody consuming: waits for a consumer instead of raising
+        late = asyncio.create_task(queue.publish_async("jobs", {"n": 3}))
+        await asyncio.sleep(0.05)
+        assert not late.done()
+        await asyncio.gather(late, consume_until(4))
+
+    asyncio.run(second_loop())
+    assert sorted(acked) == [0, 1, 2, 3]
+    assert queue.stats("jobs")["published"] == 4
+
+
+def test_memory_queue_full_without_consumer():
+    queue = MemoryQueue(max_size=1, overflow="drop")
+    queue.publish("jobs", {"n": 0})
+    queue.publish("jobs", {"n": 1})
+    assert asyncio.run(queue.publish_async("jobs", {"n": 2})) is False
+    assert queue.stats("jobs")["dropped"] == 2
+    blocking = MemoryQueue(max_size=1)
+    blocking.publish("jobs", {"n": 0})
+    with pytest.raises(asyncio.QueueFull):
+        blocking.publish("jobs", {"n": 1})
+
+
+@pytest.fixture()
+def redis_queue():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # the consumer's Lua scripts
+    server = fakeredis.FakeServer()
+    return RedisQueue(
+        client=fakeredis.FakeRedis(server=server, decode_responses=True),
+        async_client_factory=lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+        max_attempts=3,
+        visibility_timeout=0.2,
+    )
+
+
+def test_redis_queue_acks_retries_and_dead_letters(redis_queue):
+    seen, acked = {}, []
+    redis_queue.subscribe("jobs", _flaky_handler(seen, acked))
+    redis_queue.publish_many("jobs", [{"n": i} for i in range(20)])
+    redis_queue._client.lpush("jobs", "not json")
+    consumer = redis_queue.consumer("jobs", concurrency=4, batch_size=8)
+    consumer.block_timeout = 0.05
+    asyncio.run(_drain(consumer, lambda: redis_queue.stats("jobs")["dead_letters"] == 2 and len(acked) == 19))
+    assert sorted(acked) == [n for n in range(20) if n != 3]
+    dead = {str(d["body"]): d for d in map(json.loads, redis_queue._client.lrange("jobs:dead", 0, -1))}
+    assert sorted(dead) == ["not json", "{'n': 3}"]
+    assert dead["{'n': 3}"]["attempts"] == 3 and "ValueError" in dead["{'n': 3}"]["error"]
+    assert dead["not json"]["error"] == "undecodable"  # dead-lettered without retries
+    assert redis_queue.stats("jobs") == {"depth": 0, "processing": 0, "dead_letters": 2}
+    assert consumer.metrics.counts["processed"] == 19
+
+
+def test_redis_queue_redelivers_expired_leases(redis_queue):
+    redis_queue.publish("jobs", {"n": 1})
+    # A consumer that leased the message and died without acking
+    raw = redis_queue._client.lmove("jobs", "jobs:processing", "RIGHT", "LEFT")
+    redis_queue._client.zadd("jobs:inflight", {raw: time.time() - 1})
+    acked = []
+    redis_queue.subscribe("jobs", lambda msg: acked.append(msg["n"]))
+    consumer = redis_queue.consumer("jobs", concurrency=1)
+    consumer.block_timeout = 0.05
+    asyncio.run(_drain(consumer, lambda: acked == [1]))
+    assert acked == [1] and consumer.metrics.counts["expired"] == 1
+    assert redis_queue.stats("jobs")["processing"] == 0
@@ -0,0 +1,131 @@
+"""GCRA rate limiters: burst, refill, idle-key eviction and the Redis fallback window."""
+import asyncio
+import time
+
+import pytest
+
+from services.gateway.config import get_rate_limit_redis_url
+from services.gateway.infrastructure.rate_limit import InMemoryRateLimiter, RedisRateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_in_memory_burst_then_refill():
+    clock = Clock()
+    limiter = InMemoryRateLimiter(max_per_minute=60, burst=5, clock=clock)
+    assert [limiter.check("t") for _ in range(6)] == [True] * 5 + [False]
+    assert limiter.check("other")  # per key
+    clock.now += 1.0  # one emission interval: one more request
+    assert [limiter.check("t") for _ in range(2)] == [True, False]
+    clock.now += 5.0  # full bucket again
+    assert [limiter.check("t") for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_in_memory_forgets_refilled_keys():
+    clock = Clock()
+    limiter = InMemoryRateLimiter(max_per_minute=60, burst=2, clock=clock)
+    for n in range(100):
+        limiter.check(f"tenant-{n}")
+    clock.now += 2.0
+    for _ in range(64):
+        limiter.check("busy")
+    assert len(limiter) == 1
+    bounded = InMemoryRateLimiter(max_per_minute=60, max_keys=10, clock=clock)
+    for n in range(20):
+        bounded.check(f"tenant-{n}")
+    assert len(bounded) == 10 and bounded.evictions == 10
+
+
+def test_in_memory_allow_is_check():
+    limiter = InMemoryRateLimiter(max_per_minute=60, burst=2, clock=Clock())
+    assert [asyncio.run(limiter.allow("t")) for _ in range(2)] == [True, True]
+    assert not limiter.check("t")
+
+
+def _allow_all(limiter, keys):
+    async def main():
+        return [await limiter.allow(k) for k in keys]
+
+    return asyncio.run(main())
+
+
+def test_redis_burst_then_refill():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    async def main():
+        client = fakeredis.FakeAsyncRedis()
+        # Two replicas, one shared limit (interval 0.1 s, burst 5)
+        a, b = (RedisRateLimiter(max_per_minute=600, burst=5, client=client) for _ in range(2))
+        first = [await limiter.allow("t") for limiter in (a, b, a, b, a, b)]
+        await asyncio.sleep(0.25)
+        return first, [await a.allow("t"), await b.allow("t")], a.fallbacks + b.fallbacks
+
+    first, refilled, fallbacks = asyncio.run(main())
+    assert first == [True] * 5 + [False]
+    assert refilled == [True, True] and fallbacks == 0
+
+
+class SlowRedis:
+    """Each script call takes `delay` seconds of network time."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def register_script(self, script):
+        async def call(keys, args):
+            await asyncio.sleep(self.delay)
+            return [1, 0]
+
+        return call
+
+
+def test_redis_calls_do_not_block_the_event_loop():
+    limiter = RedisRateLimiter(max_per_minute=60, client=SlowRedis(0.1))
+
+    async def main():
+        start = time.perf_counter()
+        allowed = await asyncio.gather(*(limiter.allow(f"t{i}") for i in range(20)))
+        return allowed, time.perf_counter() - start
+
+    allowed, elapsed = asyncio.run(main())
+    assert all(allowed) and elapsed < 1.0  # overlapping waits, not 20 x 0.1 s in a row
+
+
+class DownRedis:
+    """Every script call fails, like a connection timeout."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def register_script(self, script):
+        async def call(keys, args):
+            self.calls += 1
+            raise ConnectionError("redis down")
+
+        return call
+
+
+def test_redis_outage_skips_redis_for_the_fallback_window():
+    clock, client = Clock(), DownRedis()
+    limiter = RedisRateLimiter(max_per_minute=60, burst=3, client=client, fallback_seconds=5, clock=clock)
+    # Same limits, enforced per process while Redis is down
+    assert _allow_all(limiter, ["t"] * 4) == [True] * 3 + [False]
+    assert client.calls == 1 and limiter.fallbacks == 4
+    clock.now += 5  # one trial call per window
+    _allow_all(limiter, ["t", "t"])
+    assert client.calls == 2 and limiter.breaker.state == "open"
+
+
+def test_redis_limiter_is_opt_in(monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "redis://cache:6379/0")
+    monkeypatch.delenv("RATE_LIMIT_REDIS_URL", raising=False)
+    assert get_rate_limit_redis_url() is None
+    monkeypatch.setenv("RATE_LIMIT_REDIS_URL", "redis://limits:6379/0")
+    assert get_rate_limit_redis_url() == "redis://limits:6379/0"
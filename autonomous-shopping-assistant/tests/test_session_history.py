@@ -0,0 +1,161 @@
+"""Session history: batch appends keep turn order; the history cache never serves turns older than the DB."""
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from shared.config.settings import reload_settings
+from shared.domain.value_objects import SessionId, TenantId
+from services.memory import main
+from services.memory.domain.entities import SessionTurn
+from services.memory.infrastructure.http import routes
+from services.memory.infrastructure.http.routes import get_uow
+from services.memory.infrastructure.persistence.history_cache import SessionHistoryCache
+from services.memory.infrastructure.persistence.models import SessionTurnModel
+from services.memory.infrastructure.persistence.repositories import SessionHistoryRepository
+from services.memory.infrastructure.persistence.unit_of_work import MemoryUnitOfWork
+
+
+@pytest.fixture()
+def uow(tmp_path):
+    uow = MemoryUnitOfWork(f"sqlite:///{tmp_path / 'memory.db'}", history_cache=SessionHistoryCache(max_turns=200))
+    uow.create_schema()
+    return uow
+
+
+def _turns(prefix, n):
+    return [SessionTurn(role="user" if i % 2 == 0 else "assistant", content=f"{prefix}-{i}") for i in range(n)]
+
+
+def _db_rows(uow, tenant, session):
+    with uow.session() as s:
+        rows = s.execute(
+            select(SessionTurnModel.id, SessionTurnModel.content)
+            .where(SessionTurnModel.tenant_id == str(tenant), SessionTurnModel.session_id == str(session))
+            .order_by(SessionTurnModel.id)
+        ).all()
+    return [(r.id, r.content) for r in rows]
+
+
+def test_batch_ids_pair_with_turns_in_list_order(uow):
+    tenant, session, other = TenantId(uuid4()), SessionId(uuid4()), SessionId(uuid4())
+    with uow.session() as s:
+        assert uow.session_history_repo(s).get_last_n(tenant, session, 10) == []  # caches the empty session
+    for batch in range(3):
+        with uow.session() as s:
+            repo = uow.session_history_repo(s)
+            repo.append_many(tenant, session, _turns(f"b{batch}", 40))
+            repo.append_many(tenant, other, _turns(f"x{batch}", 3))  # interleave ids
+
+    rows = _db_rows(uow, tenant, session)
+    assert [c for _, c in rows] == [f"b{b}-{i}" for b in range(3) for i in range(40)]
+    # The write-through pairs each RETURNING id with its turn: same pairs as the table
+    key = f"{tenant}:{session}"
+    cached = list(uow.history_cache._entries[key].turns)
+    assert [(i, t.content) for i, t in cached] == rows
+    with uow.session() as s:
+        assert [t.content for t in uow.session_history_repo(s).get_last_n(tenant, session, 5)] == [
+            f"b2-{i}" for i in range(35, 40)
+        ]
+
+
+def test_turns_batch_endpoint_appends_in_request_order(uow):
+    tenant, session = uuid4(), uuid4()
+    base = f"/v1/tenants/{tenant}/sessions/{session}"
+    main.app.dependency_overrides[get_uow] = lambda: uow
+    try:
+        client = TestClient(main.app)
+        for batch in range(2):
+            resp = client.post(f"{base}/turns:batch", json={"turns": [
+                {"role": t.role, "content": t.content} for t in _turns(f"r{batch}", 7)
+            ]})
+            assert resp.status_code == 200 and resp.json() == {"ok": True, "count": 7}
+        history = client.get(f"{base}/history", params={"last_n": 20}).json()
+        assert client.post(f"{base}/turns:batch", json={"turns": []}).status_code == 422
+    finally:
+        main.app.dependency_overrides.clear()
+    expected = [f"r{b}-{i}" for b in range(2) for i in range(7)]
+    assert [t["content"] for t in history] == expected
+    assert [c for _, c in _db_rows(uow, TenantId(tenant), SessionId(session))] == expected
+
+
+def _cached(i, content="t"):
+    return (i, SessionTurn(role="user", content=content))
+
+
+def test_fill_after_a_committed_write_is_dropped():
+    cache = SessionHistoryCache(max_turns=10)
+    token = cache.token("k")
+    cache.apply("k", [_cached(3)])  # a write lands while the read is in flight
+    cache.fill("k", [_cached(1), _cached(2)], 10, token)
+    assert cache.get("k", 5) is None and cache.stats.stale_fills == 1
+    cache.fill("k", [_cached(1), _cached(2), _cached(3)], 10, cache.token("k"))
+    assert cache.get("k", 5) == [_cached(i)[1] for i in (1, 2, 3)]
+
+
+def test_writes_to_other_sessions_do_not_void_a_token():
+    cache = SessionHistoryCache(max_turns=10)
+    token = cache.token("k")
+    cache.apply("other", [_cached(7)])
+    cache.fill("k", [_cached(1)], 10, token)
+    assert cache.get("k", 1) is not None and cache.stats.stale_fills == 0
+
+
+def test_clear_and_generation_overflow_start_a_new_epoch():
+    cache = SessionHistoryCache(max_turns=10, max_sessions=2)
+    token = cache.token("k")
+    cache.clear()
+    cache.fill("k", [_cached(1)], 10, token)
+    assert cache.get("k", 1) is None
+    token = cache.token("k")
+    for i in range(cache.max_sessions * 4 + 1):  # bounded generation map rolls over
+        cache.apply(f"s{i}", [_cached(i + 1)])
+    cache.fill("k", [_cached(1)], 10, token)
+    assert cache.get("k", 1) is None and cache.stats.stale_fills == 2
+
+
+def test_out_of_order_write_through_drops_the_entry():
+    cache = SessionHistoryCache(max_turns=10)
+    cache.fill("k", [_cached(5)], 10, cache.token("k"))
+    cache.apply("k", [_cached(4)])  # committed after a later id: order unknown, reload from DB
+    assert cache.get("k", 1) is None and cache.stats.invalidations == 1
+
+
+def test_read_racing_an_append_never_caches_the_older_tail(uow, monkeypatch):
+    tenant, session = TenantId(uuid4()), SessionId(uuid4())
+    with uow.session() as s:
+        uow.session_history_repo(s).append_many(tenant, session, _turns("old", 2))
+    query_last = SessionHistoryRepository._query_last
+
+    def slow_read(self, *args):
+        rows = query_last(self, *args)
+        with uow.session() as s:  # another request commits between the read and the fill
+            uow.session_history_repo(s).append_many(tenant, session, _turns("new", 1))
+        return rows
+
+    monkeypatch.setattr(SessionHistoryRepository, "_query_last", slow_read)
+    with uow.session() as s:
+        assert [t.content for t in uow.session_history_repo(s).get_last_n(tenant, session, 10)] == ["old-0", "old-1"]
+    monkeypatch.undo()
+    with uow.session() as s:
+        latest = uow.session_history_repo(s).get_last_n(tenant, session, 10)
+    assert [t.content for t in latest] == ["old-0", "old-1", "new-0"]
+    assert uow.history_cache.stats.stale_fills == 1
+
+
+def test_history_cache_sizing_follows_settings_reload(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'memory.db'}")
+    monkeypatch.setenv("HISTORY_CACHE_TURNS", "7")
+    monkeypatch.setenv("HISTORY_CACHE_SESSIONS", "3")
+    try:
+        reload_settings()
+        cache = get_uow().history_cache
+        assert (cache.max_turns, cache.max_sessions) == (7, 3)
+        monkeypatch.setenv("HISTORY_CACHE_TURNS", "0")
+        reload_settings()
+        assert not get_uow().history_cache.enabled
+    finally:
+        monkeypatch.undo()
+        reload_settings()
+    assert routes._uow is None